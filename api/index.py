@@ -11,6 +11,9 @@ project_root = os.path.dirname(os.path.dirname(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+# Serverless cold starts: register routes and build clients on first use
+os.environ.setdefault("FAST_START", "1")
+
 # Import the FastAPI app from backend
 from backend.main import app
 
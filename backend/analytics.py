@@ -0,0 +1,72 @@
+"""
+Pattern Analytics
+Per-pattern confidence computed from judged submissions, replacing scores
+set by hand. Each attempt on a problem counts toward its catalog pattern
+with
+
+    weight  = difficulty weight * 0.5 ** (age in days / half-life)
+    outcome = 1 if accepted, else half the fraction of test cases passed
+
+and confidence = 100 * sum(weight * outcome) / (sum(weight) + prior).
+The prior keeps a single lucky attempt from reading as mastery; a pattern
+is mastered once its confidence reaches MASTERY_THRESHOLD.
+
+Exponential decay means the two sums can be carried forward, so each
+judged submission is folded in with one RPC (sql/010_pattern_confidence.sql)
+and recompute_confidence.py rebuilds every user's sums with NumPy.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+from backend.data.catalog import get_catalog
+from backend.progress_cache import mutate_user_record
+
+DIFFICULTY_WEIGHTS = {"Easy": 1.0, "Medium": 1.5, "Hard": 2.0}
+CONFIDENCE_HALF_LIFE_DAYS = float(os.getenv("CONFIDENCE_HALF_LIFE_DAYS", 30))
+CONFIDENCE_PRIOR_WEIGHT = float(os.getenv("CONFIDENCE_PRIOR_WEIGHT", 2))
+MASTERY_THRESHOLD = float(os.getenv("MASTERY_THRESHOLD", 75))
+
+
+def attempt_outcome(result: dict) -> Optional[float]:
+    """Outcome (0-1) of a judged attempt, or None if it says nothing about the user"""
+    # Imported here: the judge package imports this module
+    from backend.judge.harness import ACCEPTED, INTERNAL_ERROR, NO_TEST_CASES, UNSUPPORTED_LANGUAGE
+    from backend.judge.queue import JUDGE_FAILED
+
+    status = result.get("status")
+    if status in (None, "pending", INTERNAL_ERROR, NO_TEST_CASES, UNSUPPORTED_LANGUAGE, JUDGE_FAILED):
+        return None
+    if status == ACCEPTED:
+        return 1.0
+    total = result.get("total_cases") or 0
+    return 0.5 * (result.get("passed_cases") or 0) / total if total else 0.0
+
+
+def difficulty_weight(difficulty: str) -> float:
+    return DIFFICULTY_WEIGHTS.get(difficulty, 1.0)
+
+
+def confidence_score(evidence: float, weight: float) -> float:
+    """Confidence (0-100) from a pattern's decayed sums"""
+    return round(100 * evidence / (weight + CONFIDENCE_PRIOR_WEIGHT), 1)
+
+
+async def record_pattern_outcome(user_id: str, problem_id: str, result: dict, at: datetime = None) -> Optional[dict]:
+    """Fold a judged attempt into the user's confidence for the problem's pattern"""
+    problem = get_catalog().get(problem_id)
+    outcome = attempt_outcome(result)
+    if problem is None or outcome is None:
+        return None
+
+    return await mutate_user_record("record_pattern_outcome", {
+        "p_user_id": user_id,
+        "p_pattern": problem["pattern"],
+        "p_outcome": outcome,
+        "p_weight": difficulty_weight(problem["difficulty"]),
+        "p_at": (at or datetime.now(timezone.utc)).isoformat(),
+        "p_half_life_days": CONFIDENCE_HALF_LIFE_DAYS,
+        "p_prior_weight": CONFIDENCE_PRIOR_WEIGHT,
+        "p_mastery_threshold": MASTERY_THRESHOLD,
+    })
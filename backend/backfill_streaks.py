@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Rebuild every user's streak summary from the submissions table
+
+Submissions are streamed once in (user_id, submitted_at, id) order with
+keyset pagination, so each user's active days arrive in sequence and only
+one user's StreakState is held at a time. Summaries are written back in
+batches through the apply_streak_backfill RPC (sql/009_activity_streaks.sql).
+
+Usage (from the project root):
+    python -m backend.backfill_streaks [--page-size 1000] [--batch-size 500] [--dry-run]
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+from backend.streaks import StreakState, activity_day, apply_activity
+from backend.supabase_config import get_supabase
+
+load_dotenv()
+
+
+def quote(value: str) -> str:
+    """Quote a value for a PostgREST filter"""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def stream_activity(supabase, page_size: int):
+    """Yield (user_id, submitted_at) for every submission, grouped by user in time order"""
+    last = None
+    while True:
+        query = supabase.table("submissions").select("id,user_id,submitted_at")
+        if last is not None:
+            user_id, submitted_at, submission_id = (quote(v) for v in last)
+            query = query.or_(
+                f"user_id.gt.{user_id},"
+                f"and(user_id.eq.{user_id},submitted_at.gt.{submitted_at}),"
+                f"and(user_id.eq.{user_id},submitted_at.eq.{submitted_at},id.gt.{submission_id})"
+            )
+        rows = query.order("user_id").order("submitted_at").order("id").limit(page_size).execute().data or []
+        for row in rows:
+            yield row["user_id"], datetime.fromisoformat(row["submitted_at"])
+        if len(rows) < page_size:
+            return
+        last = (rows[-1]["user_id"], rows[-1]["submitted_at"], rows[-1]["id"])
+
+
+def build_summaries(activity):
+    """Yield (user_id, StreakState) per user from time-ordered activity"""
+    current_user, state = None, StreakState()
+    for user_id, submitted_at in activity:
+        if user_id != current_user:
+            if current_user is not None:
+                yield current_user, state
+            current_user, state = user_id, StreakState()
+        state = apply_activity(state, activity_day(submitted_at))
+    if current_user is not None:
+        yield current_user, state
+
+
+def backfill_streaks(page_size: int = 1000, batch_size: int = 500, dry_run: bool = False) -> int:
+    """Recompute and store streak summaries; returns the number of users"""
+    supabase = get_supabase()
+    print("🔥 Rebuilding streaks from submission history...")
+
+    users = 0
+    batch = []
+
+    def flush():
+        if batch and not dry_run:
+            supabase.rpc("apply_streak_backfill", {"p_rows": batch}).execute()
+        batch.clear()
+
+    try:
+        for user_id, state in build_summaries(stream_activity(supabase, page_size)):
+            batch.append({"user_id": user_id, **state.to_row()})
+            users += 1
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    except Exception as e:
+        print(f"❌ Error rebuilding streaks: {str(e)}")
+        print("Make sure sql/009_activity_streaks.sql has been applied")
+        sys.exit(1)
+
+    print(f"\n✅ {'Computed' if dry_run else 'Stored'} streaks for {users} users")
+    return users
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild streaks from submission history")
+    parser.add_argument("--page-size", type=int, default=1000, help="Submissions read per request")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users written per request")
+    parser.add_argument("--dry-run", action="store_true", help="Compute streaks without writing")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    backfill_streaks(page_size=max(args.page_size, 1), batch_size=max(args.batch_size, 1), dry_run=args.dry_run)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Response encoding benchmark
+
+Serves the largest payloads (a pattern's problem list, the daily triple
+and submission history pages) through the full app, in-process against
+the local Supabase stand-in with no injected latency, once per
+representation: JSON or MessagePack, each uncompressed, gzip and brotli.
+Reports bytes on the wire and server CPU per request, so each
+representation can be compared with the plain JSON path. A codec section
+times the encoders alone, without the compressed-body cache.
+
+Usage (from the project root):
+    python -m backend.bench_encoding [--requests 300] [--page-size 50 200] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from backend.bench_routes import Request, asgi_request, git_commit, load_app
+
+# (name, Accept, Accept-Encoding)
+REPRESENTATIONS = (
+    ("json", "application/json", "identity"),
+    ("json+gzip", "application/json", "gzip"),
+    ("json+br", "application/json", "br"),
+    ("msgpack", "application/msgpack", "identity"),
+    ("msgpack+gzip", "application/msgpack", "gzip"),
+    ("msgpack+br", "application/msgpack", "br"),
+)
+
+
+def build_payloads(data, page_sizes: List[int]) -> dict:
+    from backend.data.catalog import get_catalog
+
+    catalog = get_catalog()
+    routable = [name for name in catalog.patterns if "/" not in name]
+    largest = max(routable, key=lambda name: len(catalog.by_pattern(name)))
+    payloads = {
+        f"pattern ({largest})": f"/api/problems/pattern/{largest}",
+        "daily triple": f"/api/daily-triple/{data.user_ids[0]}",
+    }
+    for size in page_sizes:
+        payloads[f"submissions (limit={size})"] = f"/api/submissions/{data.user_ids[0]}?limit={size}"
+    return payloads
+
+
+async def measure(app, path: str, accept: str, accept_encoding: str, requests: int) -> dict:
+    path, _, query = path.partition("?")
+    request = Request(
+        "GET", path, dict(part.split("=", 1) for part in query.split("&") if part),
+        headers=(("accept", accept), ("accept-encoding", accept_encoding)),
+    )
+    status, headers, body = await asgi_request(app, request)
+
+    cpu_started, started = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        await asgi_request(app, request)
+    cpu = time.process_time() - cpu_started
+    elapsed = time.perf_counter() - started
+    return {
+        "status": status,
+        "content_type": headers.get("content-type"),
+        "content_encoding": headers.get("content-encoding", "identity"),
+        "bytes": len(body),
+        "cpu_us_per_request": round(cpu / requests * 1e6, 1),
+        "wall_us_per_request": round(elapsed / requests * 1e6, 1),
+    }
+
+
+def time_call(function, repeat: int) -> float:
+    started = time.process_time()
+    for _ in range(repeat):
+        function()
+    return round((time.process_time() - started) / repeat * 1e6, 1)
+
+
+def codec_costs(value, repeat: int) -> dict:
+    """Encoder CPU (µs) for a decoded payload, bypassing every cache"""
+    from backend.encoding import compress, packb
+
+    json_body = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    msgpack_body = packb(value)
+    return {
+        "json_encode_us": time_call(lambda: json.dumps(value, separators=(",", ":")).encode("utf-8"), repeat),
+        "msgpack_encode_us": time_call(lambda: packb(value), repeat),
+        "gzip_json_us": time_call(lambda: compress(json_body, "gzip"), repeat),
+        "br_json_us": time_call(lambda: compress(json_body, "br"), repeat),
+        "gzip_msgpack_us": time_call(lambda: compress(msgpack_body, "gzip"), repeat),
+        "br_msgpack_us": time_call(lambda: compress(msgpack_body, "br"), repeat),
+    }
+
+
+async def run_benchmark(requests: int, page_sizes: List[int], submissions_per_user: int) -> dict:
+    app, _, data = load_app(0.0, 0.0, users=10, submissions_per_user=submissions_per_user)
+    results = {}
+    async with app.router.lifespan_context(app):
+        for name, path in build_payloads(data, page_sizes).items():
+            variants = {
+                label: await measure(app, path, accept, accept_encoding, requests)
+                for label, accept, accept_encoding in REPRESENTATIONS
+            }
+            baseline = variants["json"]
+            for variant in variants.values():
+                variant["bytes_vs_json"] = round(variant["bytes"] / baseline["bytes"], 3) if baseline["bytes"] else None
+                variant["cpu_vs_json"] = (
+                    round(variant["cpu_us_per_request"] / baseline["cpu_us_per_request"], 2)
+                    if baseline["cpu_us_per_request"] else None
+                )
+            path_only, _, query = path.partition("?")
+            _, _, body = await asgi_request(app, Request(
+                "GET", path_only, dict(part.split("=", 1) for part in query.split("&") if part)))
+            results[name] = {
+                "path": path,
+                "representations": variants,
+                "codecs": codec_costs(json.loads(body), max(requests // 3, 10)),
+            }
+
+    from backend.encoding import BROTLI_QUALITY, COMPRESSION_MIN_BYTES, GZIP_LEVEL
+    return {
+        "benchmark": "encoding",
+        "commit": git_commit(),
+        "config": {
+            "requests": requests,
+            "gzip_level": GZIP_LEVEL,
+            "brotli_quality": BROTLI_QUALITY,
+            "compression_min_bytes": COMPRESSION_MIN_BYTES,
+        },
+        "results": results,
+    }
+
+
+def print_report(results: dict):
+    config = results["config"]
+    print(
+        f"📦 Response encodings @ {results['commit'] or 'unknown commit'} "
+        f"(gzip {config['gzip_level']}, brotli {config['brotli_quality']}, {config['requests']} requests each)"
+    )
+    for name, payload in results["results"].items():
+        print(f"\n{name}: GET {payload['path']}")
+        print(f"  {'representation':<16}{'bytes':>10}{'vs json':>9}{'cpu µs/req':>13}{'vs json':>9}")
+        for label, variant in payload["representations"].items():
+            print(
+                f"  {label:<16}{variant['bytes']:>10}{variant['bytes_vs_json']:>9.3f}"
+                f"{variant['cpu_us_per_request']:>13.1f}{variant['cpu_vs_json']:>9.2f}"
+            )
+        codecs = payload["codecs"]
+        print("  codecs (µs, uncached): " + ", ".join(f"{key[:-3]} {value:.1f}" for key, value in codecs.items()))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark response compression and MessagePack encoding")
+    parser.add_argument("--requests", type=int, default=300, help="Timed requests per payload and representation")
+    parser.add_argument("--page-size", type=int, nargs="+", default=[50, 200], help="Submission page sizes to serve")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    page_sizes = [min(max(size, 1), 200) for size in args.page_size]
+    results = asyncio.run(run_benchmark(max(args.requests, 1), page_sizes, submissions_per_user=max(page_sizes) + 1))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
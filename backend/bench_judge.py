@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Judge latency benchmark
+
+Measures what a verdict costs on each path: the first submission on a cold
+worker pool versus one warmed at startup, a sandbox run at each
+case-parallelism setting, and a repeat submission answered by the
+persistent result cache (judge/cache.py), both verbatim and reformatted.
+
+Usage (from the project root):
+    python -m backend.bench_judge [--repeat 50] [--case-workers 1 4] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import List
+
+from backend.bench_routes import git_commit, percentile
+
+PROBLEM_ID = "problem_1"
+SOLUTION = '''class Solution:
+    def twoSum(self, nums, target):
+        seen = {}
+        for i, n in enumerate(nums):
+            if target - n in seen:
+                return [seen[target - n], i]
+            seen[n] = i
+'''
+# Same program, different formatting and comments
+REFORMATTED = '''class Solution:
+
+    def twoSum(self, nums, target):  # one pass with a hash map
+        seen = { }
+        for i, n in enumerate(nums):
+            if (target - n) in seen:
+                return [seen[target - n], i]
+
+            seen[n] = i
+'''
+
+
+def summarize(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "p50": round(percentile(ordered, 50), 3),
+        "p99": round(percentile(ordered, 99), 3),
+    }
+
+
+async def time_first_judge(warm: bool) -> dict:
+    from backend.judge.engine import JudgeEngine
+
+    engine = JudgeEngine()
+    try:
+        warm_ms = None
+        if warm:
+            started = time.perf_counter()
+            await engine.warm()
+            warm_ms = round((time.perf_counter() - started) * 1000, 1)
+        started = time.perf_counter()
+        await engine.judge(PROBLEM_ID, SOLUTION)
+        return {"warm_ms": warm_ms, "first_judge_ms": round((time.perf_counter() - started) * 1000, 1)}
+    finally:
+        engine.shutdown()
+
+
+async def time_sandbox(case_workers: int, repeat: int) -> dict:
+    from backend.judge.engine import JudgeEngine
+
+    engine = JudgeEngine(case_workers=case_workers)
+    try:
+        await engine.warm()
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = await engine.judge(PROBLEM_ID, SOLUTION)
+            samples.append((time.perf_counter() - started) * 1000)
+        return {"case_workers": case_workers, "status": result["status"], "latency_ms": summarize(samples)}
+    finally:
+        engine.shutdown()
+
+
+def time_cache(repeat: int) -> dict:
+    from backend.judge.cache import JudgeResultCache
+
+    cache = JudgeResultCache(os.path.join(tempfile.mkdtemp(prefix="bench-judge-cache-"), "cache.sqlite3"))
+    result = {"status": "accepted", "passed_cases": 4, "total_cases": 4, "runtime_ms": 0, "error": None}
+    cache.put(cache.key(PROBLEM_ID, "python", SOLUTION), PROBLEM_ID, result)
+
+    timings = {}
+    for name, code in (("verbatim", SOLUTION), ("reformatted", REFORMATTED)):
+        samples, hit = [], None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hit = cache.get(cache.key(PROBLEM_ID, "python", code))
+            samples.append((time.perf_counter() - started) * 1000)
+        timings[name] = {"hit": hit is not None, "latency_ms": summarize(samples)}
+    cache.close()
+    return timings
+
+
+async def run_benchmark(repeat: int, case_workers: List[int]) -> dict:
+    return {
+        "benchmark": "judge",
+        "commit": git_commit(),
+        "config": {"repeat": repeat, "cpus": os.cpu_count(), "problem_id": PROBLEM_ID},
+        "cold_start": {
+            "cold_pool": await time_first_judge(warm=False),
+            "warmed_pool": await time_first_judge(warm=True),
+        },
+        "sandbox": [await time_sandbox(workers, repeat) for workers in case_workers],
+        "cache": time_cache(repeat * 10),
+    }
+
+
+def print_report(results: dict):
+    config = results["config"]
+    print(f"⚖️  Judge benchmark @ {results['commit'] or 'unknown commit'} ({config['problem_id']}, {config['cpus']} CPUs)")
+    cold, warmed = results["cold_start"]["cold_pool"], results["cold_start"]["warmed_pool"]
+    print(f"  first judge, cold pool:   {cold['first_judge_ms']:>9.1f} ms")
+    print(f"  first judge, warmed pool: {warmed['first_judge_ms']:>9.1f} ms  (warm-up {warmed['warm_ms']:.1f} ms at startup)")
+    for run in results["sandbox"]:
+        latency = run["latency_ms"]
+        print(
+            f"  sandbox, {run['case_workers']} case worker(s):  "
+            f"mean {latency['mean']:.2f} ms, p50 {latency['p50']:.2f} ms, p99 {latency['p99']:.2f} ms ({run['status']})"
+        )
+    for name, run in results["cache"].items():
+        latency = run["latency_ms"]
+        print(
+            f"  cache, {name:<11}  {'hit ' if run['hit'] else 'MISS'} "
+            f"mean {latency['mean'] * 1000:.1f} µs, p99 {latency['p99'] * 1000:.1f} µs"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark judge latency: cold start, sandbox and result cache")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed judgings per sandbox setting")
+    parser.add_argument("--case-workers", type=int, nargs="+", default=[1, 4], help="Case-parallelism settings to compare")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = asyncio.run(run_benchmark(max(args.repeat, 1), [max(n, 1) for n in args.case_workers]))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
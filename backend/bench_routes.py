@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Route load benchmark against a local Supabase stand-in
+
+Runs the full app in-process (startup hooks included, plain ASGI calls, no
+HTTP client) with get_supabase() swapped for the in-memory FakeSupabase
+(fake_supabase.py), seeded with users, progress rows and submission
+history. Every endpoint in backend/routes/ is driven at each requested
+concurrency; throughput and latency percentiles are reported per endpoint.
+
+Injected latency is per Supabase round trip, so the numbers show how the
+routes overlap and avoid queries rather than how fast Postgres is. With
+--backend sqlite the same data is seeded into a temporary SQLite database
+(storage/sqlite.py) instead and no latency is injected, measuring the
+local storage path end to end. The judge worker and daily-triple
+pre-generation are disabled.
+
+Usage (from the project root):
+    python -m backend.bench_routes [--concurrency 1 16 64] [--requests 500]
+        [--latency-ms 5] [--jitter-ms 2] [--backend memory|sqlite] [--endpoint progress]
+        [--json] [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, NamedTuple, Optional
+from urllib.parse import quote, urlencode
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PERCENTILES = (50, 90, 99)
+SEARCH_QUERIES = ("two sum", "tree", "binary search", "linked list", "sliding window", "dyn", "graph", "interval")
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    query: dict = {}
+    body: Optional[dict] = None
+    headers: tuple = ()
+
+
+class Endpoint(NamedTuple):
+    router: str
+    name: str
+    make_request: Callable[[int], Request]
+
+
+class Dataset(NamedTuple):
+    user_ids: List[str]
+    submission_ids: List[str]
+    problem_ids: List[str]
+    patterns: List[str]
+
+
+def build_dataset(fake, users: int, submissions_per_user: int, seed: int = 7) -> Dataset:
+    """Seed the stand-in with users, progress rows and a submission history"""
+    from backend.blobs import encode_blob
+    from backend.data.catalog import get_catalog
+
+    catalog = get_catalog()
+    code, strategy = encode_blob("class Solution:\n    pass\n"), encode_blob("bench")
+    rng = random.Random(seed)
+    problems = list(catalog.problems)
+    patterns = list(catalog.patterns)
+    now = datetime.now()
+
+    user_ids = [f"bench-user-{i:05d}" for i in range(users)]
+    progress, submissions = [], []
+    for user_id in user_ids:
+        progress.append({
+            "user_id": user_id,
+            "username": f"User_{user_id[:8]}",
+            "total_submissions": submissions_per_user,
+            "current_streak": rng.randint(0, 10),
+            "longest_streak": rng.randint(10, 30),
+            "last_active_on": (now.date() - timedelta(days=rng.randint(0, 3))).isoformat(),
+            "patterns_mastered": rng.sample(patterns, min(2, len(patterns))),
+            "confidence_scores": {pattern: round(rng.uniform(0, 100), 1) for pattern in rng.sample(patterns, min(5, len(patterns)))},
+        })
+        for n in range(submissions_per_user):
+            problem = rng.choice(problems)
+            passed = rng.random() < 0.6
+            submissions.append({
+                "id": f"{user_id}-sub-{n:05d}",
+                "problem_id": problem["id"],
+                "user_id": user_id,
+                "code_digest": code["digest"],
+                "strategy_digest": strategy["digest"],
+                "language": "python",
+                "submitted_at": (now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))).isoformat(),
+                "status": "accepted" if passed else "wrong_answer",
+                "passed": passed,
+                "judge_result": {"status": "accepted" if passed else "wrong_answer"},
+            })
+    fake.load("submission_blobs", [code, strategy])
+    fake.load("user_progress", progress)
+    fake.load("submissions", submissions)
+    return Dataset(user_ids, [row["id"] for row in submissions], [p["id"] for p in problems], patterns)
+
+
+def build_endpoints(data: Dataset) -> List[Endpoint]:
+    """One request generator per route; request i picks its user/problem deterministically"""
+    def user(i):
+        return data.user_ids[i % len(data.user_ids)]
+
+    def problem(i):
+        return data.problem_ids[(i * 7919) % len(data.problem_ids)]
+
+    def pattern(i):
+        return data.patterns[i % len(data.patterns)]
+
+    # Names like "BFS / Trees" can't be matched by the {pattern} path segment
+    routable = [name for name in data.patterns if "/" not in name] or data.patterns
+
+    return [
+        # daily_triple.py
+        Endpoint("daily_triple", "GET /api/daily-triple/{user_id}", lambda i: Request("GET", f"/api/daily-triple/{user(i)}")),
+        Endpoint("daily_triple", "GET /api/problems/pattern/{pattern}", lambda i: Request(
+            "GET", f"/api/problems/pattern/{routable[i % len(routable)]}")),
+        Endpoint("daily_triple", "GET /api/patterns", lambda i: Request("GET", "/api/patterns")),
+        Endpoint("daily_triple", "GET /api/problems/{problem_id}", lambda i: Request("GET", f"/api/problems/{problem(i)}")),
+        # submission.py
+        Endpoint("submission", "POST /api/submit", lambda i: Request("POST", "/api/submit", body={
+            "problem_id": problem(i), "user_id": user(i),
+            "code": f"class Solution:\n    # attempt {i}\n    pass\n", "strategy": "bench", "language": "python",
+        })),
+        # Same code every time: only the submission row is written
+        Endpoint("submission", "POST /api/submit (identical code)", lambda i: Request("POST", "/api/submit", body={
+            "problem_id": problem(i), "user_id": user(i),
+            "code": "class Solution:\n    pass\n", "strategy": "bench", "language": "python",
+        })),
+        Endpoint("submission", "GET /api/submit/{submission_id}/status", lambda i: Request(
+            "GET", f"/api/submit/{data.submission_ids[(i * 104729) % len(data.submission_ids)]}/status")),
+        Endpoint("submission", "GET /api/submissions/{user_id}", lambda i: Request(
+            "GET", f"/api/submissions/{user(i)}", {"limit": 20})),
+        Endpoint("submission", "GET /api/submissions/{user_id}/{problem_id}", lambda i: Request(
+            "GET", f"/api/submissions/{user(i)}/{problem(i)}", {"limit": 20})),
+        # progress.py
+        Endpoint("progress", "GET /api/progress/{user_id}", lambda i: Request("GET", f"/api/progress/{user(i)}")),
+        Endpoint("progress", "GET /api/profile/{user_id}", lambda i: Request("GET", f"/api/profile/{user(i)}")),
+        Endpoint("progress", "PATCH /api/progress/{user_id}/streak", lambda i: Request(
+            "PATCH", f"/api/progress/{user(i)}/streak", {"days": 1})),
+        Endpoint("progress", "POST /api/progress/{user_id}/pattern-mastered", lambda i: Request(
+            "POST", f"/api/progress/{user(i)}/pattern-mastered", {"pattern": pattern(i)})),
+        Endpoint("progress", "POST /api/progress/{user_id}/confidence", lambda i: Request(
+            "POST", f"/api/progress/{user(i)}/confidence", {"pattern": pattern(i), "score": i % 101})),
+        Endpoint("progress", "POST /api/progress/{user_id}/batch", lambda i: Request(
+            "POST", f"/api/progress/{user(i)}/batch", body={"operations": [
+                {"op": "streak", "days": 1},
+                {"op": "confidence", "pattern": pattern(i), "score": i % 101},
+                {"op": "pattern_mastered", "pattern": pattern(i + 1)},
+            ]})),
+        # dashboard.py
+        Endpoint("dashboard", "GET /api/dashboard/{user_id}", lambda i: Request("GET", f"/api/dashboard/{user(i)}")),
+        # search.py
+        Endpoint("search", "GET /api/search", lambda i: Request(
+            "GET", "/api/search", {"q": SEARCH_QUERIES[i % len(SEARCH_QUERIES)], "limit": 20})),
+    ]
+
+
+async def asgi_request(app, request: Request) -> tuple:
+    """Send one request straight into the ASGI app; returns (status, headers, body)"""
+    body = json.dumps(request.body).encode("utf-8") if request.body is not None else b""
+    headers = [(b"host", b"bench")] + [
+        (name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in request.headers
+    ]
+    if not any(name.lower() == "accept" for name, _ in request.headers):
+        headers.append((b"accept", b"application/json"))
+    if request.body is not None:
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": request.method, "scheme": "http", "path": request.path,
+        "raw_path": quote(request.path).encode(), "query_string": urlencode(request.query).encode(),
+        "root_path": "", "headers": headers, "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    status = 0
+    response_headers = []
+    chunks = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            # Nothing more will arrive; park like a client holding the connection open
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            response_headers.extend(message.get("headers", ()))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, {name.decode("latin-1"): value.decode("latin-1") for name, value in response_headers}, b"".join(chunks)
+
+
+def percentile(ordered: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return 0.0
+    rank = max(int(round(p / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+async def drive(app, endpoint: Endpoint, requests: int, concurrency: int, offset: int = 0) -> dict:
+    """Issue `requests` requests from `concurrency` concurrent clients"""
+    latencies: List[float] = []
+    statuses: dict = {}
+    counter = iter(range(offset, offset + requests))
+
+    async def client():
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                status = (await asgi_request(app, endpoint.make_request(i)))[0]
+            except Exception:
+                status = 0
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if not 200 <= status < 400)
+    return {
+        "router": endpoint.router,
+        "endpoint": endpoint.name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+        "duration_s": round(elapsed, 4),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+            **{f"p{p}": round(percentile(ordered, p) * 1000, 3) for p in PERCENTILES},
+            "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_app(latency_ms: float, jitter_ms: float, users: int, submissions_per_user: int,
+             backend: str = "memory") -> tuple:
+    """Import the app with background jobs off and a seeded stand-in installed; returns (app, fake, dataset)"""
+    # Read at import time by the modules below, so set before importing the app
+    os.environ["JUDGE_QUEUE_WORKER"] = "0"
+    os.environ["DAILY_TRIPLE_PREGENERATE"] = "0"
+    os.environ["FAST_START"] = "0"
+    judge_dir = tempfile.mkdtemp(prefix="bench-judge-")
+    os.environ["JUDGE_QUEUE_PATH"] = os.path.join(judge_dir, "queue.sqlite3")
+    os.environ["JUDGE_CACHE_PATH"] = os.path.join(judge_dir, "cache.sqlite3")
+
+    from backend.fake_supabase import FakeSupabase, use_fake_supabase
+    from backend.main import app
+
+    if backend == "sqlite":
+        from backend.storage.sqlite import SQLiteStorage
+        fake = use_fake_supabase(SQLiteStorage(os.path.join(tempfile.mkdtemp(prefix="bench-sqlite-"), "bench.sqlite3")))
+    else:
+        fake = use_fake_supabase(FakeSupabase(latency=latency_ms / 1000, jitter=jitter_ms / 1000, seed=1))
+    return app, fake, build_dataset(fake, users, submissions_per_user)
+
+
+async def run_benchmark(
+    concurrency: List[int],
+    requests: int,
+    warmup: int,
+    latency_ms: float,
+    jitter_ms: float,
+    users: int,
+    submissions_per_user: int,
+    endpoints: List[str] = (),
+    backend: str = "memory",
+) -> dict:
+    from backend.db import DB_MAX_WORKERS
+
+    if backend == "sqlite":
+        latency_ms = jitter_ms = 0.0
+    app, fake, data = load_app(latency_ms, jitter_ms, users, submissions_per_user, backend)
+    selected = [
+        endpoint for endpoint in build_endpoints(data)
+        if not endpoints or any(token in endpoint.name or token == endpoint.router for token in endpoints)
+    ]
+
+    results = []
+    async with app.router.lifespan_context(app):
+        for endpoint in selected:
+            offset = 0
+            if warmup:
+                await drive(app, endpoint, warmup, max(concurrency), offset)
+                offset += warmup
+            for level in concurrency:
+                queries_before = fake.queries
+                result = await drive(app, endpoint, requests, level, offset)
+                result["queries_per_request"] = round((fake.queries - queries_before) / max(result["requests"], 1), 3)
+                results.append(result)
+                offset += requests
+
+    return {
+        "benchmark": "routes",
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {
+            "requests": requests,
+            "warmup": warmup,
+            "concurrency": concurrency,
+            "backend": backend,
+            "latency_ms": latency_ms,
+            "jitter_ms": jitter_ms,
+            "users": users,
+            "submissions_per_user": submissions_per_user,
+            "db_max_workers": DB_MAX_WORKERS,
+        },
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict) -> List[dict]:
+    """Per (endpoint, concurrency) throughput and p99 change against a previous run"""
+    previous = {(r["endpoint"], r["concurrency"]): r for r in baseline.get("results", [])}
+    rows = []
+    for result in results["results"]:
+        before = previous.get((result["endpoint"], result["concurrency"]))
+        if before is None:
+            continue
+        rows.append({
+            "endpoint": result["endpoint"],
+            "concurrency": result["concurrency"],
+            "throughput_change_pct": round(
+                (result["throughput_rps"] / before["throughput_rps"] - 1) * 100, 1) if before["throughput_rps"] else None,
+            "p99_change_pct": round(
+                (result["latency_ms"]["p99"] / before["latency_ms"]["p99"] - 1) * 100, 1) if before["latency_ms"]["p99"] else None,
+        })
+    return rows
+
+
+def print_report(results: dict):
+    config = results["config"]
+    print(
+        f"🏋️  Route benchmark @ {results['commit'] or 'unknown commit'}: {config['requests']} requests per endpoint, "
+        f"{config.get('backend', 'memory')} backend, {config['latency_ms']}±{config['jitter_ms']} ms per query, "
+        f"{config['users']} users"
+    )
+    print(f"{'endpoint':<48}{'conc':>6}{'req/s':>10}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}{'q/req':>7}{'err':>6}")
+    for r in results["results"]:
+        latency = r["latency_ms"]
+        print(
+            f"{r['endpoint']:<48}{r['concurrency']:>6}{r['throughput_rps']:>10.1f}"
+            f"{latency['p50']:>9.2f}{latency['p90']:>9.2f}{latency['p99']:>9.2f}{latency['max']:>9.2f}"
+            f"{r['queries_per_request']:>7.2f}{r['errors']:>6}"
+        )
+
+
+def print_comparison(rows: List[dict], baseline_commit: Optional[str]):
+    print(f"\n📊 Change vs {baseline_commit or 'baseline'} (throughput / p99 latency)")
+    for row in rows:
+        throughput = "n/a" if row["throughput_change_pct"] is None else f"{row['throughput_change_pct']:+.1f}%"
+        p99 = "n/a" if row["p99_change_pct"] is None else f"{row['p99_change_pct']:+.1f}%"
+        print(f"{row['endpoint']:<48}{row['concurrency']:>6}{throughput:>10}{p99:>10}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test every API route against a local Supabase stand-in")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64], help="Concurrent clients per run")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--warmup", type=int, default=50, help="Untimed requests per endpoint before measuring")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Injected latency per Supabase round trip")
+    parser.add_argument("--jitter-ms", type=float, default=2.0, help="Extra random latency per round trip, up to this much")
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="memory",
+                        help="Serve from the in-memory stand-in or a temporary SQLite database (no injected latency)")
+    parser.add_argument("--users", type=int, default=200, help="Seeded users")
+    parser.add_argument("--submissions-per-user", type=int, default=50, help="Seeded submission history per user")
+    parser.add_argument("--endpoint", action="append", default=[], help="Only run endpoints matching this text or router name (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    parser.add_argument("--compare", help="Previous JSON results to compare against")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = asyncio.run(run_benchmark(
+        concurrency=[max(level, 1) for level in args.concurrency],
+        requests=max(args.requests, 1),
+        warmup=max(args.warmup, 0),
+        latency_ms=max(args.latency_ms, 0.0),
+        jitter_ms=max(args.jitter_ms, 0.0),
+        users=max(args.users, 1),
+        submissions_per_user=max(args.submissions_per_user, 0),
+        endpoints=args.endpoint,
+        backend=args.backend,
+    ))
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        results["comparison"] = {"baseline_commit": baseline.get("commit"), "results": compare(results, baseline)}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(results)
+        if args.compare:
+            print_comparison(results["comparison"]["results"], results["comparison"]["baseline_commit"])
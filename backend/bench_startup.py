@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the serverless entry point
+
+Each run starts a fresh interpreter that imports api/index.py, runs the
+app's startup hooks and serves one request in-process (plain ASGI calls,
+no HTTP client, so nothing the app doesn't import is preloaded). Reports
+import time and time-to-first-response, measured from the first line of
+the child process, for the regular (eager) mode, fast-start mode and
+fast-start with a precompiled (pickled or memory-mapped) catalog file.
+
+Usage (from the project root):
+    python -m backend.bench_startup [--runs 7] [--path /api/problems/problem_1] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINT = os.path.join(PROJECT_ROOT, "api", "index.py")
+
+CHILD = r"""
+import time
+started = time.perf_counter()
+import asyncio, json, runpy, sys
+
+app = runpy.run_path(sys.argv[1])["app"]
+imported = time.perf_counter()
+
+async def request(path):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    sent = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        sent.append(message)
+    await app(scope, receive, send)
+    return sent[0]["status"]
+
+async def main():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        status = await request(sys.argv[2])
+        first = time.perf_counter()
+        await request(sys.argv[2])
+        second = time.perf_counter()
+    print(json.dumps({
+        "status": status,
+        "import_ms": (imported - started) * 1000,
+        "startup_ms": (ready - imported) * 1000,
+        "first_response_ms": (first - started) * 1000,
+        "warm_response_ms": (second - first) * 1000,
+        "modules": len(sys.modules),
+    }))
+
+asyncio.run(main())
+"""
+
+METRICS = ("import_ms", "startup_ms", "first_response_ms", "warm_response_ms")
+
+
+def run_once(env: dict, path: str) -> dict:
+    child_env = {key: value for key, value in os.environ.items() if key not in ("FAST_START", "CATALOG_FILE")}
+    child_env.update({
+        # Background workers never run in a serverless function
+        "JUDGE_QUEUE_WORKER": "0",
+        "DAILY_TRIPLE_PREGENERATE": "0",
+        **env,
+    })
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, ENTRY_POINT, path],
+        env=child_env, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: list) -> dict:
+    summary = {"status": runs[0]["status"], "modules": runs[0]["modules"], "runs": len(runs)}
+    for metric in METRICS:
+        values = [run[metric] for run in runs]
+        summary[metric] = {"median": round(statistics.median(values), 2), "min": round(min(values), 2)}
+    return summary
+
+
+def bench_startup(runs: int = 7, path: str = "/api/problems/problem_1") -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog_files = {}
+        for file_format in ("pickle", "mapped"):
+            catalog_files[file_format] = os.path.join(tmp, f"catalog.{file_format}")
+            subprocess.run(
+                [sys.executable, "-m", "backend.data.compile_catalog",
+                 "--output", catalog_files[file_format], "--format", file_format],
+                cwd=PROJECT_ROOT, check=True, capture_output=True,
+            )
+        modes = {
+            "eager": {"FAST_START": "0"},
+            "fast_start": {"FAST_START": "1"},
+            "fast_start+pickle_catalog": {"FAST_START": "1", "CATALOG_FILE": catalog_files["pickle"]},
+            "fast_start+mapped_catalog": {"FAST_START": "1", "CATALOG_FILE": catalog_files["mapped"]},
+        }
+        # Warm the OS file cache so the first mode isn't penalized
+        run_once(modes["eager"], path)
+        return {
+            mode: summarize([run_once(env, path) for _ in range(runs)])
+            for mode, env in modes.items()
+        }
+
+
+def print_report(results: dict, path: str):
+    print(f"⏱️  Cold start to first response for GET {path} (median / min, ms)")
+    print(f"{'mode':<28}{'import':>16}{'startup':>14}{'first resp.':>18}{'warm resp.':>14}{'modules':>9}")
+    for mode, summary in results.items():
+        cells = [f"{summary[m]['median']:.1f} / {summary[m]['min']:.1f}" for m in METRICS]
+        print(f"{mode:<28}{cells[0]:>16}{cells[1]:>14}{cells[2]:>18}{cells[3]:>14}{summary['modules']:>9}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark serverless cold starts")
+    parser.add_argument("--runs", type=int, default=7, help="Fresh processes per mode")
+    parser.add_argument("--path", default="/api/problems/problem_1", help="Request to time")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = bench_startup(runs=max(args.runs, 1), path=args.path)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results, args.path)
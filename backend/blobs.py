@@ -0,0 +1,85 @@
+"""
+Submission Blobs
+Content-addressed storage for submission code and strategy text. Each body
+is stored once in submission_blobs (sql/011_submission_blobs.sql), keyed
+by the sha256 of its text and zlib-compressed, and submissions reference
+it by digest. Digests already known to be stored are remembered
+in-process, so an identical resubmission skips the blob write entirely.
+load_blobs reads bodies back (e.g. to review a submission) by digest.
+"""
+
+import base64
+import hashlib
+import os
+import zlib
+from typing import Dict, Iterable, List
+
+from backend.cache import TTLCache
+from backend.db import execute
+from backend.supabase_config import get_supabase
+
+BLOB_COMPRESSION_LEVEL = int(os.getenv("BLOB_COMPRESSION_LEVEL", 6))
+# Digests remembered as already stored; blobs are immutable and never deleted
+BLOB_DIGEST_CACHE_SIZE = int(os.getenv("BLOB_DIGEST_CACHE_SIZE", 100000))
+
+ZLIB = "zlib"
+IDENTITY = "identity"
+
+_stored_digests = TTLCache(maxsize=BLOB_DIGEST_CACHE_SIZE, ttl=float("inf"))
+
+
+def blob_digest(text: str) -> str:
+    """Content address of a body: hex sha256 of its UTF-8 text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def encode_blob(text: str) -> dict:
+    """The submission_blobs row for a body, compressed unless that doesn't shrink it"""
+    raw = text.encode("utf-8")
+    compressed = zlib.compress(raw, BLOB_COMPRESSION_LEVEL)
+    encoding, data = (ZLIB, compressed) if len(compressed) < len(raw) else (IDENTITY, raw)
+    return {
+        "digest": hashlib.sha256(raw).hexdigest(),
+        "encoding": encoding,
+        "body": base64.b64encode(data).decode("ascii"),
+        "size": len(raw),
+    }
+
+
+def decode_blob(row: dict) -> str:
+    """The body of a submission_blobs row; reverses encode_blob"""
+    data = base64.b64decode(row["body"])
+    if row["encoding"] == ZLIB:
+        data = zlib.decompress(data)
+    return data.decode("utf-8")
+
+
+async def store_blobs(texts: Iterable[str]) -> List[str]:
+    """Store each body if it isn't stored yet; returns their digests in order"""
+    texts = list(texts)
+    digests = [blob_digest(text) for text in texts]
+    rows = {}
+    for digest, text in zip(digests, texts):
+        if digest not in rows and _stored_digests.get(digest) is None:
+            rows[digest] = encode_blob(text)
+
+    if rows:
+        supabase = get_supabase()
+        await execute(supabase.table("submission_blobs").upsert(
+            list(rows.values()), on_conflict="digest", ignore_duplicates=True, returning="minimal",
+        ))
+        for digest in rows:
+            _stored_digests.set(digest, True)
+    return digests
+
+
+async def load_blobs(digests: Iterable[str]) -> Dict[str, str]:
+    """Bodies for the given digests, keyed by digest (missing ones are omitted)"""
+    digests = sorted(set(digests))
+    if not digests:
+        return {}
+    supabase = get_supabase()
+    result = await execute(
+        supabase.table("submission_blobs").select("digest,encoding,body").in_("digest", digests)
+    )
+    return {row["digest"]: decode_blob(row) for row in result.data}
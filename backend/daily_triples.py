@@ -0,0 +1,217 @@
+"""
+Daily Triple Store
+Each user's triple is picked once per calendar day (in their timezone),
+persisted to the daily_triples table (sql/005_daily_triples.sql) and cached
+in-process by (user_id, date). Refreshes and other workers see the same
+triple, and a background job pre-generates each new day's triples for
+active users just after midnight. Every worker schedules that job, but
+only the one that claims the day's daily_triple_runs row runs it.
+"""
+
+import asyncio
+import os
+import random
+import socket
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from backend.cache import TTLCache
+from backend.data.catalog import ProblemCatalog, get_catalog
+from backend.db import execute
+from backend.spaced_repetition import next_due_review
+from backend.supabase_config import get_supabase
+
+DAILY_TRIPLE_TIMEZONE = os.getenv("DAILY_TRIPLE_TIMEZONE", "UTC")
+DAILY_TRIPLE_CACHE_SIZE = int(os.getenv("DAILY_TRIPLE_CACHE_SIZE", 50000))
+# Users with a submission in this many days count as active for pre-generation
+ACTIVE_USER_DAYS = int(os.getenv("ACTIVE_USER_DAYS", 14))
+PREGENERATE_CONCURRENCY = int(os.getenv("PREGENERATE_CONCURRENCY", 8))
+# Active users fetched per page; keep at or below PostgREST's max-rows (1000 by default)
+ACTIVE_USER_PAGE_SIZE = int(os.getenv("ACTIVE_USER_PAGE_SIZE", 1000))
+# Delay after midnight before pre-generating, so "today" has clearly rolled over
+PREGENERATE_DELAY_SECONDS = float(os.getenv("PREGENERATE_DELAY_SECONDS", 60))
+
+TRIPLE_SLOTS = ("review", "topic", "challenge")
+
+# A (user, date) triple never changes, so entries only need to outlive the day
+_triple_cache = TTLCache(maxsize=DAILY_TRIPLE_CACHE_SIZE, ttl=36 * 3600)
+
+
+def user_today(tz_name: Optional[str] = None, at: Optional[datetime] = None) -> date:
+    """Calendar date now (or at an aware `at`) in the given IANA timezone (raises KeyError if unknown)"""
+    return (at or datetime.now(timezone.utc)).astimezone(ZoneInfo(tz_name or DAILY_TRIPLE_TIMEZONE)).date()
+
+
+async def get_user_daily_state(user_id: str, today: date) -> dict:
+    """Load what today's triple needs to know about the user"""
+    try:
+        review_problem_id = await next_due_review(user_id, today)
+    except Exception as e:
+        print(f"Error loading review schedule for {user_id}: {e}")
+        review_problem_id = None
+
+    return {
+        "user_id": user_id,
+        "date": today,
+        "review_problem_id": review_problem_id,
+    }
+
+
+def choose_problem(rng: random.Random, options, exclude=()) -> dict:
+    """Pick a problem, avoiding ones already in the triple when possible"""
+    for _ in range(8):
+        problem = rng.choice(options)
+        if problem["id"] not in exclude:
+            return problem
+    return problem
+
+
+def pick_daily_triple(catalog: ProblemCatalog, state: dict) -> tuple:
+    """
+    Pick (review, topic, challenge) for a user's day. The RNG is seeded by
+    (user, date), so two workers racing to generate the same triple agree.
+    """
+    rng = random.Random(f"{state['user_id']}:{state['date'].isoformat()}")
+
+    # Review: the most overdue spaced-repetition review, else a random Easy problem
+    review = catalog.get(state["review_problem_id"]) if state["review_problem_id"] else None
+    if review is None:
+        review = choose_problem(rng, catalog.by_difficulty("Easy") or catalog.problems)
+
+    # Topic: Random from the DSA patterns (simulating active pattern)
+    topic = choose_problem(rng, catalog.problems, exclude=(review["id"],))
+
+    # Challenge: Random Medium or Hard problem
+    challenge = choose_problem(
+        rng, catalog.challenge_problems or catalog.problems, exclude=(review["id"], topic["id"])
+    )
+    return review, topic, challenge
+
+
+def _row_to_triple(row: dict) -> Optional[dict]:
+    """Problem ids from a stored row, or None if the catalog no longer has them"""
+    catalog = get_catalog()
+    triple = {slot: row[f"{slot}_id"] for slot in TRIPLE_SLOTS}
+    return triple if all(catalog.get(pid) for pid in triple.values()) else None
+
+
+async def get_daily_triple_ids(user_id: str, day: date) -> dict:
+    """
+    Get {"review", "topic", "challenge"} problem ids for a user's day,
+    generating and persisting them on first use.
+    """
+    key = (user_id, day)
+    triple = _triple_cache.get(key)
+    if triple is not None:
+        return triple
+
+    supabase = get_supabase()
+    result = await execute(
+        supabase.table("daily_triples").select("review_id,topic_id,challenge_id")
+        .eq("user_id", user_id).eq("triple_date", day.isoformat())
+    )
+    triple = _row_to_triple(result.data[0]) if result.data else None
+
+    if triple is None:
+        state = await get_user_daily_state(user_id, day)
+        review, topic, challenge = pick_daily_triple(get_catalog(), state)
+        triple = {"review": review["id"], "topic": topic["id"], "challenge": challenge["id"]}
+        row = {
+            "user_id": user_id,
+            "triple_date": day.isoformat(),
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            **{f"{slot}_id": triple[slot] for slot in TRIPLE_SLOTS},
+        }
+        # A stale row (its problems left the catalog) is overwritten; otherwise
+        # the first writer wins and a losing worker serves the stored triple
+        stale = bool(result.data)
+        inserted = await execute(
+            supabase.table("daily_triples").upsert(
+                row, on_conflict="user_id,triple_date", ignore_duplicates=not stale
+            )
+        )
+        if not stale and not inserted.data:
+            stored = await execute(
+                supabase.table("daily_triples").select("review_id,topic_id,challenge_id")
+                .eq("user_id", user_id).eq("triple_date", day.isoformat())
+            )
+            triple = (_row_to_triple(stored.data[0]) if stored.data else None) or triple
+
+    _triple_cache.set(key, triple)
+    return triple
+
+
+async def pregenerate_daily_triples(day: date) -> int:
+    """Generate `day`'s triple for every recently active user; returns the count"""
+    supabase = get_supabase()
+    since = datetime.now(timezone.utc) - timedelta(days=ACTIVE_USER_DAYS)
+    semaphore = asyncio.Semaphore(PREGENERATE_CONCURRENCY)
+
+    async def generate(user_id: str):
+        async with semaphore:
+            try:
+                await get_daily_triple_ids(user_id, day)
+            except Exception as e:
+                print(f"Error pre-generating daily triple for {user_id}: {e}")
+
+    count, after = 0, None
+    while True:
+        result = await execute(supabase.rpc("active_users", {
+            "p_since": since.isoformat(), "p_after": after, "p_limit": ACTIVE_USER_PAGE_SIZE,
+        }))
+        user_ids = [row["user_id"] for row in result.data or []]
+        await asyncio.gather(*(generate(user_id) for user_id in user_ids))
+        count += len(user_ids)
+        if len(user_ids) < ACTIVE_USER_PAGE_SIZE:
+            return count
+        after = user_ids[-1]
+
+
+async def claim_pregeneration(day: date) -> bool:
+    """Claim `day`'s pre-generation job; True for exactly one worker across the deployment"""
+    supabase = get_supabase()
+    result = await execute(supabase.table("daily_triple_runs").upsert({
+        "run_date": day.isoformat(),
+        "claimed_by": f"{socket.gethostname()}:{os.getpid()}",
+        "claimed_at": datetime.now(timezone.utc).isoformat(),
+    }, on_conflict="run_date", ignore_duplicates=True))
+    return bool(result.data)
+
+
+async def run_pregeneration_forever():
+    """Sleep until just after each midnight, then pre-generate that day's triples"""
+    tz = ZoneInfo(DAILY_TRIPLE_TIMEZONE)
+    while True:
+        now = datetime.now(tz)
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), dt_time.min, tzinfo=tz)
+        await asyncio.sleep((next_midnight - now).total_seconds() + PREGENERATE_DELAY_SECONDS)
+        try:
+            day = user_today()
+            # Triples are generated on first request anyway, so a day whose
+            # claimant dies part-way is only slower, not missing
+            if await claim_pregeneration(day):
+                count = await pregenerate_daily_triples(day)
+                print(f"Pre-generated daily triples for {count} active users")
+        except Exception as e:
+            print(f"Error pre-generating daily triples: {e}")
+
+
+_pregeneration_task: asyncio.Task = None
+
+
+def start_pregeneration():
+    global _pregeneration_task
+    if _pregeneration_task is None:
+        _pregeneration_task = asyncio.get_running_loop().create_task(run_pregeneration_forever())
+
+
+async def stop_pregeneration():
+    global _pregeneration_task
+    if _pregeneration_task is not None:
+        _pregeneration_task.cancel()
+        try:
+            await _pregeneration_task
+        except asyncio.CancelledError:
+            pass
+        _pregeneration_task = None
@@ -1,4 +1,23 @@
 # Data package
-from .seed_data import LEETCODE_PROBLEMS, get_pattern_problems, get_all_patterns, get_problems_by_difficulty
+# The seed data is imported on first access so that importing the catalog
+# (or a precompiled catalog file) doesn't pay for the seed modules
+from .catalog import ProblemCatalog, get_catalog, reload_catalog
 
-__all__ = ["LEETCODE_PROBLEMS", "get_pattern_problems", "get_all_patterns", "get_problems_by_difficulty"]
+_SEED_DATA_NAMES = ("LEETCODE_PROBLEMS", "get_pattern_problems", "get_all_patterns", "get_problems_by_difficulty")
+
+__all__ = [
+    "LEETCODE_PROBLEMS",
+    "get_pattern_problems",
+    "get_all_patterns",
+    "get_problems_by_difficulty",
+    "ProblemCatalog",
+    "get_catalog",
+    "reload_catalog",
+]
+
+
+def __getattr__(name):
+    if name in _SEED_DATA_NAMES:
+        from . import seed_data
+        return getattr(seed_data, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
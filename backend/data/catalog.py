@@ -0,0 +1,195 @@
+"""
+Problem Catalog Index
+Immutable, precomputed indexes over the problem set so route handlers
+never scan LEETCODE_PROBLEMS on a request
+
+The seed data modules are only imported when the catalog is first built.
+Setting CATALOG_FILE loads a catalog precompiled by
+`python -m backend.data.compile_catalog` instead, skipping both the seed
+modules and the index build: either a pickle, or a memory-mapped file
+(mapped_catalog.py) that all workers share for large problem sets.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from typing import Dict, Iterable, Optional, Tuple
+
+CHALLENGE_DIFFICULTIES = ("Medium", "Hard")
+CATALOG_FILE = os.getenv("CATALOG_FILE")
+
+
+def problem_id_for(leetcode_number: int) -> str:
+    """Build the public problem id used by the API ("problem_<n>")"""
+    return f"problem_{leetcode_number}"
+
+
+class ProblemCatalog:
+    """
+    Read-only view of the problem set, indexed by id, leetcode number,
+    pattern, difficulty and (pattern, difficulty), plus the judge test
+    suite for each problem that has one.
+
+    Every index is built once in the constructor; lookups return shared
+    tuples, so callers must treat the returned problems as read-only.
+    """
+
+    __slots__ = (
+        "_problems",
+        "_by_id",
+        "_by_number",
+        "_by_pattern",
+        "_by_difficulty",
+        "_by_pattern_difficulty",
+        "_patterns",
+        "_challenge_problems",
+        "_test_suites",
+        "_version",
+    )
+
+    def __init__(self, problems: Iterable[dict], test_suites: Dict[int, dict] = None):
+        by_id: Dict[str, dict] = {}
+        by_number: Dict[int, dict] = {}
+        by_pattern: Dict[str, list] = {}
+        by_difficulty: Dict[str, list] = {}
+        by_pattern_difficulty: Dict[Tuple[str, str], list] = {}
+
+        for raw in problems:
+            problem = dict(raw)
+            problem["id"] = problem_id_for(problem["leetcode_number"])
+            if problem["id"] in by_id:
+                raise ValueError(f"Duplicate problem in catalog: {problem['id']}")
+
+            by_id[problem["id"]] = problem
+            by_number[problem["leetcode_number"]] = problem
+            by_pattern.setdefault(problem["pattern"], []).append(problem)
+            by_difficulty.setdefault(problem["difficulty"], []).append(problem)
+            by_pattern_difficulty.setdefault(
+                (problem["pattern"], problem["difficulty"]), []
+            ).append(problem)
+
+        self._problems = tuple(by_id.values())
+        self._by_id = by_id
+        self._by_number = by_number
+        self._by_pattern = {k: tuple(v) for k, v in by_pattern.items()}
+        self._by_difficulty = {k: tuple(v) for k, v in by_difficulty.items()}
+        self._by_pattern_difficulty = {k: tuple(v) for k, v in by_pattern_difficulty.items()}
+        self._patterns = tuple(sorted(self._by_pattern))
+        self._challenge_problems = tuple(
+            p for p in self._problems if p["difficulty"] in CHALLENGE_DIFFICULTIES
+        )
+        self._test_suites = {
+            problem_id_for(number): suite
+            for number, suite in (test_suites or {}).items()
+            if number in by_number
+        }
+        # Covers the test suites too: the judge queue dedups jobs on it
+        self._version = hashlib.sha256(
+            json.dumps([self._problems, self._test_suites], sort_keys=True, default=repr).encode("utf-8")
+        ).hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self._problems)
+
+    def __iter__(self):
+        return iter(self._problems)
+
+    @property
+    def problems(self) -> Tuple[dict, ...]:
+        """All problems in seed order"""
+        return self._problems
+
+    @property
+    def patterns(self) -> Tuple[str, ...]:
+        """Sorted unique pattern names"""
+        return self._patterns
+
+    @property
+    def challenge_problems(self) -> Tuple[dict, ...]:
+        """Medium and Hard problems, used for the Daily Triple challenge slot"""
+        return self._challenge_problems
+
+    @property
+    def version(self) -> str:
+        """Short content hash of the catalog; changes whenever the data changes"""
+        return self._version
+
+    def get(self, problem_id: str) -> Optional[dict]:
+        """Get a problem by its "problem_<n>" id"""
+        return self._by_id.get(problem_id)
+
+    def by_number(self, leetcode_number: int) -> Optional[dict]:
+        """Get a problem by its LeetCode number"""
+        return self._by_number.get(leetcode_number)
+
+    def by_pattern(self, pattern: str) -> Tuple[dict, ...]:
+        """Get all problems for a pattern"""
+        return self._by_pattern.get(pattern, ())
+
+    def by_difficulty(self, difficulty: str) -> Tuple[dict, ...]:
+        """Get all problems for a difficulty"""
+        return self._by_difficulty.get(difficulty, ())
+
+    def by_pattern_and_difficulty(self, pattern: str, difficulty: str) -> Tuple[dict, ...]:
+        """Get all problems for a (pattern, difficulty) pair"""
+        return self._by_pattern_difficulty.get((pattern, difficulty), ())
+
+    def test_suite(self, problem_id: str) -> Optional[dict]:
+        """Get the judge test suite for a problem, if it has one"""
+        return self._test_suites.get(problem_id)
+
+
+# Built lazily on first use, then shared for the life of the process
+_catalog: ProblemCatalog = None
+
+
+def build_catalog() -> ProblemCatalog:
+    """Build the catalog from the seed data modules"""
+    from .seed_data import LEETCODE_PROBLEMS
+    from .test_cases import TEST_SUITES
+    return ProblemCatalog(LEETCODE_PROBLEMS, TEST_SUITES)
+
+
+def save_catalog_file(catalog: ProblemCatalog, path: str):
+    """Write a built catalog, indexes included, to a precompiled file"""
+    with open(path, "wb") as f:
+        pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_catalog_file(path: str) -> ProblemCatalog:
+    """Load a catalog written by save_catalog_file or write_mapped_catalog"""
+    from .mapped_catalog import MappedProblemCatalog, is_mapped_catalog
+    if is_mapped_catalog(path):
+        return MappedProblemCatalog(path)
+
+    with open(path, "rb") as f:
+        catalog = pickle.load(f)
+    if not isinstance(catalog, ProblemCatalog):
+        raise ValueError(f"{path} does not contain a problem catalog")
+    return catalog
+
+
+def get_catalog() -> ProblemCatalog:
+    global _catalog
+    if _catalog is None:
+        if CATALOG_FILE:
+            try:
+                _catalog = load_catalog_file(CATALOG_FILE)
+                return _catalog
+            except (OSError, ValueError, pickle.UnpicklingError) as e:
+                print(f"Could not load catalog file {CATALOG_FILE}, building from seed data: {e}")
+        _catalog = build_catalog()
+    return _catalog
+
+
+def reload_catalog(problems: Iterable[dict] = None, test_suites: Dict[int, dict] = None) -> ProblemCatalog:
+    """Rebuild the shared catalog, e.g. after a reseed"""
+    global _catalog
+    if problems is None or test_suites is None:
+        from .seed_data import LEETCODE_PROBLEMS
+        from .test_cases import TEST_SUITES
+        problems = LEETCODE_PROBLEMS if problems is None else problems
+        test_suites = TEST_SUITES if test_suites is None else test_suites
+    _catalog = ProblemCatalog(problems, test_suites)
+    return _catalog
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Precompile the problem catalog for fast starts
+
+Builds the catalog from the seed data and writes it, indexes included, to
+a single file. Point CATALOG_FILE at the output to have get_catalog() load
+it instead of importing the seed modules and rebuilding the indexes.
+Rerun whenever seed_data.py or test_cases.py changes.
+
+Two formats: "mapped" (the default, see mapped_catalog.py) is memory-mapped
+and shared by every worker, so it suits large problem sets; "pickle" loads
+the whole catalog into each process.
+
+Usage (from the project root):
+    python -m backend.data.compile_catalog [--output backend/data/catalog.bin] [--format mapped|pickle]
+"""
+
+import argparse
+import os
+
+from .catalog import build_catalog, load_catalog_file, save_catalog_file
+from .mapped_catalog import write_mapped_catalog
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "catalog.bin")
+FORMATS = {"mapped": write_mapped_catalog, "pickle": save_catalog_file}
+
+
+def compile_catalog(output: str = DEFAULT_OUTPUT, file_format: str = "mapped") -> str:
+    catalog = build_catalog()
+    FORMATS[file_format](catalog, output)
+
+    # Read it back so a broken file never ships
+    loaded = load_catalog_file(output)
+    if loaded.version != catalog.version:
+        raise RuntimeError(f"{output} does not round-trip (version {loaded.version} != {catalog.version})")
+
+    print(f"✅ Wrote {len(catalog)} problems (version {catalog.version}, {file_format}) to {output} "
+          f"({os.path.getsize(output)} bytes)")
+    return output
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Precompile the problem catalog")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Where to write the catalog file")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="mapped", help="Catalog file format")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    compile_catalog(args.output, args.format)
@@ -0,0 +1,308 @@
+"""
+Memory-Mapped Problem Catalog
+A compact binary catalog format and a read-only catalog that serves it
+straight from a memory map. Every uvicorn worker maps the same file, so
+all of them share one page-cache copy of the problem text, and opening
+the catalog only reads a small header and the group table: load time and
+per-worker memory stay nearly flat as the problem set grows.
+
+Layout (little-endian, sections 8-byte aligned):
+
+    header    MAGIC, then the u32 fields in HEADER
+    strings   u32 offsets[n_strings + 1], then UTF-8 bytes; every distinct
+              string (titles, patterns, complexities, test suites as JSON,
+              the catalog version) is stored once
+    problems  n_problems records of PROBLEM_FIELDS as u32 (string ids,
+              except leetcode_number)
+    numbers   u32 leetcode numbers, sorted, then u32 problem indexes in
+              the same order (binary-searched by by_number/get)
+    groups    n_groups records of (kind, key, key2, start, count)
+    members   u32 problem indexes referenced by the groups
+
+Build files with `python -m backend.data.compile_catalog`.
+"""
+
+import bisect
+import json
+import mmap
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .catalog import ProblemCatalog, problem_id_for
+
+MAGIC = b"LGCAT\x00\x01\x00"
+HEADER = (
+    "n_strings", "strings_pos", "n_problems", "problems_pos", "numbers_pos",
+    "n_groups", "groups_pos", "members_pos", "version",
+)
+HEADER_FORMAT = "<8s" + "I" * len(HEADER)
+
+PROBLEM_FIELDS = (
+    "title", "leetcode_number", "difficulty", "pattern", "description",
+    "time_complexity", "space_complexity", "concept_focus", "link", "test_suite",
+)
+NUMBER_FIELD = PROBLEM_FIELDS.index("leetcode_number")
+TEST_SUITE_FIELD = PROBLEM_FIELDS.index("test_suite")
+NO_STRING = 0xFFFFFFFF
+
+GROUP_PATTERN, GROUP_DIFFICULTY, GROUP_PATTERN_DIFFICULTY, GROUP_CHALLENGE = range(4)
+GROUP_FIELDS = 5
+
+# Decoded problem dicts kept per worker
+DECODED_CACHE_SIZE = 4096
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def write_mapped_catalog(catalog: ProblemCatalog, path: str):
+    """Compile a built catalog into the memory-mappable format"""
+    strings: Dict[str, int] = {}
+
+    def intern(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        return strings.setdefault(value, len(strings))
+
+    records: List[int] = []
+    for problem in catalog.problems:
+        suite = catalog.test_suite(problem["id"])
+        for field in PROBLEM_FIELDS:
+            if field == "leetcode_number":
+                records.append(problem[field])
+            elif field == "test_suite":
+                records.append(intern(json.dumps(suite, separators=(",", ":")) if suite else None))
+            else:
+                records.append(intern(problem[field]))
+
+    index_of = {problem["id"]: i for i, problem in enumerate(catalog.problems)}
+    numbers = sorted((problem["leetcode_number"], i) for i, problem in enumerate(catalog.problems))
+
+    groups: List[int] = []
+    members: List[int] = []
+
+    def add_group(kind: int, key: str, key2: Optional[str], problems: Iterable[dict]):
+        ids = [index_of[p["id"]] for p in problems]
+        groups.extend((kind, intern(key), intern(key2), len(members), len(ids)))
+        members.extend(ids)
+
+    difficulties = sorted({p["difficulty"] for p in catalog.problems})
+    for pattern in catalog.patterns:
+        add_group(GROUP_PATTERN, pattern, None, catalog.by_pattern(pattern))
+        for difficulty in difficulties:
+            if catalog.by_pattern_and_difficulty(pattern, difficulty):
+                add_group(GROUP_PATTERN_DIFFICULTY, pattern, difficulty,
+                          catalog.by_pattern_and_difficulty(pattern, difficulty))
+    for difficulty in difficulties:
+        add_group(GROUP_DIFFICULTY, difficulty, None, catalog.by_difficulty(difficulty))
+    add_group(GROUP_CHALLENGE, "challenge", None, catalog.challenge_problems)
+    version = intern(catalog.version)
+
+    encoded = [value.encode("utf-8") for value in strings]
+    offsets = [0]
+    for blob in encoded:
+        offsets.append(offsets[-1] + len(blob))
+
+    header_size = struct.calcsize(HEADER_FORMAT)
+    strings_pos = _align(header_size)
+    problems_pos = _align(strings_pos + 4 * len(offsets) + offsets[-1])
+    numbers_pos = _align(problems_pos + 4 * len(records))
+    groups_pos = _align(numbers_pos + 8 * len(numbers))
+    members_pos = _align(groups_pos + 4 * len(groups))
+
+    def u32(values) -> bytes:
+        return struct.pack(f"<{len(values)}I", *values)
+
+    sections = [
+        (strings_pos, u32(offsets) + b"".join(encoded)),
+        (problems_pos, u32(records)),
+        (numbers_pos, u32([n for n, _ in numbers]) + u32([i for _, i in numbers])),
+        (groups_pos, u32(groups)),
+        (members_pos, u32(members)),
+    ]
+    header = struct.pack(
+        HEADER_FORMAT, MAGIC, len(strings), strings_pos, len(catalog.problems), problems_pos,
+        numbers_pos, len(groups) // GROUP_FIELDS, groups_pos, members_pos, version,
+    )
+
+    with open(path, "wb") as f:
+        f.write(header)
+        for position, data in sections:
+            f.write(b"\x00" * (position - f.tell()))
+            f.write(data)
+
+
+def is_mapped_catalog(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class ProblemSequence(Sequence):
+    """Read-only sequence of problems decoded on access"""
+
+    __slots__ = ("_catalog", "_indexes")
+
+    def __init__(self, catalog: "MappedProblemCatalog", indexes):
+        self._catalog = catalog
+        self._indexes = indexes
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._catalog._problem(j) for j in self._indexes[i]]
+        return self._catalog._problem(self._indexes[i])
+
+
+class MappedProblemCatalog:
+    """
+    ProblemCatalog served from a memory-mapped catalog file. Problems are
+    decoded on access (recently used ones are kept), and the by_* views
+    are lazy sequences over index arrays in the map.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Mapped catalogs are little-endian")
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, *fields = struct.unpack_from(HEADER_FORMAT, self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a mapped catalog")
+        header = dict(zip(HEADER, fields))
+        view = memoryview(self._map)
+
+        def u32(position: int, count: int):
+            return view[position:position + 4 * count].cast("I")
+
+        n_strings = header["n_strings"]
+        n_problems = header["n_problems"]
+        self._offsets = u32(header["strings_pos"], n_strings + 1)
+        self._strings_start = header["strings_pos"] + 4 * (n_strings + 1)
+        self._records = u32(header["problems_pos"], n_problems * len(PROBLEM_FIELDS))
+        self._numbers = u32(header["numbers_pos"], n_problems)
+        self._number_index = u32(header["numbers_pos"] + 4 * n_problems, n_problems)
+        self._decoded: "OrderedDict[int, dict]" = OrderedDict()
+        self._decoded_lock = threading.Lock()
+        self._version = self._string(header["version"])
+
+        # The group table is tiny (patterns x difficulties); read it eagerly
+        groups = u32(header["groups_pos"], header["n_groups"] * GROUP_FIELDS)
+        total_members = sum(groups[g * GROUP_FIELDS + 4] for g in range(header["n_groups"]))
+        members = u32(header["members_pos"], total_members)
+        self._groups: Dict[Tuple[int, str, Optional[str]], ProblemSequence] = {}
+        for g in range(header["n_groups"]):
+            kind, key, key2, start, count = groups[g * GROUP_FIELDS:(g + 1) * GROUP_FIELDS]
+            group_key = (kind, self._string(key), self._string(key2))
+            self._groups[group_key] = ProblemSequence(self, members[start:start + count])
+
+        self._problems = ProblemSequence(self, range(n_problems))
+        self._patterns = tuple(sorted(key for kind, key, _ in self._groups if kind == GROUP_PATTERN))
+        self._challenge_problems = self._groups.get((GROUP_CHALLENGE, "challenge", None), ())
+
+    def _string(self, string_id: int) -> Optional[str]:
+        if string_id == NO_STRING:
+            return None
+        start = self._strings_start + self._offsets[string_id]
+        end = self._strings_start + self._offsets[string_id + 1]
+        return self._map[start:end].decode("utf-8")
+
+    def _record(self, index: int):
+        width = len(PROBLEM_FIELDS)
+        return self._records[index * width:(index + 1) * width]
+
+    def _problem(self, index: int) -> dict:
+        # Routes read the catalog from thread pools; the LRU order is shared state
+        with self._decoded_lock:
+            problem = self._decoded.get(index)
+            if problem is not None:
+                self._decoded.move_to_end(index)
+                return problem
+
+        record = self._record(index)
+        problem = {
+            field: record[i] if i == NUMBER_FIELD else self._string(record[i])
+            for i, field in enumerate(PROBLEM_FIELDS)
+            if i != TEST_SUITE_FIELD
+        }
+        problem["id"] = problem_id_for(problem["leetcode_number"])
+        with self._decoded_lock:
+            self._decoded[index] = problem
+            if len(self._decoded) > DECODED_CACHE_SIZE:
+                self._decoded.popitem(last=False)
+        return problem
+
+    def _index_of_number(self, leetcode_number: int) -> Optional[int]:
+        i = bisect.bisect_left(self._numbers, leetcode_number)
+        if i < len(self._numbers) and self._numbers[i] == leetcode_number:
+            return self._number_index[i]
+        return None
+
+    def _index_of_id(self, problem_id: str) -> Optional[int]:
+        prefix, _, number = problem_id.partition("_")
+        if prefix != "problem" or not number.isdigit() or problem_id_for(int(number)) != problem_id:
+            return None
+        return self._index_of_number(int(number))
+
+    def __len__(self) -> int:
+        return len(self._problems)
+
+    def __iter__(self):
+        return iter(self._problems)
+
+    @property
+    def problems(self) -> Sequence:
+        """All problems in seed order"""
+        return self._problems
+
+    @property
+    def patterns(self) -> Tuple[str, ...]:
+        """Sorted unique pattern names"""
+        return self._patterns
+
+    @property
+    def challenge_problems(self) -> Sequence:
+        """Medium and Hard problems, used for the Daily Triple challenge slot"""
+        return self._challenge_problems
+
+    @property
+    def version(self) -> str:
+        """Content hash of the catalog the file was compiled from"""
+        return self._version
+
+    def get(self, problem_id: str) -> Optional[dict]:
+        """Get a problem by its "problem_<n>" id"""
+        index = self._index_of_id(problem_id)
+        return None if index is None else self._problem(index)
+
+    def by_number(self, leetcode_number: int) -> Optional[dict]:
+        """Get a problem by its LeetCode number"""
+        index = self._index_of_number(leetcode_number)
+        return None if index is None else self._problem(index)
+
+    def by_pattern(self, pattern: str) -> Sequence:
+        """Get all problems for a pattern"""
+        return self._groups.get((GROUP_PATTERN, pattern, None), ())
+
+    def by_difficulty(self, difficulty: str) -> Sequence:
+        """Get all problems for a difficulty"""
+        return self._groups.get((GROUP_DIFFICULTY, difficulty, None), ())
+
+    def by_pattern_and_difficulty(self, pattern: str, difficulty: str) -> Sequence:
+        """Get all problems for a (pattern, difficulty) pair"""
+        return self._groups.get((GROUP_PATTERN_DIFFICULTY, pattern, difficulty), ())
+
+    def test_suite(self, problem_id: str) -> Optional[dict]:
+        """Get the judge test suite for a problem, if it has one"""
+        index = self._index_of_id(problem_id)
+        if index is None:
+            return None
+        suite = self._string(self._record(index)[TEST_SUITE_FIELD])
+        return json.loads(suite) if suite else None
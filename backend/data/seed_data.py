@@ -247,12 +247,15 @@ LEETCODE_PROBLEMS = [
 
 def get_pattern_problems(pattern: str):
     """Get all problems for a specific pattern"""
-    return [p for p in LEETCODE_PROBLEMS if p["pattern"] == pattern]
+    from .catalog import get_catalog
+    return get_catalog().by_pattern(pattern)
 
 def get_all_patterns():
     """Get unique DSA patterns"""
-    return list(set(p["pattern"] for p in LEETCODE_PROBLEMS))
+    from .catalog import get_catalog
+    return get_catalog().patterns
 
 def get_problems_by_difficulty(difficulty: str):
     """Get all problems for a specific difficulty"""
-    return [p for p in LEETCODE_PROBLEMS if p["difficulty"] == difficulty]
+    from .catalog import get_catalog
+    return get_catalog().by_difficulty(difficulty)
@@ -0,0 +1,227 @@
+"""
+Judge Test Cases
+Per-problem test suites used to evaluate submissions, keyed by LeetCode number.
+
+Each suite names the method to call (as a `Solution` method or a top-level
+function), how to compare results, and the cases to run. `arg_types` and
+`return_type` mark arguments and results that must be converted to and from
+TreeNode ("tree", level-order list) or ListNode ("linked_list").
+"""
+
+TEST_SUITES = {
+    # Hash Table
+    1: {
+        "entry_point": "twoSum",
+        "compare": "unordered",
+        "cases": [
+            {"args": [[2, 7, 11, 15], 9], "expected": [0, 1]},
+            {"args": [[3, 2, 4], 6], "expected": [1, 2]},
+            {"args": [[3, 3], 6], "expected": [0, 1]},
+            {"args": [[-1, -2, -3, -4, -5], -8], "expected": [2, 4]},
+        ],
+    },
+    217: {
+        "entry_point": "containsDuplicate",
+        "cases": [
+            {"args": [[1, 2, 3, 1]], "expected": True},
+            {"args": [[1, 2, 3, 4]], "expected": False},
+            {"args": [[1, 1, 1, 3, 3, 4, 3, 2, 4, 2]], "expected": True},
+            {"args": [[7]], "expected": False},
+        ],
+    },
+    242: {
+        "entry_point": "isAnagram",
+        "cases": [
+            {"args": ["anagram", "nagaram"], "expected": True},
+            {"args": ["rat", "car"], "expected": False},
+            {"args": ["a", "ab"], "expected": False},
+            {"args": ["", ""], "expected": True},
+        ],
+    },
+    # Sliding Window
+    3: {
+        "entry_point": "lengthOfLongestSubstring",
+        "cases": [
+            {"args": ["abcabcbb"], "expected": 3},
+            {"args": ["bbbbb"], "expected": 1},
+            {"args": ["pwwkew"], "expected": 3},
+            {"args": [""], "expected": 0},
+            {"args": ["dvdf"], "expected": 3},
+        ],
+    },
+    121: {
+        "entry_point": "maxProfit",
+        "cases": [
+            {"args": [[7, 1, 5, 3, 6, 4]], "expected": 5},
+            {"args": [[7, 6, 4, 3, 1]], "expected": 0},
+            {"args": [[2, 4, 1]], "expected": 2},
+            {"args": [[1]], "expected": 0},
+        ],
+    },
+    239: {
+        "entry_point": "maxSlidingWindow",
+        "cases": [
+            {"args": [[1, 3, -1, -3, 5, 3, 6, 7], 3], "expected": [3, 3, 5, 5, 6, 7]},
+            {"args": [[1], 1], "expected": [1]},
+            {"args": [[9, 8, 7, 6], 2], "expected": [9, 8, 7]},
+            {"args": [[1, -1], 1], "expected": [1, -1]},
+        ],
+    },
+    # BFS / DFS on Trees
+    102: {
+        "entry_point": "levelOrder",
+        "arg_types": ["tree"],
+        "cases": [
+            {"args": [[3, 9, 20, None, None, 15, 7]], "expected": [[3], [9, 20], [15, 7]]},
+            {"args": [[1]], "expected": [[1]]},
+            {"args": [[]], "expected": []},
+            {"args": [[1, 2, 3, 4, None, None, 5]], "expected": [[1], [2, 3], [4, 5]]},
+        ],
+    },
+    94: {
+        "entry_point": "inorderTraversal",
+        "arg_types": ["tree"],
+        "cases": [
+            {"args": [[1, None, 2, 3]], "expected": [1, 3, 2]},
+            {"args": [[]], "expected": []},
+            {"args": [[1]], "expected": [1]},
+            {"args": [[4, 2, 6, 1, 3, 5, 7]], "expected": [1, 2, 3, 4, 5, 6, 7]},
+        ],
+    },
+    104: {
+        "entry_point": "maxDepth",
+        "arg_types": ["tree"],
+        "cases": [
+            {"args": [[3, 9, 20, None, None, 15, 7]], "expected": 3},
+            {"args": [[1, None, 2]], "expected": 2},
+            {"args": [[]], "expected": 0},
+        ],
+    },
+    # Two Pointers
+    167: {
+        "entry_point": "twoSum",
+        "cases": [
+            {"args": [[2, 7, 11, 15], 9], "expected": [1, 2]},
+            {"args": [[2, 3, 4], 6], "expected": [1, 3]},
+            {"args": [[-1, 0], -1], "expected": [1, 2]},
+        ],
+    },
+    11: {
+        "entry_point": "maxArea",
+        "cases": [
+            {"args": [[1, 8, 6, 2, 5, 4, 8, 3, 7]], "expected": 49},
+            {"args": [[1, 1]], "expected": 1},
+            {"args": [[4, 3, 2, 1, 4]], "expected": 16},
+        ],
+    },
+    125: {
+        "entry_point": "isPalindrome",
+        "cases": [
+            {"args": ["A man, a plan, a canal: Panama"], "expected": True},
+            {"args": ["race a car"], "expected": False},
+            {"args": [" "], "expected": True},
+            {"args": ["0P"], "expected": False},
+        ],
+    },
+    # Dynamic Programming
+    70: {
+        "entry_point": "climbStairs",
+        "cases": [
+            {"args": [2], "expected": 2},
+            {"args": [3], "expected": 3},
+            {"args": [1], "expected": 1},
+            {"args": [45], "expected": 1836311903},
+        ],
+    },
+    198: {
+        "entry_point": "rob",
+        "cases": [
+            {"args": [[1, 2, 3, 1]], "expected": 4},
+            {"args": [[2, 7, 9, 3, 1]], "expected": 12},
+            {"args": [[2, 1, 1, 2]], "expected": 4},
+            {"args": [[5]], "expected": 5},
+        ],
+    },
+    322: {
+        "entry_point": "coinChange",
+        "cases": [
+            {"args": [[1, 2, 5], 11], "expected": 3},
+            {"args": [[2], 3], "expected": -1},
+            {"args": [[1], 0], "expected": 0},
+            {"args": [[186, 419, 83, 408], 6249], "expected": 20},
+        ],
+    },
+    # Graphs
+    200: {
+        "entry_point": "numIslands",
+        "cases": [
+            {
+                "args": [[
+                    ["1", "1", "1", "1", "0"],
+                    ["1", "1", "0", "1", "0"],
+                    ["1", "1", "0", "0", "0"],
+                    ["0", "0", "0", "0", "0"],
+                ]],
+                "expected": 1,
+            },
+            {
+                "args": [[
+                    ["1", "1", "0", "0", "0"],
+                    ["1", "1", "0", "0", "0"],
+                    ["0", "0", "1", "0", "0"],
+                    ["0", "0", "0", "1", "1"],
+                ]],
+                "expected": 3,
+            },
+            {"args": [[["0"]]], "expected": 0},
+        ],
+    },
+    207: {
+        "entry_point": "canFinish",
+        "cases": [
+            {"args": [2, [[1, 0]]], "expected": True},
+            {"args": [2, [[1, 0], [0, 1]]], "expected": False},
+            {"args": [3, []], "expected": True},
+            {"args": [4, [[1, 0], [2, 1], [3, 2], [1, 3]]], "expected": False},
+        ],
+    },
+    # Linked List
+    206: {
+        "entry_point": "reverseList",
+        "arg_types": ["linked_list"],
+        "return_type": "linked_list",
+        "cases": [
+            {"args": [[1, 2, 3, 4, 5]], "expected": [5, 4, 3, 2, 1]},
+            {"args": [[1, 2]], "expected": [2, 1]},
+            {"args": [[]], "expected": []},
+        ],
+    },
+    21: {
+        "entry_point": "mergeTwoLists",
+        "arg_types": ["linked_list", "linked_list"],
+        "return_type": "linked_list",
+        "cases": [
+            {"args": [[1, 2, 4], [1, 3, 4]], "expected": [1, 1, 2, 3, 4, 4]},
+            {"args": [[], []], "expected": []},
+            {"args": [[], [0]], "expected": [0]},
+        ],
+    },
+    # Binary Search
+    704: {
+        "entry_point": "search",
+        "cases": [
+            {"args": [[-1, 0, 3, 5, 9, 12], 9], "expected": 4},
+            {"args": [[-1, 0, 3, 5, 9, 12], 2], "expected": -1},
+            {"args": [[5], 5], "expected": 0},
+        ],
+    },
+    35: {
+        "entry_point": "searchInsert",
+        "cases": [
+            {"args": [[1, 3, 5, 6], 5], "expected": 2},
+            {"args": [[1, 3, 5, 6], 2], "expected": 1},
+            {"args": [[1, 3, 5, 6], 7], "expected": 4},
+            {"args": [[1, 3, 5, 6], 0], "expected": 0},
+        ],
+    },
+}
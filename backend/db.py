@@ -0,0 +1,68 @@
+"""
+Async Data-Access Layer
+supabase-py 2.4 only ships a synchronous PostgREST client, so every query
+built by the routes is executed on a bounded thread pool instead of on the
+event loop. Requests inside one uvicorn worker can then overlap their
+database round trips.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from backend.metrics import record_query
+
+# Upper bound on concurrent in-flight queries per worker process
+DB_MAX_WORKERS = int(os.getenv("DB_MAX_WORKERS", 16))
+# Per-call timeout in seconds, applied on top of the HTTP client timeout
+DB_QUERY_TIMEOUT = float(os.getenv("DB_QUERY_TIMEOUT", 10))
+
+_executor: ThreadPoolExecutor = None
+
+
+class QueryTimeoutError(TimeoutError):
+    """Raised when a query does not finish within its timeout"""
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=DB_MAX_WORKERS,
+            thread_name_prefix="supabase-io",
+        )
+    return _executor
+
+
+def shutdown_executor():
+    """Stop the query thread pool (called on app shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def execute(query, timeout: Optional[float] = None):
+    """
+    Run a PostgREST query builder (table or rpc) without blocking the event loop.
+
+    Raises QueryTimeoutError if the query takes longer than `timeout`
+    seconds (DB_QUERY_TIMEOUT by default). Every call is timed and counted
+    in backend.metrics.
+    """
+    timeout = timeout or DB_QUERY_TIMEOUT
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    future = loop.run_in_executor(get_executor(), query.execute)
+    try:
+        result = await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        record_query(query, time.perf_counter() - started, failed=True)
+        raise QueryTimeoutError(f"Query timed out after {timeout}s")
+    except Exception:
+        record_query(query, time.perf_counter() - started, failed=True)
+        raise
+    record_query(query, time.perf_counter() - started, result)
+    return result
@@ -0,0 +1,187 @@
+"""
+Response Encoding
+Content negotiation for response bodies: gzip/brotli compression of
+compressible responses above a size threshold (CompressionMiddleware), and
+MessagePack as an alternative to JSON for clients that ask for it in
+their Accept header.
+
+Compressed bodies of responses with a strong ETag (the pre-encoded
+catalog payloads) are cached, so each one is compressed once per worker.
+"""
+
+import gzip
+import os
+from typing import Dict, Optional
+
+import brotli
+import msgpack
+from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
+
+from backend.cache import TTLCache
+
+# Bodies smaller than this are sent uncompressed; framing overhead outweighs the savings
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+# Brotli's higher qualities are too slow for dynamic responses
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 4))
+COMPRESSED_CACHE_SIZE = int(os.getenv("COMPRESSED_CACHE_SIZE", 1024))
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack")
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "text/", "application/javascript") + MSGPACK_MEDIA_TYPES
+
+# Server preference when the client rates several codings equally
+ENCODINGS = ("br", "gzip")
+
+_compressed = TTLCache(maxsize=COMPRESSED_CACHE_SIZE, ttl=float("inf"))
+
+
+def parse_qualities(header: str) -> Dict[str, float]:
+    """Map each value of an Accept / Accept-Encoding header to its q-value"""
+    qualities = {}
+    for part in header.split(","):
+        value, *params = (piece.strip() for piece in part.split(";"))
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, number = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        qualities[value.lower()] = quality
+    return qualities
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best content coding the client accepts ("br" or "gzip"), or None for identity"""
+    qualities = parse_qualities(accept_encoding)
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in ENCODINGS:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.lower().startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+
+def add_vary(headers: MutableHeaders, field: str):
+    """Append a request header name to Vary unless it's already listed"""
+    current = headers.get("vary")
+    if not current:
+        headers["Vary"] = field
+    elif field.lower() not in (value.strip().lower() for value in current.split(",")):
+        headers["Vary"] = f"{current}, {field}"
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing single-part responses with the best coding
+    the client accepts. Streaming responses, small bodies and bodies that
+    are already encoded are passed through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = next((value for name, value in scope["headers"] if name == b"accept-encoding"), b"")
+        coding = negotiate_encoding(accept_encoding.decode("latin-1"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        pending_start = None
+
+        async def send_wrapper(message):
+            nonlocal pending_start
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether it's worth compressing
+                pending_start = message
+                return
+            if message["type"] != "http.response.body" or pending_start is None:
+                await send(message)
+                return
+
+            start, pending_start = pending_start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(start["headers"]))
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or "content-encoding" in headers
+                or not is_compressible(headers.get("content-type"))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            etag = headers.get("etag")
+            strong = etag is not None and not etag.startswith("W/")
+            compressed = _compressed.get((etag, coding)) if strong else None
+            if compressed is None:
+                compressed = compress(body, coding)
+                if strong:
+                    _compressed.set((etag, coding), compressed)
+
+            headers["Content-Encoding"] = coding
+            headers["Content-Length"] = str(len(compressed))
+            add_vary(headers, "Accept-Encoding")
+            if strong:
+                # The compressed bytes differ, so the validator can only be weak
+                headers["ETag"] = f"W/{etag}"
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def wants_msgpack(request: Request) -> bool:
+    """True if the Accept header prefers MessagePack over JSON"""
+    header = request.headers.get("accept")
+    if not header or "msgpack" not in header:
+        return False
+    qualities = parse_qualities(header)
+    msgpack_quality = max(qualities.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    return msgpack_quality > 0 and msgpack_quality >= qualities.get("application/json", 0.0)
+
+
+def packb(value) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def msgpack_map_header(size: int) -> bytes:
+    """Header of a MessagePack map with `size` entries, for stitching pre-encoded values"""
+    if size < 16:
+        return bytes((0x80 | size,))
+    if size < 1 << 16:
+        return b"\xde" + size.to_bytes(2, "big")
+    return b"\xdf" + size.to_bytes(4, "big")
+
+
+def msgpack_response(content, headers: Optional[dict] = None) -> Response:
+    """Encode a JSON-compatible value as a MessagePack response"""
+    return Response(content=packb(content), media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+
+
+def compression_stats() -> dict:
+    """Counters of the compressed-body cache, for /metrics"""
+    return _compressed.stats()
@@ -0,0 +1,281 @@
+"""
+Local Supabase Stand-In
+An in-memory, PostgREST-like client for benchmarks and local runs without
+a Supabase project. It executes the query builder and RPCs shared with the
+SQLite backend (backend/storage/), with a configurable injected latency
+per round trip so the async data-access layer sees realistic waits.
+
+Install it with `use_fake_supabase(FakeSupabase(...))` before the first
+get_supabase() call; every module then shares it like the real client.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from backend.storage.builder import QueryBuilder, QueryResponse, RpcCall, StorageError
+from backend.storage.rpc import RPC_FUNCTIONS, RpcStore, default_progress_row
+
+# Single-column hash indexes, used when a query filters on the column with eq()
+INDEXED_COLUMNS = {
+    "submissions": ("id", "user_id"),
+    "user_progress": ("user_id",),
+    "daily_triples": ("user_id",),
+    "review_schedule": ("user_id",),
+    "pattern_confidence": ("user_id",),
+    "submission_blobs": ("digest",),
+    "judge_results": ("code_digest",),
+}
+
+
+def _copy(value):
+    """Copy JSON-like values so callers never share the stored row"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _coerce(value, like):
+    """Convert a filter value (often a string from or_()) to the stored column's type"""
+    if isinstance(value, str) and not isinstance(like, str) and like is not None:
+        if isinstance(like, bool):
+            return value.lower() == "true"
+        if isinstance(like, int):
+            return int(value)
+        if isinstance(like, float):
+            return float(value)
+    return value
+
+
+def _compare(op: str, actual, expected) -> bool:
+    if op == "in":
+        return actual in {_coerce(item, actual) for item in expected}
+    if op == "is":
+        return actual is None if expected in (None, "null") else actual == _coerce(expected, actual)
+    if actual is None:
+        return False
+    expected = _coerce(expected, actual)
+    if op == "eq":
+        return actual == expected
+    if op == "neq":
+        return actual != expected
+    if op == "gt":
+        return actual > expected
+    if op == "gte":
+        return actual >= expected
+    if op == "lt":
+        return actual < expected
+    if op == "lte":
+        return actual <= expected
+    raise StorageError(f"Unsupported filter operator '{op}'")
+
+
+def _matches(node, row: dict) -> bool:
+    """Evaluate a builder filter node against a row"""
+    if node[0] == "cond":
+        _, op, column, value = node
+        return _compare(op, row.get(column), value)
+    combine = all if node[0] == "and" else any
+    return combine(_matches(child, row) for child in node[1])
+
+
+class _Table:
+    """Rows of one table plus its hash indexes; guarded by the client lock"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows: List[dict] = []
+        self.indexes: Dict[str, Dict] = {column: {} for column in INDEXED_COLUMNS.get(name, ())}
+
+    def add(self, row: dict):
+        self.rows.append(row)
+        for column, index in self.indexes.items():
+            index.setdefault(row.get(column), []).append(row)
+
+    def remove(self, row: dict):
+        self.rows.remove(row)
+        for column, index in self.indexes.items():
+            bucket = index.get(row.get(column), [])
+            bucket[:] = [other for other in bucket if other is not row]
+
+    def reindex(self, row: dict, old: dict):
+        for column, index in self.indexes.items():
+            if old.get(column) != row.get(column):
+                bucket = index.get(old.get(column), [])
+                bucket[:] = [other for other in bucket if other is not row]
+                index.setdefault(row.get(column), []).append(row)
+
+    def candidates(self, filters: list) -> List[dict]:
+        """Narrow the scan with an indexed eq() filter when there is one"""
+        for node in filters:
+            if node[0] == "cond" and node[1] == "eq" and node[2] in self.indexes:
+                return self.indexes[node[2]].get(node[3], [])
+        return self.rows
+
+
+class _MemoryRpcStore(RpcStore):
+    """RpcStore over the in-memory tables; rows are mutated in place"""
+
+    def __init__(self, tables: Dict[str, _Table]):
+        self.tables = tables
+
+    def _table(self, name: str) -> _Table:
+        return self.tables.setdefault(name, _Table(name))
+
+    def progress(self, user_id: str) -> dict:
+        table = self._table("user_progress")
+        rows = table.candidates([("cond", "eq", "user_id", user_id)])
+        if rows:
+            return rows[0]
+        row = default_progress_row(user_id)
+        table.add(row)
+        return row
+
+    def save_progress(self, row: dict):
+        pass
+
+    def submission_stats(self, user_id: str) -> dict:
+        rows = self._table("submissions").candidates([("cond", "eq", "user_id", user_id)])
+        solved = {row["problem_id"] for row in rows if row.get("passed")}
+        return {"total_submissions": len(rows), "problems_solved": len(solved)}
+
+    def active_users(self, since: str, after: Optional[str], limit: int) -> List[str]:
+        user_ids = {row["user_id"] for row in self._table("submissions").rows if row["submitted_at"] >= since}
+        return sorted(user_id for user_id in user_ids if after is None or user_id > after)[:limit]
+
+    def pattern_stats(self, user_id: str, pattern: str) -> Optional[dict]:
+        rows = self._table("pattern_confidence").candidates([("cond", "eq", "user_id", user_id)])
+        return next((row for row in rows if row["pattern"] == pattern), None)
+
+    def save_pattern_stats(self, row: dict):
+        existing = self.pattern_stats(row["user_id"], row["pattern"])
+        if existing is None:
+            self._table("pattern_confidence").add(row)
+        elif existing is not row:
+            existing.update(row)
+
+    def review(self, user_id: str, problem_id: str) -> Optional[dict]:
+        rows = self._table("review_schedule").candidates([("cond", "eq", "user_id", user_id)])
+        return next((row for row in rows if row["problem_id"] == problem_id), None)
+
+    def save_review(self, row: dict):
+        if self.review(row["user_id"], row["problem_id"]) is None:
+            self._table("review_schedule").add(row)
+
+
+def _run_query(query: QueryBuilder, tables: Dict[str, _Table]) -> QueryResponse:
+    table = tables.setdefault(query.table, _Table(query.table))
+    if query.operation in ("insert", "upsert"):
+        written = _write(query, table)
+        return QueryResponse([] if query.returning == "minimal" else written)
+
+    rows = [row for row in table.candidates(query.filters) if all(_matches(node, row) for node in query.filters)]
+    if query.operation == "update":
+        for row in rows:
+            old = dict(row)
+            row.update(_copy(query.payload))
+            table.reindex(row, old)
+        return QueryResponse([_copy(row) for row in rows])
+    if query.operation == "delete":
+        for row in rows:
+            table.remove(row)
+        return QueryResponse([_copy(row) for row in rows])
+
+    # Stable sorts applied last key first give a multi-column order
+    for column, desc in reversed(query.ordering):
+        rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+    end = None if query.limit_count is None else query.offset + query.limit_count
+    columns = query.selected_columns()
+    return QueryResponse([
+        _copy(row) if columns is None else {column: _copy(row.get(column)) for column in columns}
+        for row in rows[query.offset:end]
+    ])
+
+
+def _write(query: QueryBuilder, table: _Table) -> list:
+    keys = query.conflict_columns()
+    written = []
+    for values in query.rows():
+        existing = None
+        if query.operation == "upsert":
+            filters = [("cond", "eq", key, values.get(key)) for key in keys]
+            existing = next(
+                (row for row in table.candidates(filters)
+                 if all(row.get(key) == values.get(key) for key in keys)),
+                None,
+            )
+        if existing is not None:
+            # ON CONFLICT DO NOTHING returns no row, like PostgREST
+            if not query.ignore_duplicates:
+                old = dict(existing)
+                existing.update(_copy(values))
+                table.reindex(existing, old)
+                written.append(_copy(existing))
+            continue
+        row = _copy(values)
+        table.add(row)
+        written.append(_copy(row))
+    return written
+
+
+class FakeSupabase:
+    """
+    In-memory Supabase client. Each execute() sleeps `latency` seconds plus
+    up to `jitter` seconds (outside the lock, like a network round trip),
+    then runs the query atomically.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.queries = 0
+        self._tables: Dict[str, _Table] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+    def table(self, name: str) -> QueryBuilder:
+        return QueryBuilder(self, name)
+
+    def rpc(self, function: str, params: dict = None) -> RpcCall:
+        return RpcCall(self, function, params)
+
+    def execute_query(self, query: QueryBuilder) -> QueryResponse:
+        return self._round_trip(lambda tables: _run_query(query, tables))
+
+    def execute_rpc(self, call: RpcCall) -> QueryResponse:
+        implementation = RPC_FUNCTIONS.get(call.function)
+        if implementation is None:
+            raise StorageError(f"Function '{call.function}' is not implemented by the local stand-in")
+        return self._round_trip(
+            lambda tables: QueryResponse(_copy(implementation(_MemoryRpcStore(tables), _copy(call.params))))
+        )
+
+    def load(self, table: str, rows: List[dict]):
+        """Bulk-load rows without latency (for seeding)"""
+        with self._lock:
+            target = self._tables.setdefault(table, _Table(table))
+            for row in rows:
+                target.add(_copy(row))
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return len(self._tables[table].rows) if table in self._tables else 0
+
+    def _round_trip(self, run: Callable) -> QueryResponse:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            self.queries += 1
+            return run(self._tables)
+
+
+def use_fake_supabase(client):
+    """Make get_supabase() and get_supabase_admin() return `client`"""
+    from backend import supabase_config
+    supabase_config._supabase = client
+    supabase_config._supabase_admin = client
+    return client
@@ -0,0 +1,21 @@
+# Judge package
+from .engine import JudgeEngine, get_judge_engine
+from .queue import (
+    JudgeQueue,
+    get_judge_queue,
+    get_queue_worker,
+    ensure_queue_worker,
+    stop_queue_worker,
+    enqueue_submission,
+)
+
+__all__ = [
+    "JudgeEngine",
+    "get_judge_engine",
+    "JudgeQueue",
+    "get_judge_queue",
+    "get_queue_worker",
+    "ensure_queue_worker",
+    "stop_queue_worker",
+    "enqueue_submission",
+]
@@ -0,0 +1,133 @@
+"""
+Judge Result Cache
+Persistent LRU cache of verdicts on the judge node, in its own SQLite (WAL)
+file. It is checked before the shared judge_results table
+(judge/results.py) and the sandbox.
+
+Entries are keyed by the problem's suite version and a fingerprint of the
+code's normalized AST, so resubmissions that differ only in formatting or
+comments hit the cache. Code that doesn't parse is fingerprinted by its
+exact text, since compile errors report line numbers, and so is code too
+deeply nested for ast.dump. Least recently used entries are evicted past
+JUDGE_CACHE_SIZE.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Optional
+
+from backend.judge.paths import data_path, ensure_parent
+from backend.judge.results import is_reusable, suite_version
+
+JUDGE_CACHE_PATH = os.getenv("JUDGE_CACHE_PATH", data_path("judge_cache.sqlite3"))
+JUDGE_CACHE_SIZE = int(os.getenv("JUDGE_CACHE_SIZE", 100000))
+
+SCHEMA = """
+create table if not exists judge_cache (
+    key text primary key,
+    problem_id text not null,
+    result text not null,
+    last_used_at real not null
+);
+create index if not exists judge_cache_lru_idx on judge_cache (last_used_at);
+"""
+
+
+def code_fingerprint(code: str, language: str = "python") -> str:
+    """Hash of the code's AST (without positions), or of its text if it doesn't parse"""
+    if language.lower() == "python":
+        try:
+            # Deeply nested code can overflow the parser or ast.dump
+            dump = ast.dump(ast.parse(code))
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            pass
+        else:
+            # ast.dump output can change between Python versions
+            normalized = f"ast:{sys.version_info[0]}.{sys.version_info[1]}:{dump}"
+            return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"text:{code}".encode("utf-8")).hexdigest()
+
+
+class JudgeResultCache:
+    """SQLite-backed LRU of verdicts; every method is blocking and thread-safe"""
+
+    def __init__(self, path: str = JUDGE_CACHE_PATH, maxsize: int = JUDGE_CACHE_SIZE):
+        self.path = path
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        ensure_parent(path)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("pragma journal_mode=wal")
+        self._conn.execute("pragma synchronous=normal")
+        self._conn.executescript(SCHEMA)
+        # Approximate when several processes share the file; only paces eviction
+        self._size = self._conn.execute("select count(*) from judge_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def key(self, problem_id: str, language: str, code: str) -> Optional[str]:
+        """Cache key for a submission, or None if its problem has no test suite"""
+        version = suite_version(problem_id)
+        if version is None:
+            return None
+        return f"{version}:{language.lower()}:{code_fingerprint(code, language)}"
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("select result from judge_cache where key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("update judge_cache set last_used_at = ? where key = ?", (time.time(), key))
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, problem_id: str, result: dict):
+        """Cache a verdict if it is deterministic, evicting the least recently used past maxsize"""
+        if not is_reusable(result):
+            return
+        with self._lock:
+            cursor = self._conn.execute(
+                "insert or ignore into judge_cache (key, problem_id, result, last_used_at) values (?, ?, ?, ?)",
+                (key, problem_id, json.dumps(result), time.time()),
+            )
+            self._size += cursor.rowcount
+            if self._size > self.maxsize:
+                # Evict a little extra so eviction runs once per batch of inserts
+                excess = self._size - self.maxsize + max(self.maxsize // 100, 1)
+                cursor = self._conn.execute(
+                    "delete from judge_cache where key in "
+                    "(select key from judge_cache order by last_used_at limit ?)",
+                    (excess,),
+                )
+                self._size -= cursor.rowcount
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": self._size,
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+_cache: JudgeResultCache = None
+
+
+def get_judge_result_cache() -> JudgeResultCache:
+    global _cache
+    if _cache is None:
+        _cache = JudgeResultCache()
+    return _cache
@@ -0,0 +1,107 @@
+"""
+Judge Engine
+A pool of pre-started worker processes that judge submissions. Each worker
+starts its sandbox runner once (judge/sandbox.py) and forks it per job,
+so a job doesn't wait for a fresh interpreter to start. Throughput scales with
+JUDGE_WORKERS (one per core by default); a submission's test cases are
+split across up to JUDGE_CASE_WORKERS children, cutting latency for large
+suites.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from backend.data.catalog import get_catalog
+from backend.judge.harness import ACCEPTED, NO_TEST_CASES, UNSUPPORTED_LANGUAGE
+from backend.judge.sandbox import SandboxLimits, run_in_sandbox
+
+JUDGE_WORKERS = int(os.getenv("JUDGE_WORKERS", os.cpu_count() or 1))
+# Children judging one submission's test cases in parallel (1 = sequential)
+JUDGE_CASE_WORKERS = int(os.getenv("JUDGE_CASE_WORKERS", min(os.cpu_count() or 1, 4)))
+SUPPORTED_LANGUAGES = ("python",)
+
+
+def _warm_worker():
+    """Process-pool initializer: import everything a job needs and start the runner up front"""
+    from backend.judge.sandbox import start_zygote
+
+    start_zygote().wait_ready()
+
+
+def _ready() -> bool:
+    return True
+
+
+class JudgeEngine:
+    """Owns the judge worker pool and turns submissions into results"""
+
+    def __init__(self, workers: int = JUDGE_WORKERS, limits: SandboxLimits = None,
+                 case_workers: int = JUDGE_CASE_WORKERS):
+        self.workers = workers
+        self.limits = limits or SandboxLimits()
+        self.case_workers = case_workers
+        self._pool: ProcessPoolExecutor = None
+        self._in_flight = 0
+
+    def start(self):
+        if self._pool is None:
+            # forkserver keeps the workers free of the API process's threads,
+            # which makes the per-job fork() inside each worker safe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=_warm_worker,
+            )
+
+    async def warm(self):
+        """Start every worker process now, so the first submission isn't judged cold"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ready) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def judge(self, problem_id: str, code: str, language: str = "python") -> dict:
+        """Judge one submission without blocking the event loop"""
+        if language.lower() not in SUPPORTED_LANGUAGES:
+            return {"status": UNSUPPORTED_LANGUAGE, "error": f"Language '{language}' is not supported"}
+
+        suite = get_catalog().test_suite(problem_id)
+        if suite is None:
+            return {"status": NO_TEST_CASES}
+
+        self.start()
+        loop = asyncio.get_running_loop()
+        # Split cases only while cores are spare; under load each job runs sequentially
+        self._in_flight += 1
+        try:
+            case_workers = max(min(self.case_workers, (os.cpu_count() or 1) // self._in_flight), 1)
+            return await loop.run_in_executor(self._pool, run_in_sandbox, code, suite, self.limits, case_workers)
+        finally:
+            self._in_flight -= 1
+
+
+_engine: JudgeEngine = None
+
+
+def get_judge_engine() -> JudgeEngine:
+    global _engine
+    if _engine is None:
+        _engine = JudgeEngine()
+    return _engine
+
+
+def submission_update(result: dict) -> dict:
+    """Columns written back to the submission row for a judge result"""
+    return {
+        "status": result["status"],
+        "passed": result["status"] == ACCEPTED,
+        "judge_result": result,
+        "judged_at": datetime.now(timezone.utc).isoformat(),
+    }
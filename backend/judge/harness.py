@@ -0,0 +1,152 @@
+"""
+Judge Harness
+Shared by both sides of the sandbox: the runner (judge/runner.py) uses it
+inside the child to load the submitted code and call it on each case, and
+the parent uses it to compare the outputs with the expected ones. Stdlib
+only, since the runner imports it in a bare interpreter.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+# Result statuses written back to the submission row
+ACCEPTED = "accepted"
+WRONG_ANSWER = "wrong_answer"
+COMPILE_ERROR = "compile_error"
+RUNTIME_ERROR = "runtime_error"
+TIME_LIMIT_EXCEEDED = "time_limit_exceeded"
+MEMORY_LIMIT_EXCEEDED = "memory_limit_exceeded"
+UNSUPPORTED_LANGUAGE = "unsupported_language"
+NO_TEST_CASES = "no_test_cases"
+INTERNAL_ERROR = "internal_error"
+
+# Longest repr of an actual/expected value echoed back to the user
+MAX_VALUE_REPR = 200
+# Longest error message echoed back to the user
+MAX_ERROR_LENGTH = 500
+
+
+class ListNode:
+    def __init__(self, val=0, next=None):
+        self.val = val
+        self.next = next
+
+
+class TreeNode:
+    def __init__(self, val=0, left=None, right=None):
+        self.val = val
+        self.left = left
+        self.right = right
+
+
+def build_linked_list(values: list) -> Optional[ListNode]:
+    head = None
+    for value in reversed(values):
+        head = ListNode(value, head)
+    return head
+
+
+def linked_list_to_list(head: Optional[ListNode]) -> list:
+    values = []
+    while head is not None:
+        values.append(head.val)
+        head = head.next
+    return values
+
+
+def build_tree(values: list) -> Optional[TreeNode]:
+    """Build a binary tree from LeetCode's level-order list (None for gaps)"""
+    if not values or values[0] is None:
+        return None
+    root = TreeNode(values[0])
+    queue = [root]
+    i = 1
+    for node in queue:
+        if i >= len(values):
+            break
+        if values[i] is not None:
+            node.left = TreeNode(values[i])
+            queue.append(node.left)
+        i += 1
+        if i < len(values) and values[i] is not None:
+            node.right = TreeNode(values[i])
+            queue.append(node.right)
+        i += 1
+    return root
+
+
+def tree_to_list(root: Optional[TreeNode]) -> list:
+    """Serialize a binary tree back to LeetCode's level-order list"""
+    values, queue = [], [root]
+    for node in queue:
+        if node is None:
+            values.append(None)
+            continue
+        values.append(node.val)
+        queue.extend((node.left, node.right))
+    while values and values[-1] is None:
+        values.pop()
+    return values
+
+
+ARG_CONVERTERS = {"tree": build_tree, "linked_list": build_linked_list}
+RETURN_CONVERTERS = {"tree": tree_to_list, "linked_list": linked_list_to_list}
+
+# Names LeetCode solutions expect to exist without importing them
+SOLUTION_GLOBALS = {
+    "ListNode": ListNode,
+    "TreeNode": TreeNode,
+    "List": List,
+    "Optional": Optional,
+    "Dict": Dict,
+    "Set": Set,
+    "Tuple": Tuple,
+}
+
+
+def load_entry_point(code: str, entry_point: str):
+    """Execute the submission and return the callable to test"""
+    namespace = dict(SOLUTION_GLOBALS, __name__="__submission__")
+    exec(compile(code, "<submission>", "exec"), namespace)
+
+    solution_cls = namespace.get("Solution")
+    if isinstance(solution_cls, type) and hasattr(solution_cls, entry_point):
+        return getattr(solution_cls(), entry_point)
+    function = namespace.get(entry_point)
+    if callable(function):
+        return function
+    raise LookupError(f"Define Solution.{entry_point} or a function named {entry_point}")
+
+
+def results_match(actual, expected, compare: str = "exact") -> bool:
+    if compare == "unordered" and isinstance(actual, (list, tuple)):
+        try:
+            return sorted(actual) == sorted(expected)
+        except TypeError:
+            return False
+    if isinstance(actual, tuple):
+        actual = list(actual)
+    return actual == expected
+
+
+def short_repr(value) -> str:
+    text = repr(value)
+    return text if len(text) <= MAX_VALUE_REPR else text[:MAX_VALUE_REPR] + "..."
+
+
+def describe_error(e: BaseException) -> str:
+    text = f"{type(e).__name__}: {e}"
+    return text if len(text) <= MAX_ERROR_LENGTH else text[:MAX_ERROR_LENGTH] + "..."
+
+
+def run_case(function, suite: dict, args: list):
+    """Call the submission on one case's arguments; returns its output as plain data"""
+    arg_types = suite.get("arg_types") or []
+    args = list(args)
+    for i, arg_type in enumerate(arg_types):
+        if arg_type in ARG_CONVERTERS:
+            args[i] = ARG_CONVERTERS[arg_type](args[i])
+
+    actual = function(*args)
+    if suite.get("return_type") in RETURN_CONVERTERS:
+        actual = RETURN_CONVERTERS[suite["return_type"]](actual)
+    return actual
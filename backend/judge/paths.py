@@ -0,0 +1,15 @@
+"""
+Judge Data Paths
+Where the judge keeps its local SQLite files (the job queue and the verdict
+cache): JUDGE_DATA_DIR, by default the backend's DATA_DIR (backend/paths.py).
+"""
+
+import os
+
+from backend.paths import DATA_DIR, ensure_parent  # noqa: F401
+
+JUDGE_DATA_DIR = os.getenv("JUDGE_DATA_DIR", DATA_DIR)
+
+
+def data_path(name: str) -> str:
+    return os.path.join(JUDGE_DATA_DIR, name)
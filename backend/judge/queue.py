@@ -0,0 +1,450 @@
+"""
+Judge Queue
+Durable SQLite (WAL) queue between /api/submit and the judge. Submitting
+only appends a row here; a background worker claims batches of jobs under
+a lease, judges them on the worker pool, writes the result back to the
+submission and retries infrastructure failures with exponential backoff.
+
+Jobs survive restarts: a job whose lease expired (its worker died) is
+claimed again. Identical code submitted while an equal job is still in
+flight is attached to that job and completed with its result; code judged
+earlier reuses the cached verdict (judge/cache.py, judge/results.py).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from backend.analytics import record_pattern_outcome
+from backend.daily_triples import user_today
+from backend.data.catalog import get_catalog
+from backend.db import execute
+from backend.judge.engine import get_judge_engine, submission_update
+from backend.judge.cache import get_judge_result_cache
+from backend.judge.paths import data_path, ensure_parent
+from backend.judge.results import find_result, save_result
+from backend.progress_cache import invalidate_submission_stats
+from backend.spaced_repetition import record_judged_attempt
+from backend.supabase_config import get_supabase
+
+JUDGE_QUEUE_PATH = os.getenv("JUDGE_QUEUE_PATH", data_path("judge_queue.sqlite3"))
+# Set JUDGE_QUEUE_WORKER=0 on nodes that should only enqueue
+JUDGE_QUEUE_WORKER = os.getenv("JUDGE_QUEUE_WORKER", "1") != "0"
+JUDGE_BATCH_SIZE = int(os.getenv("JUDGE_BATCH_SIZE", 16))
+JUDGE_MAX_ATTEMPTS = int(os.getenv("JUDGE_MAX_ATTEMPTS", 5))
+JUDGE_LEASE_SECONDS = float(os.getenv("JUDGE_LEASE_SECONDS", 60))
+JUDGE_POLL_SECONDS = float(os.getenv("JUDGE_POLL_SECONDS", 1))
+JUDGE_RETRY_BASE_SECONDS = float(os.getenv("JUDGE_RETRY_BASE_SECONDS", 2))
+JUDGE_RETRY_MAX_SECONDS = float(os.getenv("JUDGE_RETRY_MAX_SECONDS", 300))
+# Finished jobs are kept this long for status polling, then pruned
+JUDGE_RETENTION_SECONDS = float(os.getenv("JUDGE_RETENTION_SECONDS", 7 * 24 * 3600))
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+WAITING = "waiting"  # duplicate of an in-flight job; completed with its result
+DONE = "done"
+FAILED = "failed"
+
+# Submission status written when a job runs out of retries
+JUDGE_FAILED = "judge_failed"
+
+SCHEMA = """
+create table if not exists judge_jobs (
+    id integer primary key autoincrement,
+    submission_id text not null unique,
+    user_id text,
+    tz text,
+    problem_id text not null,
+    language text not null,
+    code text not null,
+    dedup_key text not null,
+    duplicate_of integer references judge_jobs(id),
+    state text not null,
+    attempts integer not null default 0,
+    next_attempt_at real not null,
+    leased_until real,
+    result text,
+    error text,
+    created_at real not null,
+    updated_at real not null
+);
+create index if not exists judge_jobs_claim_idx on judge_jobs (state, next_attempt_at);
+create index if not exists judge_jobs_dedup_idx on judge_jobs (dedup_key, state);
+create index if not exists judge_jobs_duplicate_idx on judge_jobs (duplicate_of);
+"""
+
+
+def dedup_key(problem_id: str, language: str, code: str) -> str:
+    """Jobs with equal keys are guaranteed to produce the same result"""
+    digest = hashlib.sha256()
+    for part in (get_catalog().version, problem_id, language.lower(), code):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with full jitter"""
+    ceiling = min(JUDGE_RETRY_MAX_SECONDS, JUDGE_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class JudgeQueue:
+    """SQLite-backed job store; every method is blocking and thread-safe"""
+
+    def __init__(self, path: str = JUDGE_QUEUE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        ensure_parent(path)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("pragma journal_mode=wal")
+        self._conn.execute("pragma synchronous=normal")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns introduced after a queue file was first created"""
+        columns = {row["name"] for row in self._conn.execute("pragma table_info(judge_jobs)")}
+        if "user_id" not in columns:
+            self._conn.execute("alter table judge_jobs add column user_id text")
+        if "tz" not in columns:
+            self._conn.execute("alter table judge_jobs add column tz text")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so concurrent
+        # uvicorn workers sharing the file never claim the same job
+        self._conn.execute("begin immediate")
+
+    def enqueue(
+        self, submission_id: str, problem_id: str, code: str, language: str = "python",
+        user_id: str = None, tz: str = None,
+    ) -> dict:
+        """Persist a job; returns its row. Re-enqueueing a submission is a no-op."""
+        now = time.time()
+        key = dedup_key(problem_id, language, code)
+        with self._lock:
+            self._transaction()
+            try:
+                primary = self._conn.execute(
+                    "select id from judge_jobs where dedup_key = ? and state in (?, ?) order by id limit 1",
+                    (key, QUEUED, RUNNING),
+                ).fetchone()
+                self._conn.execute(
+                    """
+                    insert or ignore into judge_jobs (
+                        submission_id, user_id, tz, problem_id, language, code, dedup_key, duplicate_of,
+                        state, next_attempt_at, created_at, updated_at
+                    ) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        submission_id, user_id, tz, problem_id, language, code, key,
+                        primary["id"] if primary else None,
+                        WAITING if primary else QUEUED,
+                        now, now, now,
+                    ),
+                )
+                row = self._conn.execute(
+                    "select * from judge_jobs where submission_id = ?", (submission_id,)
+                ).fetchone()
+                self._conn.execute("commit")
+            except BaseException:
+                self._conn.execute("rollback")
+                raise
+        return dict(row)
+
+    def claim(self, limit: int = JUDGE_BATCH_SIZE) -> List[dict]:
+        """Lease up to `limit` due jobs, including ones whose lease expired"""
+        now = time.time()
+        with self._lock:
+            self._transaction()
+            try:
+                rows = self._conn.execute(
+                    """
+                    select * from judge_jobs
+                    where (state = ? and next_attempt_at <= ?)
+                       or (state = ? and leased_until < ?)
+                    order by next_attempt_at
+                    limit ?
+                    """,
+                    (QUEUED, now, RUNNING, now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "update judge_jobs set state = ?, attempts = attempts + 1, leased_until = ?, updated_at = ? where id = ?",
+                    [(RUNNING, now + JUDGE_LEASE_SECONDS, now, row["id"]) for row in rows],
+                )
+                self._conn.execute("commit")
+            except BaseException:
+                self._conn.execute("rollback")
+                raise
+        return [dict(row, attempts=row["attempts"] + 1) for row in rows]
+
+    def complete(self, job_id: int, result: dict) -> List[dict]:
+        """Mark a job and its waiting duplicates done; returns their submission ids, users and submit times"""
+        now = time.time()
+        payload = json.dumps(result)
+        with self._lock:
+            self._transaction()
+            try:
+                rows = self._conn.execute(
+                    "select submission_id, user_id, tz, created_at from judge_jobs "
+                    "where id = ? or (duplicate_of = ? and state = ?)",
+                    (job_id, job_id, WAITING),
+                ).fetchall()
+                self._conn.execute(
+                    """
+                    update judge_jobs set state = ?, result = ?, error = null, leased_until = null, updated_at = ?
+                    where id = ? or (duplicate_of = ? and state = ?)
+                    """,
+                    (DONE, payload, now, job_id, job_id, WAITING),
+                )
+                self._conn.execute("commit")
+            except BaseException:
+                self._conn.execute("rollback")
+                raise
+        return [dict(row) for row in rows]
+
+    def fail(self, job: dict, error: str) -> Optional[List[str]]:
+        """
+        Record a failed attempt. Schedules a retry with backoff, or marks the
+        job (and its duplicates) failed once attempts run out, returning the
+        affected submission ids in that case.
+        """
+        now = time.time()
+        with self._lock:
+            self._transaction()
+            try:
+                if job["attempts"] < JUDGE_MAX_ATTEMPTS:
+                    self._conn.execute(
+                        "update judge_jobs set state = ?, next_attempt_at = ?, leased_until = null, error = ?, updated_at = ? where id = ?",
+                        (QUEUED, now + retry_delay(job["attempts"]), error, now, job["id"]),
+                    )
+                    rows = None
+                else:
+                    rows = self._conn.execute(
+                        "select submission_id from judge_jobs where id = ? or (duplicate_of = ? and state = ?)",
+                        (job["id"], job["id"], WAITING),
+                    ).fetchall()
+                    self._conn.execute(
+                        """
+                        update judge_jobs set state = ?, error = ?, leased_until = null, updated_at = ?
+                        where id = ? or (duplicate_of = ? and state = ?)
+                        """,
+                        (FAILED, error, now, job["id"], job["id"], WAITING),
+                    )
+                self._conn.execute("commit")
+            except BaseException:
+                self._conn.execute("rollback")
+                raise
+        return [row["submission_id"] for row in rows] if rows is not None else None
+
+    def get(self, submission_id: str) -> Optional[dict]:
+        """Get the job for a submission, following duplicates to their primary"""
+        with self._lock:
+            row = self._conn.execute(
+                """
+                select j.submission_id, j.state, j.error, j.result, j.created_at, j.updated_at,
+                       coalesce(p.attempts, j.attempts) as attempts
+                from judge_jobs j left join judge_jobs p on p.id = j.duplicate_of
+                where j.submission_id = ?
+                """,
+                (submission_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def prune(self, older_than: float = JUDGE_RETENTION_SECONDS) -> int:
+        """Delete finished jobs past the retention window"""
+        cutoff = time.time() - older_than
+        with self._lock:
+            cursor = self._conn.execute(
+                "delete from judge_jobs where state in (?, ?) and updated_at < ? "
+                "and id not in (select duplicate_of from judge_jobs where duplicate_of is not null and state = ?)",
+                (DONE, FAILED, cutoff, WAITING),
+            )
+        return cursor.rowcount
+
+
+class JudgeQueueWorker:
+    """Background task that drains the queue in batches"""
+
+    def __init__(self, queue: JudgeQueue):
+        self.queue = queue
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task = None
+        self._last_prune = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self):
+        """Wake the worker early when new work is enqueued"""
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in judge queue worker: {e}")
+                processed = 0
+
+            if processed == 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), JUDGE_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def run_once(self) -> int:
+        """Claim and process one batch; returns the number of jobs handled"""
+        jobs = await asyncio.to_thread(self.queue.claim)
+        if jobs:
+            await asyncio.gather(*(self._process(job) for job in jobs))
+
+        if time.time() - self._last_prune > 3600:
+            self._last_prune = time.time()
+            await asyncio.to_thread(self.queue.prune)
+        return len(jobs)
+
+    async def _judge(self, job: dict) -> dict:
+        """
+        Reuse a verdict from the local cache (equivalent code) or the shared
+        judge_results table (identical code), else run it in the sandbox
+        """
+        cache = get_judge_result_cache()
+        key = await asyncio.to_thread(cache.key, job["problem_id"], job["language"], job["code"])
+        if key is not None:
+            result = await asyncio.to_thread(cache.get, key)
+            if result is not None:
+                return result
+
+        try:
+            result = await find_result(job["problem_id"], job["language"], job["code"])
+        except Exception as e:
+            print(f"Error looking up a stored judge result: {e}")
+            result = None
+
+        if result is None:
+            result = await get_judge_engine().judge(job["problem_id"], job["code"], job["language"])
+            try:
+                await save_result(job["problem_id"], job["language"], job["code"], result)
+            except Exception as e:
+                print(f"Error storing judge result: {e}")
+
+        if key is not None:
+            await asyncio.to_thread(cache.put, key, job["problem_id"], result)
+        return result
+
+    async def _process(self, job: dict):
+        try:
+            result = await self._judge(job)
+            # Write the primary submission before acknowledging the job, so a
+            # crash here means a retry rather than a lost result
+            await write_submission_result([job["submission_id"]], result)
+        except Exception as e:
+            failed = await asyncio.to_thread(self.queue.fail, job, f"{type(e).__name__}: {e}")
+            if failed:
+                await write_submission_result(failed, {"status": JUDGE_FAILED, "error": str(e)})
+            return
+
+        finished = await asyncio.to_thread(self.queue.complete, job["id"], result)
+        duplicates = [f["submission_id"] for f in finished if f["submission_id"] != job["submission_id"]]
+        if duplicates:
+            await write_submission_result(duplicates, result)
+
+        # One update per user; the review counts on the day they submitted
+        by_user = {f["user_id"]: f for f in finished if f["user_id"]}
+        for user_id, submission in by_user.items():
+            invalidate_submission_stats(user_id)
+            try:
+                await record_pattern_outcome(user_id, job["problem_id"], result)
+            except Exception as e:
+                print(f"Error updating pattern confidence for {user_id}: {e}")
+            try:
+                submitted_at = datetime.fromtimestamp(submission["created_at"], timezone.utc)
+                today = user_today(submission["tz"], at=submitted_at)
+                await record_judged_attempt(user_id, job["problem_id"], result, today)
+            except Exception as e:
+                print(f"Error updating review schedule for {user_id}: {e}")
+
+
+async def write_submission_result(submission_ids: List[str], result: dict):
+    supabase = get_supabase()
+    await execute(
+        supabase.table("submissions").update(submission_update(result)).in_("id", submission_ids)
+    )
+
+
+_queue: JudgeQueue = None
+_worker: JudgeQueueWorker = None
+
+
+def get_judge_queue() -> JudgeQueue:
+    global _queue
+    if _queue is None:
+        _queue = JudgeQueue()
+    return _queue
+
+
+def get_queue_worker() -> JudgeQueueWorker:
+    global _worker
+    if _worker is None:
+        _worker = JudgeQueueWorker(get_judge_queue())
+    return _worker
+
+
+def ensure_queue_worker():
+    """
+    Start this process's queue worker if it isn't running yet. Called on
+    enqueue and on status polls, so fast-start (serverless) processes that
+    skip the startup hook still judge, and a thawed instance resumes.
+    """
+    if JUDGE_QUEUE_WORKER:
+        get_queue_worker().start()
+
+
+async def stop_queue_worker():
+    """Stop the queue worker if it was started, and the judge pool with it"""
+    if _worker is not None:
+        await _worker.stop()
+    get_judge_engine().shutdown()
+
+
+async def enqueue_submission(
+    submission_id: str, problem_id: str, code: str, language: str = "python",
+    user_id: str = None, tz: str = None,
+) -> dict:
+    """Durably queue a submission for judging and wake the worker"""
+    job = await asyncio.to_thread(get_judge_queue().enqueue, submission_id, problem_id, code, language, user_id, tz)
+    ensure_queue_worker()
+    if _worker is not None:
+        _worker.notify()
+    return job
@@ -0,0 +1,75 @@
+"""
+Judge Result Reuse
+Verdicts for identical code are stored in judge_results
+(sql/011_submission_blobs.sql), keyed by (problem, language, code digest)
+with the digest shared with submission_blobs. The worker reuses a stored
+verdict instead of re-running the sandbox while the problem's test suite
+is unchanged.
+
+Only verdicts the harness reached by running the code are stored: time
+and memory limits depend on machine load, and infrastructure errors are
+retried, so those are always judged afresh.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Optional
+
+from backend.blobs import blob_digest
+from backend.data.catalog import get_catalog
+from backend.db import execute
+from backend.judge.harness import ACCEPTED, COMPILE_ERROR, RUNTIME_ERROR, WRONG_ANSWER
+from backend.supabase_config import get_supabase
+
+# Bump when the harness changes in a way that can change verdicts
+HARNESS_VERSION = "2"
+
+REUSABLE_STATUSES = (ACCEPTED, WRONG_ANSWER, COMPILE_ERROR, RUNTIME_ERROR)
+
+
+def suite_version(problem_id: str) -> Optional[str]:
+    """Hash of a problem's test suite (and the harness); None if it has no suite"""
+    suite = get_catalog().test_suite(problem_id)
+    if suite is None:
+        return None
+    canonical = json.dumps(suite, sort_keys=True, default=repr)
+    return hashlib.sha256(f"{HARNESS_VERSION}\0{canonical}".encode("utf-8")).hexdigest()[:16]
+
+
+def is_reusable(result: dict) -> bool:
+    # Harness results always carry total_cases; a sandbox kill doesn't
+    return result.get("status") in REUSABLE_STATUSES and "total_cases" in result
+
+
+async def find_result(problem_id: str, language: str, code: str) -> Optional[dict]:
+    """A stored verdict for this exact code against the current suite, if any"""
+    version = suite_version(problem_id)
+    if version is None:
+        return None
+    supabase = get_supabase()
+    result = await execute(
+        supabase.table("judge_results").select("result")
+        .eq("problem_id", problem_id)
+        .eq("language", language.lower())
+        .eq("code_digest", blob_digest(code))
+        .eq("suite_version", version)
+        .limit(1)
+    )
+    return result.data[0]["result"] if result.data else None
+
+
+async def save_result(problem_id: str, language: str, code: str, result: dict):
+    """Store a fresh verdict for reuse, if it is deterministic"""
+    version = suite_version(problem_id)
+    if version is None or not is_reusable(result):
+        return
+    supabase = get_supabase()
+    await execute(supabase.table("judge_results").upsert({
+        "problem_id": problem_id,
+        "language": language.lower(),
+        "code_digest": blob_digest(code),
+        "suite_version": version,
+        "result": result,
+        "judged_at": datetime.now(timezone.utc).isoformat(),
+    }, on_conflict="problem_id,language,code_digest", returning="minimal"))
@@ -0,0 +1,179 @@
+"""
+Judge Runner
+The program each judge worker execs (judge/sandbox.py) in a fresh
+interpreter with an empty environment, so it holds nothing of the server.
+It imports what submissions may use once, then forks a child per job
+requested over its control socket (fd 0) and reports each child's exit
+status back.
+
+A child reads its job from stdin, applies the limits, drops root and
+installs the syscall filter (judge/seccomp.py), and only then runs the
+submission. It writes one JSON line per test case with the function's
+output; it is never given the expected outputs.
+"""
+
+import json
+import os
+import resource
+import select
+import signal
+import socket
+import sys
+
+# Run by path with -I, so the judge directory isn't importable by default
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import harness  # noqa: E402
+import seccomp  # noqa: E402
+
+# Imported before the filter denies opening files, so submissions can use them
+PRELOADED_MODULES = (
+    "bisect", "collections", "functools", "heapq", "itertools", "math", "operator", "re", "string",
+)
+
+
+def _read_job() -> dict:
+    chunks = []
+    while True:
+        chunk = os.read(0, 65536)
+        if not chunk:
+            return json.loads(b"".join(chunks))
+        chunks.append(chunk)
+
+
+def _apply_limits(limits: dict):
+    memory = limits["memory_mb"] * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_CPU, (limits["cpu_seconds"], limits["cpu_seconds"] + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+
+def _drop_privileges(uid: int):
+    if os.geteuid() == 0:
+        os.setgroups([])
+        os.setgid(uid)
+        os.setuid(uid)
+
+
+def _emit(fd: int, message: dict):
+    view = memoryview(json.dumps(message, default=repr).encode("utf-8") + b"\n")
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def run(job: dict, emit):
+    """Load the submission and report its output for each case, stopping at the first error"""
+    try:
+        function = harness.load_entry_point(job["code"], job["entry_point"])
+    except SyntaxError as e:
+        emit({"compile_error": f"SyntaxError: {e.msg} (line {e.lineno})"})
+        return
+    except MemoryError:
+        emit({"memory": True})
+        return
+    except BaseException as e:
+        emit({"error": harness.describe_error(e)})
+        return
+
+    for index, args in enumerate(job["args"]):
+        try:
+            emit({"case": index, "actual": harness.run_case(function, job, args)})
+        except MemoryError:
+            emit({"memory": True, "case": index})
+            return
+        except BaseException as e:
+            emit({"error": harness.describe_error(e), "case": index})
+            return
+
+
+def run_job():
+    """Body of a forked child: stdin is its job, stdout its result pipe"""
+    job = _read_job()
+
+    # Keep the result pipe off stdout, where the submission's prints go
+    channel = os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+
+    try:
+        _apply_limits(job["limits"])
+        _drop_privileges(job["uid"])
+        seccomp.install()
+    except Exception as e:
+        _emit(channel, {"internal": f"{type(e).__name__}: {e}"})
+        return
+    _emit(channel, {"started": True})
+    run(job, lambda message: _emit(channel, message))
+
+
+def _child(control: socket.socket, wake_fds: tuple, fds: list):
+    """Entry point of a forked child; never returns"""
+    status = 1
+    try:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        os.setsid()
+        # The control socket is fd 0; close it before taking fds 0 and 1
+        control.close()
+        os.dup2(fds[0], 0)
+        os.dup2(fds[1], 1)
+        for fd in (*wake_fds, *fds):
+            os.close(fd)
+        run_job()
+        status = 0
+    finally:
+        os._exit(status)
+
+
+def serve(control: socket.socket):
+    """Fork a child per spawn request and report exits, until the worker hangs up"""
+    def send(message: dict):
+        control.send(json.dumps(message).encode("utf-8"))
+
+    wake_read, wake_write = os.pipe()
+    os.set_blocking(wake_write, False)
+    signal.set_wakeup_fd(wake_write)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    send({"ready": True})
+    children = set()
+    while True:
+        readable, _, _ = select.select([control, wake_read], [], [])
+        if wake_read in readable:
+            os.read(wake_read, 4096)
+        if control in readable:
+            data, fds, _, _ = socket.recv_fds(control, 4096, 2)
+            if not data:
+                return
+            message = json.loads(data)
+            if message["op"] == "spawn":
+                pid = os.fork()
+                if pid == 0:
+                    _child(control, (wake_read, wake_write), fds)
+                for fd in fds:
+                    os.close(fd)
+                children.add(pid)
+                send({"pid": pid})
+            elif message["op"] == "kill" and message["pid"] in children:
+                # Only children not yet reaped, so a reused pid is never hit
+                try:
+                    os.killpg(message["pid"], signal.SIGKILL)
+                except ProcessLookupError:
+                    os.kill(message["pid"], signal.SIGKILL)
+
+        while children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            children.discard(pid)
+            send({"exit": pid, "status": status})
+
+
+if __name__ == "__main__":
+    for name in PRELOADED_MODULES:
+        __import__(name)
+    serve(socket.socket(fileno=0))
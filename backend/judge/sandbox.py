@@ -0,0 +1,398 @@
+"""
+Judge Sandbox
+Judges every submission in fresh interpreters, one per range of test cases.
+Each child execs judge/runner.py with an empty environment, so nothing of
+the server's process (keys, connections, modules) is inside it; the runner
+applies CPU, memory, file-size and process limits, drops root and installs
+a syscall filter before touching user code. Children only stream back the
+submission's output for each case: the parent compares them with the
+expected outputs, which children never receive, so a submission can't
+change its own verdict. The parent also enforces the wall-clock limit and
+kills a child's process group if it overruns.
+
+Each worker starts that interpreter once and has it fork a child per job,
+so a submission doesn't pay for Python's start-up, and the fork copies
+nothing but the runner.
+
+Linux only (fork/exec, setrlimit, seccomp); judge workers run on Linux in deployment.
+"""
+
+import json
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from backend.judge.harness import (
+    ACCEPTED,
+    COMPILE_ERROR,
+    INTERNAL_ERROR,
+    MAX_ERROR_LENGTH,
+    MEMORY_LIMIT_EXCEEDED,
+    RUNTIME_ERROR,
+    TIME_LIMIT_EXCEEDED,
+    WRONG_ANSWER,
+    results_match,
+    short_repr,
+)
+
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "runner.py")
+# uid the runner drops to when the judge runs as root
+JUDGE_SANDBOX_UID = int(os.getenv("JUDGE_SANDBOX_UID", 65534))
+
+# Longest the runner process may take to answer a request
+ZYGOTE_TIMEOUT = 30
+# Upper bound on one output line a child may send back
+MAX_RESULT_BYTES = 1024 * 1024
+# Environment values shorter than this aren't worth redacting from output
+MIN_SECRET_LENGTH = 8
+
+
+@dataclass(frozen=True)
+class SandboxLimits:
+    cpu_seconds: int = int(os.getenv("JUDGE_CPU_SECONDS", 2))
+    memory_mb: int = int(os.getenv("JUDGE_MEMORY_MB", 256))
+    wall_seconds: float = float(os.getenv("JUDGE_WALL_SECONDS", 5))
+
+
+class _Zygote:
+    """
+    This worker's runner process (judge/runner.py), started once and asked
+    to fork a child per job; it also kills and reaps those children
+    """
+
+    def __init__(self):
+        self.socket, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.pid = os.fork()
+        if self.pid == 0:
+            try:
+                os.dup2(theirs.fileno(), 0)
+                devnull = os.open(os.devnull, os.O_WRONLY)
+                os.dup2(devnull, 1)
+                os.dup2(devnull, 2)
+                os.closerange(3, os.sysconf("SC_OPEN_MAX"))
+                os.chdir("/")
+                os.execve(sys.executable, [sys.executable, "-I", "-S", "-B", RUNNER_PATH], {})
+            finally:
+                os._exit(127)
+        theirs.close()
+        self.socket.settimeout(ZYGOTE_TIMEOUT)
+        self.ready = False
+        # pid -> wait status, for exits reported before anyone asked
+        self.exits: Dict[int, int] = {}
+
+    def _send(self, message: dict, fds: List[int] = ()):
+        socket.send_fds(self.socket, [json.dumps(message).encode("utf-8")], list(fds))
+
+    def _receive(self) -> dict:
+        data = self.socket.recv(4096)
+        if not data:
+            raise ConnectionError("Judge runner exited")
+        message = json.loads(data)
+        if "exit" in message:
+            self.exits[message["exit"]] = message["status"]
+        elif message.get("ready"):
+            self.ready = True
+        return message
+
+    def wait_ready(self):
+        """Block until the runner has imported everything and takes requests"""
+        while not self.ready:
+            self._receive()
+
+    def spawn(self) -> Tuple[int, int, int]:
+        """Fork a child; returns (pid, its job pipe, its output pipe)"""
+        job_read, job_write = os.pipe()
+        output_read, output_write = os.pipe()
+        try:
+            self._send({"op": "spawn"}, [job_read, output_write])
+            while True:
+                message = self._receive()
+                if "pid" in message:
+                    return message["pid"], job_write, output_read
+        except BaseException:
+            os.close(job_write)
+            os.close(output_read)
+            raise
+        finally:
+            os.close(job_read)
+            os.close(output_write)
+
+    def kill(self, pid: int):
+        self._send({"op": "kill", "pid": pid})
+
+    def wait(self, pid: int) -> int:
+        while pid not in self.exits:
+            self._receive()
+        return self.exits.pop(pid)
+
+    def close(self):
+        self.socket.close()
+        os.waitpid(self.pid, 0)
+
+
+_zygote: Optional[_Zygote] = None
+
+
+def start_zygote() -> _Zygote:
+    """This worker's runner process, started (or restarted) on demand"""
+    global _zygote
+    if _zygote is None:
+        _zygote = _Zygote()
+    return _zygote
+
+
+def _spawn() -> Tuple[_Zygote, int, int, int]:
+    global _zygote
+    zygote = start_zygote()
+    try:
+        return (zygote, *zygote.spawn())
+    except (OSError, ValueError):
+        # The runner died; start a fresh one and retry once
+        _zygote = None
+        zygote.close()
+        zygote = start_zygote()
+        return (zygote, *zygote.spawn())
+
+
+_secrets: Optional[List[str]] = None
+
+
+def _redact(text) -> str:
+    """User-facing text from a child, cut short and with any of our environment values removed"""
+    global _secrets
+    if _secrets is None:
+        _secrets = sorted({v for v in os.environ.values() if len(v) >= MIN_SECRET_LENGTH}, key=len, reverse=True)
+    text = str(text)[:MAX_ERROR_LENGTH]
+    for secret in _secrets:
+        text = text.replace(secret, "[redacted]")
+    return text
+
+
+class _Child:
+    """Parent-side state of a child judging one range of cases"""
+
+    def __init__(self, index: int, code: str, suite: dict, cases: List[dict], limits: SandboxLimits):
+        self.index = index
+        self.suite = suite
+        self.cases = cases
+        self.zygote, self.pid, self.job_fd, self.output_fd = _spawn()
+        job = {
+            "code": code,
+            "entry_point": suite["entry_point"],
+            "arg_types": suite.get("arg_types"),
+            "return_type": suite.get("return_type"),
+            "args": [case["args"] for case in cases],
+            "limits": {"cpu_seconds": limits.cpu_seconds, "memory_mb": limits.memory_mb},
+            "uid": JUDGE_SANDBOX_UID,
+        }
+        # Job bytes not yet written; the runner reads them as it starts
+        self.pending = memoryview(json.dumps(job).encode("utf-8"))
+        os.set_blocking(self.job_fd, False)
+        self.buffer = b""
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.passed = 0
+        self.result: Optional[dict] = None
+
+    def write_job(self):
+        """Write as much of the job as the pipe takes; closes it when done"""
+        try:
+            self.pending = self.pending[os.write(self.job_fd, self.pending):]
+        except BrokenPipeError:
+            self.pending = self.pending[:0]
+        if not self.pending:
+            os.close(self.job_fd)
+            self.job_fd = None
+
+    def _decide(self, status: str, **fields):
+        self.result = {"status": status, **fields}
+
+    def _decide_case(self, status: str, error: Optional[str] = None, failed: bool = True):
+        """A verdict the harness reached; `failed` marks the next case as the one that failed"""
+        runtime_ms = int(((self.finished_at or time.monotonic()) - self.started_at) * 1000)
+        self._decide(status, passed_cases=self.passed, total_cases=len(self.cases), runtime_ms=runtime_ms, error=error)
+        if failed:
+            self.result["failed_case"] = self.passed
+
+    def read_output(self) -> bool:
+        """Handle what the child wrote; returns False at end of output"""
+        data = os.read(self.output_fd, 65536)
+        if not data:
+            return False
+        self.buffer += data
+        while self.result is None and b"\n" in self.buffer:
+            line, self.buffer = self.buffer.split(b"\n", 1)
+            self._handle(line)
+        if self.result is None and len(self.buffer) > MAX_RESULT_BYTES:
+            self._decide_case(RUNTIME_ERROR, "Output too large")
+        return True
+
+    def _handle(self, line: bytes):
+        try:
+            message = json.loads(line)
+        except ValueError:
+            message = None
+        if self.started_at is None:
+            # Written by the runner itself, before any user code ran
+            if isinstance(message, dict) and message.get("started"):
+                self.started_at = time.monotonic()
+            else:
+                detail = message.get("internal") if isinstance(message, dict) else "malformed output"
+                self._decide(INTERNAL_ERROR, error=f"Sandbox setup failed: {detail}")
+            return
+        if not isinstance(message, dict):
+            self._decide_case(RUNTIME_ERROR, "Invalid output")
+            return
+
+        # Errors loading the code aren't a case's, and don't count as runtime
+        in_case = "case" in message
+        self.finished_at = time.monotonic() if in_case or self.passed else self.started_at
+        if "compile_error" in message:
+            self._decide_case(COMPILE_ERROR, _redact(message["compile_error"]), failed=False)
+        elif "memory" in message:
+            self._decide_case(MEMORY_LIMIT_EXCEEDED, failed=in_case)
+        elif "error" in message:
+            self._decide_case(RUNTIME_ERROR, _redact(message["error"]), failed=in_case)
+        elif message.get("case") == self.passed and "actual" in message:
+            case, actual = self.cases[self.passed], message["actual"]
+            if not results_match(actual, case["expected"], self.suite.get("compare", "exact")):
+                self._decide_case(
+                    WRONG_ANSWER,
+                    f"Expected {short_repr(case['expected'])}, got {_redact(short_repr(actual))}",
+                )
+                return
+            self.passed += 1
+            if self.passed == len(self.cases):
+                self._decide_case(ACCEPTED, failed=False)
+        else:
+            self._decide_case(RUNTIME_ERROR, "Invalid output")
+
+    def close(self, kill: bool):
+        """Reap the child; without a verdict, its exit status decides"""
+        if self.job_fd is not None:
+            os.close(self.job_fd)
+            self.job_fd = None
+        os.close(self.output_fd)
+        try:
+            if kill:
+                self.zygote.kill(self.pid)
+            wait_status = self.zygote.wait(self.pid)
+        except (OSError, ValueError):
+            if self.result is None:
+                self._decide(INTERNAL_ERROR, error="Judge runner exited")
+            return
+        if self.result is not None:
+            return
+        if os.WIFSIGNALED(wait_status):
+            signum = os.WTERMSIG(wait_status)
+            if signum in (signal.SIGXCPU, signal.SIGKILL):
+                self._decide(TIME_LIMIT_EXCEEDED, error="CPU time limit exceeded")
+            else:
+                self._decide(RUNTIME_ERROR, error=f"Killed by signal {signum}")
+        elif self.started_at is None:
+            self._decide(INTERNAL_ERROR, error=f"Runner exited with code {os.WEXITSTATUS(wait_status)}")
+        else:
+            self._decide(RUNTIME_ERROR, error=f"Process exited with code {os.WEXITSTATUS(wait_status)}")
+
+
+def split_cases(count: int, workers: int) -> List[Tuple[int, int]]:
+    """Contiguous (start, end) case ranges, one per child"""
+    workers = max(min(workers, count), 1)
+    size, extra = divmod(count, workers)
+    ranges, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _merge(results: List[Optional[dict]], ranges: List[Tuple[int, int]], total_cases: int) -> dict:
+    """
+    Combine per-range results into the result a sequential run would give:
+    the first failing range decides, with its case indexes made global
+    """
+    passed = runtime_ms = 0
+    for (start, _), result in zip(ranges, results):
+        if result.get("status") != ACCEPTED:
+            result = dict(result)
+            if "total_cases" in result:
+                result.update(
+                    passed_cases=passed + result["passed_cases"],
+                    total_cases=total_cases,
+                    runtime_ms=runtime_ms + result["runtime_ms"],
+                )
+            if "failed_case" in result:
+                result["failed_case"] += start
+            return result
+        passed += result["passed_cases"]
+        runtime_ms += result["runtime_ms"]
+    return {"status": ACCEPTED, "passed_cases": passed, "total_cases": total_cases, "runtime_ms": runtime_ms, "error": None}
+
+
+def run_in_sandbox(code: str, suite: dict, limits: SandboxLimits = None, workers: int = 1) -> dict:
+    """
+    Judge `code` against `suite` in sandboxed, resource-limited children.
+
+    With workers > 1 the cases are split into contiguous ranges judged in
+    parallel, each child under the full limits. As soon as a range fails,
+    the children judging later ranges are killed: only an earlier range
+    can still change the verdict, so the result is the one a single child
+    running every case in order would report.
+    """
+    limits = limits or SandboxLimits()
+    started = time.monotonic()
+    deadline = started + limits.wall_seconds
+    cases = suite["cases"]
+    ranges = split_cases(len(cases), workers)
+
+    # output fd -> child
+    children: Dict[int, _Child] = {}
+    results: List[Optional[dict]] = [None] * len(ranges)
+    first_failure = len(ranges)
+
+    def finish(child: _Child, kill: bool):
+        children.pop(child.output_fd)
+        child.close(kill)
+        results[child.index] = child.result
+
+    try:
+        for index, (start, end) in enumerate(ranges):
+            child = _Child(index, code, suite, cases[start:end], limits)
+            children[child.output_fd] = child
+
+        while children:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            writing = {child.job_fd: child for child in children.values() if child.job_fd is not None}
+            readable, writable, _ = select.select(list(children), list(writing), [], remaining)
+            for job_fd in writable:
+                writing[job_fd].write_job()
+            for output_fd in readable:
+                child = children.get(output_fd)
+                if child is None:
+                    continue
+                if child.read_output() and child.result is None:
+                    continue
+
+                # Decided, or the child exited without a verdict
+                finish(child, kill=child.result is not None)
+                if results[child.index].get("status") != ACCEPTED and child.index < first_failure:
+                    first_failure = child.index
+                    for other in [other for other in children.values() if other.index > child.index]:
+                        finish(other, kill=True)
+    finally:
+        # Past the wall-clock limit (or on error): kill whatever is left
+        for child in list(children.values()):
+            child.result = {"status": TIME_LIMIT_EXCEEDED, "error": "Wall-clock limit exceeded"}
+            finish(child, kill=True)
+
+    result = _merge(results, ranges, len(cases))
+    result["wall_ms"] = int((time.monotonic() - started) * 1000)
+    return result
@@ -0,0 +1,155 @@
+"""
+Judge Syscall Filter
+The seccomp filter the sandboxed runner installs on itself before it loads
+user code. Syscalls that open files, change the filesystem, create sockets
+or processes, signal, trace or reprioritize other processes, or change
+credentials fail with EPERM; the rest (memory, reads and writes on
+descriptors that are already open, clocks) are allowed. A filter can't be
+removed once installed.
+
+Linux on x86_64 or aarch64 only; stdlib only, like the runner.
+"""
+
+import ctypes
+import errno
+import os
+import struct
+
+PR_SET_SECCOMP = 22
+PR_SET_NO_NEW_PRIVS = 38
+SECCOMP_MODE_FILTER = 2
+
+SECCOMP_RET_KILL_PROCESS = 0x80000000
+SECCOMP_RET_ERRNO = 0x00050000
+SECCOMP_RET_ALLOW = 0x7FFF0000
+
+# Classic BPF opcodes
+BPF_LD_W_ABS = 0x20
+BPF_JEQ_K = 0x15
+BPF_JGE_K = 0x35
+BPF_RET_K = 0x06
+
+# Offsets into struct seccomp_data
+OFFSET_NR = 0
+OFFSET_ARCH = 4
+
+# x86_64 syscalls at or above this use the x32 ABI
+X32_SYSCALL_BIT = 0x40000000
+
+DENIED = (
+    # Files and the filesystem
+    "open", "creat", "openat", "openat2", "open_by_handle_at", "name_to_handle_at",
+    "unlink", "unlinkat", "rename", "renameat", "renameat2", "mkdir", "mkdirat", "rmdir",
+    "link", "linkat", "symlink", "symlinkat", "mknod", "mknodat", "chmod", "fchmod", "fchmodat",
+    "chown", "fchown", "lchown", "fchownat", "truncate", "ftruncate", "utime", "utimes",
+    "utimensat", "futimesat", "mount", "umount2", "chroot", "pivot_root", "swapon", "acct",
+    # Network
+    "socket", "socketpair", "connect", "bind", "listen", "accept", "accept4", "sendto", "sendmsg",
+    # Processes
+    "clone", "clone3", "fork", "vfork", "execve", "execveat", "unshare", "setns",
+    "kill", "tkill", "tgkill", "rt_sigqueueinfo", "rt_tgsigqueueinfo",
+    "pidfd_open", "pidfd_send_signal", "pidfd_getfd",
+    "ptrace", "process_vm_readv", "process_vm_writev",
+    "setpriority", "sched_setaffinity", "sched_setscheduler", "sched_setparam", "sched_setattr",
+    "ioprio_set", "migrate_pages", "move_pages", "setrlimit", "prlimit64",
+    # Credentials and the kernel
+    "setuid", "setgid", "setreuid", "setregid", "setresuid", "setresgid", "setgroups",
+    "bpf", "perf_event_open", "userfaultfd", "io_uring_setup", "keyctl", "add_key", "request_key",
+    "init_module", "finit_module", "delete_module", "kexec_load", "reboot", "settimeofday",
+    "personality",
+)
+
+# uname machine -> (AUDIT_ARCH_*, syscall numbers); syscalls an arch lacks are left out
+ARCHES = {
+    "x86_64": (0xC000003E, {
+        "open": 2, "creat": 85, "openat": 257, "openat2": 437, "open_by_handle_at": 304,
+        "name_to_handle_at": 303, "unlink": 87, "unlinkat": 263, "rename": 82, "renameat": 264,
+        "renameat2": 316, "mkdir": 83, "mkdirat": 258, "rmdir": 84, "link": 86, "linkat": 265,
+        "symlink": 88, "symlinkat": 266, "mknod": 133, "mknodat": 259, "chmod": 90, "fchmod": 91,
+        "fchmodat": 268, "chown": 92, "fchown": 93, "lchown": 94, "fchownat": 260, "truncate": 76,
+        "ftruncate": 77, "utime": 132, "utimes": 235, "utimensat": 280, "futimesat": 261,
+        "mount": 165, "umount2": 166, "chroot": 161, "pivot_root": 155, "swapon": 167, "acct": 163,
+        "socket": 41, "socketpair": 53, "connect": 42, "bind": 49, "listen": 50, "accept": 43,
+        "accept4": 288, "sendto": 44, "sendmsg": 46,
+        "clone": 56, "clone3": 435, "fork": 57, "vfork": 58, "execve": 59, "execveat": 322,
+        "unshare": 272, "setns": 308, "kill": 62, "tkill": 200, "tgkill": 234,
+        "rt_sigqueueinfo": 129, "rt_tgsigqueueinfo": 297, "pidfd_open": 434,
+        "pidfd_send_signal": 424, "pidfd_getfd": 438, "ptrace": 101, "process_vm_readv": 310,
+        "process_vm_writev": 311, "setpriority": 141, "sched_setaffinity": 203,
+        "sched_setscheduler": 144, "sched_setparam": 142, "sched_setattr": 314, "ioprio_set": 251,
+        "migrate_pages": 256, "move_pages": 279, "setrlimit": 160, "prlimit64": 302,
+        "setuid": 105, "setgid": 106, "setreuid": 113, "setregid": 114, "setresuid": 117,
+        "setresgid": 119, "setgroups": 116, "bpf": 321, "perf_event_open": 298, "userfaultfd": 323,
+        "io_uring_setup": 425, "keyctl": 250, "add_key": 248, "request_key": 249,
+        "init_module": 175, "finit_module": 313, "delete_module": 176, "kexec_load": 246,
+        "reboot": 169, "settimeofday": 164, "personality": 135,
+    }),
+    "aarch64": (0xC00000B7, {
+        "openat": 56, "openat2": 437, "open_by_handle_at": 265, "name_to_handle_at": 264,
+        "unlinkat": 35, "renameat": 38, "renameat2": 276, "mkdirat": 34, "linkat": 37,
+        "symlinkat": 36, "mknodat": 33, "fchmod": 52, "fchmodat": 53, "fchown": 55, "fchownat": 54,
+        "truncate": 45, "ftruncate": 46, "utimensat": 88, "mount": 40, "umount2": 39, "chroot": 51,
+        "pivot_root": 41, "swapon": 224, "acct": 89,
+        "socket": 198, "socketpair": 199, "connect": 203, "bind": 200, "listen": 201, "accept": 202,
+        "accept4": 242, "sendto": 206, "sendmsg": 211,
+        "clone": 220, "clone3": 435, "execve": 221, "execveat": 281, "unshare": 97, "setns": 268,
+        "kill": 129, "tkill": 130, "tgkill": 131, "rt_sigqueueinfo": 138, "rt_tgsigqueueinfo": 240,
+        "pidfd_open": 434, "pidfd_send_signal": 424, "pidfd_getfd": 438, "ptrace": 117,
+        "process_vm_readv": 270, "process_vm_writev": 271, "setpriority": 140,
+        "sched_setaffinity": 122, "sched_setscheduler": 119, "sched_setparam": 118,
+        "sched_setattr": 274, "ioprio_set": 30, "migrate_pages": 238, "move_pages": 239,
+        "setrlimit": 164, "prlimit64": 261,
+        "setuid": 146, "setgid": 144, "setreuid": 145, "setregid": 143, "setresuid": 147,
+        "setresgid": 149, "setgroups": 159, "bpf": 280, "perf_event_open": 241, "userfaultfd": 282,
+        "io_uring_setup": 425, "keyctl": 219, "add_key": 217, "request_key": 218,
+        "init_module": 105, "finit_module": 273, "delete_module": 106, "kexec_load": 104,
+        "reboot": 142, "settimeofday": 170, "personality": 92,
+    }),
+}
+
+
+class SockFprog(ctypes.Structure):
+    _fields_ = [("len", ctypes.c_ushort), ("filter", ctypes.c_void_p)]
+
+
+def _instruction(code: int, jt: int, jf: int, k: int) -> bytes:
+    return struct.pack("=HBBI", code, jt, jf, k)
+
+
+def build_filter(machine: str) -> bytes:
+    """The BPF program for an architecture (a uname machine name)"""
+    if machine not in ARCHES:
+        raise OSError(f"No seccomp filter for {machine}")
+    audit_arch, numbers = ARCHES[machine]
+    denied = sorted({numbers[name] for name in DENIED if name in numbers})
+    deny = SECCOMP_RET_ERRNO | errno.EPERM
+
+    program = [
+        _instruction(BPF_LD_W_ABS, 0, 0, OFFSET_ARCH),
+        _instruction(BPF_JEQ_K, 1, 0, audit_arch),
+        _instruction(BPF_RET_K, 0, 0, SECCOMP_RET_KILL_PROCESS),
+        _instruction(BPF_LD_W_ABS, 0, 0, OFFSET_NR),
+    ]
+    if machine == "x86_64":
+        program += [_instruction(BPF_JGE_K, 0, 1, X32_SYSCALL_BIT), _instruction(BPF_RET_K, 0, 0, deny)]
+    # Each match jumps past the remaining checks and the allow to the final deny
+    for i, number in enumerate(denied):
+        program.append(_instruction(BPF_JEQ_K, len(denied) - i, 0, number))
+    program += [_instruction(BPF_RET_K, 0, 0, SECCOMP_RET_ALLOW), _instruction(BPF_RET_K, 0, 0, deny)]
+    return b"".join(program)
+
+
+def install():
+    """Install the filter on the calling process; raises OSError if the kernel refuses"""
+    program = build_filter(os.uname().machine)
+    buffer = ctypes.create_string_buffer(program, len(program))
+    prog = SockFprog(len(program) // 8, ctypes.cast(buffer, ctypes.c_void_p))
+    libc = ctypes.CDLL(None, use_errno=True)
+    libc.prctl.restype = ctypes.c_int
+    for args in (
+        (PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0),
+        (PR_SET_SECCOMP, SECCOMP_MODE_FILTER, ctypes.addressof(prog), 0, 0),
+    ):
+        if libc.prctl(*(ctypes.c_ulong(arg) for arg in args)) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"prctl({args[0]}): {os.strerror(error)}")
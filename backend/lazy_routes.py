@@ -0,0 +1,62 @@
+"""
+Route Registration
+The API's route modules, with the path prefixes each one serves. Regular
+servers include them all at import time; in fast-start mode (FAST_START=1,
+used by the serverless entry point) each module is imported and included
+the first time a request for one of its prefixes arrives, so a cold start
+only pays for the routes it actually serves.
+"""
+
+import importlib
+from typing import Set
+
+from fastapi import FastAPI
+
+API_PREFIX = "/api"
+
+# (module, OpenAPI tag, path prefixes served by the module)
+ROUTE_MODULES = (
+    ("backend.routes.daily_triple", "daily-triple", ("/api/daily-triple", "/api/patterns", "/api/problems")),
+    ("backend.routes.submission", "submissions", ("/api/submit", "/api/submissions")),
+    ("backend.routes.progress", "progress", ("/api/progress", "/api/profile")),
+    ("backend.routes.search", "search", ("/api/search",)),
+    ("backend.routes.dashboard", "dashboard", ("/api/dashboard",)),
+)
+
+# Paths that describe the whole API, so they need every route registered
+SCHEMA_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+def include_route_module(app: FastAPI, module_name: str, tag: str):
+    module = importlib.import_module(module_name)
+    app.include_router(module.router, prefix=API_PREFIX, tags=[tag])
+
+
+def include_all_routes(app: FastAPI):
+    for module_name, tag, _ in ROUTE_MODULES:
+        include_route_module(app, module_name, tag)
+
+
+class LazyRouteMiddleware:
+    """ASGI middleware that registers a route module just before its first request"""
+
+    def __init__(self, app, fastapi_app: FastAPI):
+        self.app = app
+        self.fastapi_app = fastapi_app
+        self.loaded: Set[str] = set()
+
+    def ensure_routes(self, path: str):
+        load_all = path in SCHEMA_PATHS
+        for module_name, tag, prefixes in ROUTE_MODULES:
+            if module_name in self.loaded:
+                continue
+            if load_all or path.startswith(prefixes):
+                include_route_module(self.fastapi_app, module_name, tag)
+                self.loaded.add(module_name)
+                # The OpenAPI schema is cached; rebuild it with the new routes
+                self.fastapi_app.openapi_schema = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and len(self.loaded) < len(ROUTE_MODULES):
+            self.ensure_routes(scope["path"])
+        await self.app(scope, receive, send)
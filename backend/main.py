@@ -1,11 +1,17 @@
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from backend.routes import daily_triple, submission, progress
+from backend.encoding import CompressionMiddleware, compression_stats
+from backend.lazy_routes import LazyRouteMiddleware, include_all_routes
+from backend.metrics import PROMETHEUS_MEDIA_TYPE, MetricsMiddleware, register_collector, render_metrics
 
 load_dotenv()
 
+# Startup-optimized mode for serverless cold starts (set by api/index.py):
+# route modules, the catalog and background workers load on demand
+FAST_START = os.getenv("FAST_START", "0") == "1"
+
 # Initialize FastAPI app
 app = FastAPI(
     title="LogicGate DSA Backend",
@@ -36,12 +42,94 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Register routes
-app.include_router(daily_triple.router, prefix="/api", tags=["daily-triple"])
-app.include_router(submission.router, prefix="/api", tags=["submissions"])
-app.include_router(progress.router, prefix="/api", tags=["progress"])
+if FAST_START:
+    app.add_middleware(LazyRouteMiddleware, fastapi_app=app)
+else:
+    include_all_routes(app)
+
+# gzip/brotli for larger bodies, negotiated from Accept-Encoding
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so timings include CORS and lazy route registration
+app.add_middleware(MetricsMiddleware)
+
+def cache_metrics():
+    """Progress cache counters, sampled on each /metrics scrape"""
+    from backend.progress_cache import cache_stats
+    stats = cache_stats()
+    return [
+        (f"progress_cache_{field}", f"Progress cache {field.replace('_', ' ')}",
+         {(name,): values[field] for name, values in stats.items()}, ("cache",))
+        for field in ("size", "hits", "misses", "evictions")
+    ]
+
+register_collector(cache_metrics)
+
+def compression_metrics():
+    """Compressed response cache counters, sampled on each /metrics scrape"""
+    stats = compression_stats()
+    return [
+        (f"compressed_response_cache_{field}", f"Compressed response cache {field}", {(): stats[field]}, ())
+        for field in ("size", "hits", "misses", "evictions")
+    ]
+
+register_collector(compression_metrics)
+
+def judge_cache_metrics():
+    """Judge verdict cache counters; registered on nodes running the queue worker"""
+    from backend.judge.cache import get_judge_result_cache
+    stats = get_judge_result_cache().stats()
+    return [
+        (f"judge_cache_{field}", f"Judge verdict cache {field}", {(): stats[field]}, ())
+        for field in ("size", "hits", "misses")
+    ]
+
+@app.on_event("startup")
+async def build_catalog():
+    """Build the catalog indexes, encoded payloads and search index once, before the first request"""
+    if not FAST_START:
+        from backend.response_cache import get_response_cache
+        from backend.search import get_search_index
+        get_response_cache().warm()
+        get_search_index()
+
+@app.on_event("startup")
+async def start_judge_worker():
+    """Drain the durable judge queue in the background (disable with JUDGE_QUEUE_WORKER=0)"""
+    if not FAST_START and os.getenv("JUDGE_QUEUE_WORKER", "1") != "0":
+        from backend.judge import ensure_queue_worker, get_judge_engine
+        ensure_queue_worker()
+        register_collector(judge_cache_metrics)
+        # Start the judge processes now rather than on the first submission
+        try:
+            await get_judge_engine().warm()
+        except Exception as e:
+            print(f"Error starting judge workers: {e}")
+
+@app.on_event("startup")
+async def start_daily_triple_pregeneration():
+    """Pre-generate triples for active users after midnight (disable with DAILY_TRIPLE_PREGENERATE=0)"""
+    if not FAST_START and os.getenv("DAILY_TRIPLE_PREGENERATE", "1") != "0":
+        from backend.daily_triples import start_pregeneration
+        start_pregeneration()
+
+@app.on_event("shutdown")
+async def close_pools():
+    """Stop the judge queue worker and release the worker pools"""
+    from backend.db import shutdown_executor
+    from backend.supabase_config import close_storage
+    from backend.judge import stop_queue_worker
+    if not FAST_START:
+        from backend.daily_triples import stop_pregeneration
+        await stop_pregeneration()
+    # Under FAST_START the worker may have been started by a submission
+    await stop_queue_worker()
+    shutdown_executor()
+    close_storage()
 
 @app.get("/")
 async def root():
@@ -63,11 +151,18 @@ async def health():
 @app.get("/api/status")
 async def api_status():
     """API status endpoint"""
+    from backend.progress_cache import cache_stats
     return {
         "status": "online",
-        "environment": os.getenv("ENVIRONMENT", "development")
+        "environment": os.getenv("ENVIRONMENT", "development"),
+        "caches": cache_stats()
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: route latencies, in-flight requests, query timings"""
+    return Response(content=render_metrics(), media_type=PROMETHEUS_MEDIA_TYPE)
+
 if __name__ == "__main__":
     import uvicorn
     
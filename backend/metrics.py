@@ -0,0 +1,223 @@
+"""
+Performance Metrics
+Per-route latency histograms, in-flight request gauges and per-query
+Supabase timings and row counts, rendered in the Prometheus text format
+on GET /metrics. A small in-process registry is used instead of a client
+library so the fast-start import path stays light.
+
+Requests slower than SLOW_REQUEST_MS (off when 0) are logged with the
+number and total time of the queries they made.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Log requests slower than this many milliseconds; 0 disables the log
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 0))
+
+# Starlette appends the charset to text/* media types
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, [list(v[0]), v[1], v[2]]) for k, v in self._series.items())
+        lines = []
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served", ("method",))
+QUERY_LATENCY = Histogram("db_query_duration_seconds", "Supabase query latency", ("target", "operation"))
+QUERY_ROWS = Histogram("db_query_rows", "Rows returned per Supabase query", ("target", "operation"), buckets=ROW_BUCKETS)
+QUERY_ERRORS = Counter("db_query_errors_total", "Failed or timed-out Supabase queries", ("target", "operation"))
+
+_METRICS: List[Metric] = [REQUESTS, REQUEST_LATENCY, IN_FLIGHT, QUERY_LATENCY, QUERY_ROWS, QUERY_ERRORS]
+# Callables returning extra gauges at scrape time: [(name, help, {labels tuple: value}, label names)]
+_collectors: List[Callable[[], list]] = []
+
+
+def register_collector(collector: Callable[[], list]):
+    _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        for name, help_text, samples, label_names in collector():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{_labels(label_names, k)} {_number(v)}" for k, v in sorted(samples.items()))
+    return "\n".join(lines) + "\n"
+
+
+# Per-request query accounting, shared with tasks the request spawns
+_request_queries: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("request_queries", default=None)
+
+
+def describe_query(query) -> Tuple[str, str]:
+    """(target, operation) labels for a PostgREST request builder"""
+    path = getattr(query, "path", "") or ""
+    method = getattr(query, "http_method", "") or ""
+    if path.startswith("/rpc/"):
+        return path[len("/rpc/"):], "rpc"
+    if method == "POST":
+        prefer = (getattr(query, "headers", None) or {}).get("prefer", "")
+        operation = "upsert" if "resolution=" in prefer else "insert"
+    else:
+        operation = {"GET": "select", "PATCH": "update", "DELETE": "delete"}.get(method, method.lower() or "unknown")
+    return path.lstrip("/") or "unknown", operation
+
+
+def record_query(query, seconds: float, result=None, failed: bool = False):
+    """Record one Supabase call (see db.execute)"""
+    target, operation = describe_query(query)
+    QUERY_LATENCY.observe(seconds, target, operation)
+    if failed:
+        QUERY_ERRORS.inc(target, operation)
+    else:
+        data = getattr(result, "data", None)
+        QUERY_ROWS.observe(len(data) if isinstance(data, list) else int(data is not None), target, operation)
+
+    queries = _request_queries.get()
+    if queries is not None:
+        queries[0] += 1
+        queries[1] += seconds
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by method and route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = [500]
+        queries = [0, 0.0]
+        token = _request_queries.set(queries)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        # The route template is only known after routing, so in-flight
+        # requests are counted per method
+        IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec(method)
+            _request_queries.reset(token)
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            REQUESTS.inc(method, route_path, str(status[0]))
+            REQUEST_LATENCY.observe(elapsed, method, route_path)
+
+            if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+                print(
+                    f"Slow request: {method} {scope['path']} ({route_path}) -> {status[0]} "
+                    f"in {elapsed * 1000:.1f}ms, {queries[0]} queries totalling {queries[1] * 1000:.1f}ms"
+                )
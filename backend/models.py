@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from enum import Enum
 
@@ -25,12 +25,33 @@ class DailyTripleResponse(BaseModel):
     topic: ProblemResponse
     challenge: ProblemResponse
 
+class SearchHit(BaseModel):
+    id: str
+    title: str
+    leetcode_number: int
+    difficulty: DifficultyEnum
+    pattern: str
+    concept_focus: str
+    score: float
+
+class SearchFacets(BaseModel):
+    difficulty: Dict[str, int]
+    pattern: Dict[str, int]
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[SearchHit]
+    facets: SearchFacets
+
 class SubmissionRequest(BaseModel):
     problem_id: str
     user_id: str
     code: str
     strategy: str
     language: str = "python"
+    # IANA timezone for the review schedule's calendar days, as for the Daily Triple
+    tz: Optional[str] = None
 
 class SubmissionResponse(BaseModel):
     id: str
@@ -40,15 +61,55 @@ class SubmissionResponse(BaseModel):
     status: str
     passed: bool
 
+class JudgeStatusResponse(BaseModel):
+    submission_id: str
+    state: str
+    status: str
+    passed: bool
+    attempts: int = 0
+    result: Optional[dict] = None
+
 class ProgressResponse(BaseModel):
     total_problems_solved: int
     streak_days: int
+    longest_streak: int = 0
     patterns_mastered: List[str]
     confidence_scores: dict
 
+class ProgressOperationType(str, Enum):
+    STREAK = "streak"
+    CONFIDENCE = "confidence"
+    PATTERN_MASTERED = "pattern_mastered"
+
+class ProgressOperation(BaseModel):
+    op: ProgressOperationType
+    days: int = 1
+    pattern: Optional[str] = None
+    score: Optional[float] = None
+
+class ProgressBatchRequest(BaseModel):
+    operations: List[ProgressOperation]
+
 class UserProfileResponse(BaseModel):
     user_id: str
     username: str
     created_at: datetime
     total_submissions: int
     current_streak: int
+    longest_streak: int = 0
+
+class DashboardUser(BaseModel):
+    user_id: str
+    username: str
+    total_submissions: int
+    problems_solved: int
+    current_streak: int
+    longest_streak: int
+    patterns_mastered: List[str]
+    confidence_scores: dict
+
+class DashboardResponse(BaseModel):
+    user: DashboardUser
+    daily_triple: DailyTripleResponse
+    recent_submissions: List[SubmissionResponse]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,29 @@
+"""
+Local Data Paths
+Where the backend keeps its local files (the SQLite storage backend's
+database, and the judge's queue and verdict cache; see judge/paths.py):
+DATA_DIR, by default backend/var/ next to the code, so they don't land in
+whatever directory the server or seed.py was started from. On Vercel,
+where only the temp directory is writable, the default is under it.
+"""
+
+import os
+import tempfile
+
+if os.getenv("VERCEL"):
+    DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "logicgate")
+else:
+    DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "var")
+
+DATA_DIR = os.getenv("DATA_DIR", DEFAULT_DATA_DIR)
+
+
+def data_path(name: str) -> str:
+    return os.path.join(DATA_DIR, name)
+
+
+def ensure_parent(path: str):
+    """Create the directory a data file goes in, if it doesn't exist yet"""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
@@ -0,0 +1,173 @@
+"""
+User Progress Cache
+Write-through, in-process cache of user_progress rows and submission stats.
+Concurrent misses for the same user share one query, creation is an
+upsert that can't race, and every write is an atomic RPC whose returned
+row refreshes the cache. Writes are numbered, so a load that was already
+in flight when a write landed returns what it read without caching it.
+
+The cache is per worker process: a write made through another uvicorn
+worker shows up here only once the entry expires (PROGRESS_CACHE_TTL, 60 s
+by default; STATS_CACHE_TTL for submission stats).
+
+Cached records are shared: callers must copy nested lists/dicts before
+changing them.
+"""
+
+import asyncio
+import itertools
+import os
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from backend.cache import TTLCache
+from backend.db import execute
+from backend.supabase_config import get_supabase
+
+PROGRESS_CACHE_SIZE = int(os.getenv("PROGRESS_CACHE_SIZE", 10000))
+PROGRESS_CACHE_TTL = float(os.getenv("PROGRESS_CACHE_TTL", 60))
+# Stats change whenever a submission is judged, so they expire sooner
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", 15))
+
+USER_PROGRESS_COLUMNS = (
+    "user_id,username,total_submissions,current_streak,longest_streak,last_active_on,"
+    "patterns_mastered,confidence_scores"
+)
+
+_records = TTLCache(maxsize=PROGRESS_CACHE_SIZE, ttl=PROGRESS_CACHE_TTL)
+_stats = TTLCache(maxsize=PROGRESS_CACHE_SIZE, ttl=STATS_CACHE_TTL)
+# Load key -> (sequence number when the load started, its result)
+_in_flight: Dict[Hashable, Tuple[int, asyncio.Future]] = {}
+# Load key -> sequence number of its latest write; kept as long as a load can run
+_written = TTLCache(maxsize=2 * PROGRESS_CACHE_SIZE, ttl=PROGRESS_CACHE_TTL)
+_sequence = itertools.count(1)
+
+
+def default_user(user_id: str) -> dict:
+    return {
+        "user_id": user_id,
+        "username": f"User_{user_id[:8]}",
+        "total_submissions": 0,
+        "current_streak": 0,
+        "longest_streak": 0,
+        "last_active_on": None,
+        "patterns_mastered": [],
+        "confidence_scores": {}
+    }
+
+
+def _mark_written(key: Hashable):
+    _written.set(key, next(_sequence))
+
+
+async def _load_through(cache: TTLCache, cache_key: Hashable, key: Hashable, load: Callable[[], Awaitable]):
+    """
+    Run `load` once for concurrent callers asking for the same key and cache
+    the value, unless the key was written while it ran
+    """
+    entry = _in_flight.get(key)
+    if entry is not None and entry[0] > _written.get(key, 0):
+        return await asyncio.shield(entry[1])
+
+    started = next(_sequence)
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = (started, future)
+    try:
+        value = await load()
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark the exception retrieved in case nobody else was waiting
+        future.exception()
+        raise
+    else:
+        future.set_result(value)
+        if _written.get(key, 0) < started:
+            cache.set(cache_key, value)
+        return value
+    finally:
+        # A load started after a write may have taken over the key
+        if _in_flight.get(key, (None, None))[1] is future:
+            del _in_flight[key]
+
+
+async def _load_user(user_id: str) -> dict:
+    supabase = get_supabase()
+    result = await execute(supabase.table("user_progress").select(USER_PROGRESS_COLUMNS).eq("user_id", user_id))
+    if result.data:
+        return result.data[0]
+
+    # ON CONFLICT DO NOTHING: if another request created the row first we
+    # get nothing back and read the winner's row instead
+    created = await execute(
+        supabase.table("user_progress").upsert(default_user(user_id), on_conflict="user_id", ignore_duplicates=True)
+    )
+    if created.data:
+        return created.data[0]
+    result = await execute(supabase.table("user_progress").select(USER_PROGRESS_COLUMNS).eq("user_id", user_id))
+    return result.data[0] if result.data else default_user(user_id)
+
+
+async def get_or_create_user(user_id: str) -> dict:
+    """Get or create user profile in Supabase, served from the cache when possible"""
+    record = _records.get(user_id)
+    if record is not None:
+        return record
+
+    try:
+        return await _load_through(_records, user_id, ("user", user_id), lambda: _load_user(user_id))
+    except Exception as e:
+        print(f"Error in get_or_create_user: {e}")
+        # Return default if error (not cached)
+        return default_user(user_id)
+
+
+def cached_user(user_id: str) -> Optional[dict]:
+    """The cached user_progress row, without loading it on a miss"""
+    return _records.get(user_id)
+
+
+async def mutate_user_record(function: str, params: dict) -> dict:
+    """
+    Apply an atomic progress update RPC (sql/007_atomic_progress_updates.sql)
+    and cache the row it returns
+    """
+    user_id = params["p_user_id"]
+    supabase = get_supabase()
+    result = await execute(supabase.rpc(function, params))
+    _mark_written(("user", user_id))
+    rows = result.data if isinstance(result.data, list) else [result.data] if result.data else []
+    if rows:
+        _records.set(user_id, rows[0])
+        return rows[0]
+
+    _records.pop(user_id)
+    return default_user(user_id)
+
+
+async def get_submission_stats(user_id: str) -> dict:
+    """Get submission totals for a user, aggregated in the database (sql/001_submission_stats.sql)"""
+    stats = _stats.get(user_id)
+    if stats is not None:
+        return stats
+
+    async def load():
+        supabase = get_supabase()
+        result = await execute(supabase.rpc("user_submission_stats", {"p_user_id": user_id}))
+        # Table-returning functions come back as a one-element list
+        row = result.data[0] if isinstance(result.data, list) and result.data else result.data or {}
+        return {
+            "total_submissions": row.get("total_submissions") or 0,
+            "problems_solved": row.get("problems_solved") or 0,
+        }
+
+    return await _load_through(_stats, user_id, ("stats", user_id), load)
+
+
+def invalidate_submission_stats(user_id: str):
+    """Call after a submission is stored or judged"""
+    _mark_written(("stats", user_id))
+    _stats.pop(user_id)
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters for the progress caches"""
+    return {"user_progress": _records.stats(), "submission_stats": _stats.stats()}
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Recompute every user's pattern confidence from judged submissions
+
+The batch counterpart of analytics.record_pattern_outcome, meant to run
+nightly: submissions are streamed once (keyset pagination on id) into flat
+arrays, then decay, difficulty weights and the per (user, pattern) sums
+are computed with NumPy in a few vectorized passes. Sums and scores are
+written back in batches through apply_confidence_batch
+(sql/010_pattern_confidence.sql), re-basing the incremental state at now.
+
+Usage (from the project root):
+    python -m backend.recompute_confidence [--page-size 1000] [--batch-size 500] [--dry-run]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+import numpy as np
+
+from backend.analytics import (
+    CONFIDENCE_HALF_LIFE_DAYS,
+    CONFIDENCE_PRIOR_WEIGHT,
+    MASTERY_THRESHOLD,
+    attempt_outcome,
+    difficulty_weight,
+)
+from backend.data.catalog import get_catalog
+from backend.supabase_config import get_supabase
+
+load_dotenv()
+
+SECONDS_PER_DAY = 86400
+
+
+def stream_submissions(supabase, page_size: int):
+    """Yield every judged submission's outcome columns, in id order"""
+    last_id = None
+    while True:
+        query = (
+            supabase.table("submissions").select("id,user_id,problem_id,status,judge_result,submitted_at")
+            .neq("status", "pending")
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(page_size).execute().data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def collect_attempts(rows, catalog, patterns: list) -> dict:
+    """Flatten submissions into per-attempt arrays: user/pattern index, weight, outcome, time"""
+    pattern_index = {pattern: i for i, pattern in enumerate(patterns)}
+    user_index = {}
+    users, pattern_ids, weights, outcomes, times = [], [], [], [], []
+
+    for row in rows:
+        problem = catalog.get(row["problem_id"])
+        outcome = attempt_outcome(row.get("judge_result") or {"status": row.get("status")})
+        if problem is None or outcome is None:
+            continue
+        users.append(user_index.setdefault(row["user_id"], len(user_index)))
+        pattern_ids.append(pattern_index[problem["pattern"]])
+        weights.append(difficulty_weight(problem["difficulty"]))
+        outcomes.append(outcome)
+        times.append(datetime.fromisoformat(row["submitted_at"]).timestamp())
+
+    return {
+        "user_ids": list(user_index),
+        "user": np.asarray(users, dtype=np.int64),
+        "pattern": np.asarray(pattern_ids, dtype=np.int64),
+        "weight": np.asarray(weights, dtype=np.float64),
+        "outcome": np.asarray(outcomes, dtype=np.float64),
+        "time": np.asarray(times, dtype=np.float64),
+    }
+
+
+def compute_confidence(attempts: dict, n_patterns: int, now: float) -> tuple:
+    """
+    (evidence, weight, confidence) matrices of shape (users, patterns),
+    with every attempt decayed to `now`
+    """
+    n_users = len(attempts["user_ids"])
+    age_days = np.maximum(now - attempts["time"], 0) / SECONDS_PER_DAY
+    weight = attempts["weight"] * np.exp2(-age_days / CONFIDENCE_HALF_LIFE_DAYS)
+
+    # One bincount per sum over the flattened (user, pattern) cell index
+    cells = attempts["user"] * n_patterns + attempts["pattern"]
+    size = n_users * n_patterns
+    weights = np.bincount(cells, weights=weight, minlength=size).reshape(n_users, n_patterns)
+    evidence = np.bincount(cells, weights=weight * attempts["outcome"], minlength=size).reshape(n_users, n_patterns)
+    confidence = np.round(100 * evidence / (weights + CONFIDENCE_PRIOR_WEIGHT), 1)
+    return evidence, weights, confidence
+
+
+def build_rows(user_ids: list, patterns: list, evidence, weights, confidence, as_of: str):
+    """Yield (stats rows, user row) per user, covering patterns with any attempts"""
+    attempted = weights > 0
+    mastered = attempted & (confidence >= MASTERY_THRESHOLD)
+    for u, user_id in enumerate(user_ids):
+        columns = np.flatnonzero(attempted[u])
+        stats = [
+            {
+                "user_id": user_id,
+                "pattern": patterns[p],
+                "evidence": float(evidence[u, p]),
+                "weight": float(weights[u, p]),
+                "as_of": as_of,
+            }
+            for p in columns
+        ]
+        user = {
+            "user_id": user_id,
+            "confidence_scores": {patterns[p]: float(confidence[u, p]) for p in columns},
+            "mastered": [patterns[p] for p in np.flatnonzero(mastered[u])],
+        }
+        yield stats, user
+
+
+def recompute_confidence(page_size: int = 1000, batch_size: int = 500, dry_run: bool = False) -> int:
+    """Recompute and store every user's pattern confidence; returns the number of users"""
+    supabase = get_supabase()
+    catalog = get_catalog()
+    patterns = list(catalog.patterns)
+    now = datetime.now(timezone.utc)
+
+    print("📈 Recomputing pattern confidence from submission history...")
+    try:
+        started = time.perf_counter()
+        attempts = collect_attempts(stream_submissions(supabase, page_size), catalog, patterns)
+        loaded = time.perf_counter()
+        evidence, weights, confidence = compute_confidence(attempts, len(patterns), now.timestamp())
+        computed = time.perf_counter()
+        print(
+            f"  {len(attempts['user'])} attempts by {len(attempts['user_ids'])} users: "
+            f"loaded in {loaded - started:.2f}s, computed in {computed - loaded:.3f}s"
+        )
+
+        stats_batch, user_batch = [], []
+
+        def flush():
+            if user_batch and not dry_run:
+                supabase.rpc("apply_confidence_batch", {"p_stats": stats_batch, "p_users": user_batch}).execute()
+            stats_batch.clear()
+            user_batch.clear()
+
+        for stats, user in build_rows(attempts["user_ids"], patterns, evidence, weights, confidence, now.isoformat()):
+            stats_batch.extend(stats)
+            user_batch.append(user)
+            if len(user_batch) >= batch_size:
+                flush()
+        flush()
+    except Exception as e:
+        print(f"❌ Error recomputing confidence: {str(e)}")
+        print("Make sure sql/010_pattern_confidence.sql has been applied")
+        sys.exit(1)
+
+    users = len(attempts["user_ids"])
+    print(f"\n✅ {'Computed' if dry_run else 'Stored'} confidence for {users} users in {time.perf_counter() - started:.2f}s")
+    return users
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute pattern confidence from submissions")
+    parser.add_argument("--page-size", type=int, default=1000, help="Submissions read per request")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users written per request")
+    parser.add_argument("--dry-run", action="store_true", help="Compute scores without writing")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    recompute_confidence(page_size=max(args.page_size, 1), batch_size=max(args.batch_size, 1), dry_run=args.dry_run)
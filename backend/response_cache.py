@@ -0,0 +1,153 @@
+"""
+Pre-serialized Response Cache
+Catalog data only changes on reseed, so problem, pattern and pattern-list
+payloads are encoded to JSON bytes once and served with ETags.
+Payloads are kept in bounded LRUs, so a large (memory-mapped) catalog
+isn't fully encoded into every worker; catalogs that fit are encoded
+up front at startup. MessagePack variants are derived on first request.
+"""
+
+import hashlib
+import json
+import os
+from itertools import islice
+from typing import Optional
+
+from fastapi import Request, Response
+
+from backend.cache import TTLCache
+from backend.encoding import MSGPACK_MEDIA_TYPE, packb, wants_msgpack
+from backend.data.catalog import ProblemCatalog, get_catalog
+from backend.models import ProblemResponse
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Clients may keep catalog payloads but must revalidate with If-None-Match
+CATALOG_CACHE_CONTROL = "public, no-cache"
+
+# Encoded problem and pattern payloads kept per worker
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 4096))
+PATTERN_CACHE_SIZE = int(os.getenv("PATTERN_CACHE_SIZE", 256))
+
+
+class CachedJSON:
+    """Ready-to-send JSON body with its strong ETag"""
+
+    __slots__ = ("body", "etag", "_msgpack")
+
+    media_type = JSON_MEDIA_TYPE
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        self._msgpack = None
+
+    def msgpack(self) -> "CachedMsgPack":
+        """The same payload encoded as MessagePack, built on first use"""
+        if self._msgpack is None:
+            self._msgpack = CachedMsgPack(packb(json.loads(self.body)))
+        return self._msgpack
+
+
+class CachedMsgPack(CachedJSON):
+    """MessagePack variant of a cached JSON payload"""
+
+    __slots__ = ()
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+
+def encode_problem(problem: dict) -> bytes:
+    """Encode a catalog problem exactly as the ProblemResponse model would"""
+    return ProblemResponse.model_validate(problem).model_dump_json().encode("utf-8")
+
+
+def join_json_array(items) -> bytes:
+    """Join already-encoded JSON values into a JSON array"""
+    return b"[" + b",".join(items) + b"]"
+
+
+class CatalogResponseCache:
+    """Encoded payloads for every catalog endpoint, built from one catalog version"""
+
+    __slots__ = ("version", "catalog", "problems", "patterns", "pattern_list")
+
+    def __init__(self, catalog: ProblemCatalog):
+        self.version = catalog.version
+        self.catalog = catalog
+        # Catalog payloads never go stale within a version, so entries only leave by LRU
+        self.problems = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=float("inf"))
+        self.patterns = TTLCache(maxsize=PATTERN_CACHE_SIZE, ttl=float("inf"))
+        self.pattern_list = CachedJSON(
+            json.dumps(list(catalog.patterns), separators=(",", ":")).encode("utf-8")
+        )
+
+    def warm(self):
+        """Encode as much of the catalog as the caches hold"""
+        for problem in islice(self.catalog.problems, RESPONSE_CACHE_SIZE):
+            self.problem(problem["id"])
+        for pattern in self.catalog.patterns[:PATTERN_CACHE_SIZE]:
+            self.pattern(pattern)
+
+    def problem(self, problem_id: str) -> Optional[CachedJSON]:
+        entry = self.problems.get(problem_id)
+        if entry is None:
+            problem = self.catalog.get(problem_id)
+            if problem is None:
+                return None
+            entry = CachedJSON(encode_problem(problem))
+            self.problems.set(problem_id, entry)
+        return entry
+
+    def pattern(self, pattern: str) -> Optional[CachedJSON]:
+        entry = self.patterns.get(pattern)
+        if entry is None:
+            problems = self.catalog.by_pattern(pattern)
+            if not problems:
+                return None
+            entry = CachedJSON(join_json_array(self._problem_body(p) for p in problems))
+            self.patterns.set(pattern, entry)
+        return entry
+
+    def _problem_body(self, problem: dict) -> bytes:
+        # Reuse an encoded problem if it's cached, without filling the LRU
+        # with every problem of a large pattern
+        entry = self.problems.get(problem["id"])
+        return entry.body if entry is not None else encode_problem(problem)
+
+
+_cache: CatalogResponseCache = None
+
+
+def get_response_cache() -> CatalogResponseCache:
+    """Get the response cache, rebuilding it if the catalog was reloaded"""
+    global _cache
+    catalog = get_catalog()
+    if _cache is None or _cache.version != catalog.version:
+        _cache = CatalogResponseCache(catalog)
+    return _cache
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cached_json_response(request: Request, entry: CachedJSON) -> Response:
+    """
+    Serve a cached payload (as MessagePack if the client prefers it), or a
+    304 if the client already holds it
+    """
+    if wants_msgpack(request):
+        entry = entry.msgpack()
+    headers = {"ETag": entry.etag, "Cache-Control": CATALOG_CACHE_CONTROL, "Vary": "Accept"}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
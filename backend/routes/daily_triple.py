@@ -1,88 +1,91 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from datetime import datetime, timedelta
-import random
+from typing import Optional
 
-from backend.models import DailyTripleResponse, ProblemResponse, DifficultyEnum
-from backend.data.seed_data import LEETCODE_PROBLEMS, get_pattern_problems, get_all_patterns
+from backend.models import DailyTripleResponse, ProblemResponse
+from backend.data.catalog import get_catalog
 from backend.supabase_config import get_supabase
+from backend.response_cache import JSON_MEDIA_TYPE, cached_json_response, get_response_cache
+from backend.daily_triples import TRIPLE_SLOTS, get_daily_triple_ids, get_user_daily_state, pick_daily_triple, user_today
+from backend.encoding import MSGPACK_MEDIA_TYPE, msgpack_map_header, packb, wants_msgpack
 
 router = APIRouter()
 
-def get_user_daily_state(user_id: str) -> dict:
-    """Return a minimal daily state placeholder for now."""
-    return {
-        "user_id": user_id,
-        "last_generated": None,
-    }
+# The body depends on the Accept header (JSON or MessagePack)
+VARY_ACCEPT = {"Vary": "Accept"}
 
-def problem_to_response(problem: dict, problem_id: str) -> ProblemResponse:
-    """Convert problem dict to response model"""
-    return ProblemResponse(
-        id=problem_id,
-        title=problem["title"],
-        leetcode_number=problem["leetcode_number"],
-        difficulty=DifficultyEnum(problem["difficulty"]),
-        pattern=problem["pattern"],
-        description=problem["description"],
-        time_complexity=problem["time_complexity"],
-        space_complexity=problem["space_complexity"],
-        concept_focus=problem["concept_focus"],
-        link=problem["link"]
+async def load_daily_triple(user_id: str, today) -> dict:
+    """Problem ids of the user's triple for `today`, picked on the fly if the store fails"""
+    try:
+        return await get_daily_triple_ids(user_id, today)
+    except Exception as e:
+        # Still serve a triple if the store is unreachable; it just isn't persisted
+        print(f"Error loading daily triple for {user_id}: {e}")
+        state = await get_user_daily_state(user_id, today)
+        review, topic, challenge = pick_daily_triple(get_catalog(), state)
+        return {"review": review["id"], "topic": topic["id"], "challenge": challenge["id"]}
+
+def encode_daily_triple(triple: dict) -> bytes:
+    """Stitch the triple together from the pre-encoded problem payloads"""
+    cache = get_response_cache()
+    return (
+        b'{"review":' + cache.problem(triple["review"]).body
+        + b',"topic":' + cache.problem(triple["topic"]).body
+        + b',"challenge":' + cache.problem(triple["challenge"]).body
+        + b"}"
+    )
+
+def encode_daily_triple_msgpack(triple: dict) -> bytes:
+    """MessagePack counterpart of encode_daily_triple"""
+    cache = get_response_cache()
+    return msgpack_map_header(len(TRIPLE_SLOTS)) + b"".join(
+        packb(slot) + cache.problem(triple[slot]).msgpack().body for slot in TRIPLE_SLOTS
     )
 
 @router.get("/daily-triple/{user_id}", response_model=DailyTripleResponse)
-async def get_daily_triple(user_id: str):
+async def get_daily_triple(user_id: str, request: Request, tz: Optional[str] = None):
     """
     Get the daily triple for a user:
-    - Review: Problem from 3 days ago
+    - Review: Next problem due in the user's spaced-repetition schedule
     - Topic: Problem from current active pattern
     - Challenge: Random hard/medium problem
+    
+    The triple is fixed for the calendar day in `tz` (an IANA timezone name,
+    DAILY_TRIPLE_TIMEZONE by default). Send `Accept: application/msgpack`
+    for a MessagePack body.
     """
     
-    if not LEETCODE_PROBLEMS:
+    catalog = get_catalog()
+    if not catalog.problems:
         raise HTTPException(status_code=500, detail="No problems available")
     
-    state = get_user_daily_state(user_id)
-    
-    # Review: Random Easy problem
-    review_problem = random.choice([p for p in LEETCODE_PROBLEMS if p["difficulty"] == "Easy"])
-    review_id = f"problem_{review_problem['leetcode_number']}"
-    
-    # Topic: Random from the DSA patterns (simulating active pattern)
-    topic_problem = random.choice(LEETCODE_PROBLEMS)
-    topic_id = f"problem_{topic_problem['leetcode_number']}"
-    
-    # Challenge: Random Medium or Hard problem
-    challenge_options = [p for p in LEETCODE_PROBLEMS if p["difficulty"] in ["Medium", "Hard"]]
-    challenge_problem = random.choice(challenge_options) if challenge_options else random.choice(LEETCODE_PROBLEMS)
-    challenge_id = f"problem_{challenge_problem['leetcode_number']}"
+    try:
+        today = user_today(tz)
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone '{tz}'")
     
-    return DailyTripleResponse(
-        review=problem_to_response(review_problem, review_id),
-        topic=problem_to_response(topic_problem, topic_id),
-        challenge=problem_to_response(challenge_problem, challenge_id)
-    )
+    triple = await load_daily_triple(user_id, today)
+    if wants_msgpack(request):
+        return Response(content=encode_daily_triple_msgpack(triple), media_type=MSGPACK_MEDIA_TYPE, headers=VARY_ACCEPT)
+    return Response(content=encode_daily_triple(triple), media_type=JSON_MEDIA_TYPE, headers=VARY_ACCEPT)
 
 @router.get("/problems/pattern/{pattern}", response_model=list[ProblemResponse])
-async def get_problems_by_pattern(pattern: str):
-    """Get all problems for a specific DSA pattern"""
-    problems = get_pattern_problems(pattern)
+async def get_problems_by_pattern(pattern: str, request: Request):
+    """Get all problems for a specific DSA pattern (MessagePack with `Accept: application/msgpack`)"""
+    entry = get_response_cache().pattern(pattern)
     
-    if not problems:
+    if entry is None:
         raise HTTPException(status_code=404, detail=f"Pattern '{pattern}' not found")
     
-    return [
-        problem_to_response(p, f"problem_{p['leetcode_number']}")
-        for p in problems
-    ]
+    return cached_json_response(request, entry)
 
 @router.get("/patterns", response_model=list[str])
-async def get_patterns():
+async def get_patterns(request: Request):
     """Get all available DSA patterns"""
-    return sorted(get_all_patterns())
+    return cached_json_response(request, get_response_cache().pattern_list)
 
 @router.get("/problems/{problem_id}", response_model=ProblemResponse)
-async def get_problem(problem_id: str):
+async def get_problem(problem_id: str, request: Request):
     """Get a specific problem by ID"""
     # Parse problem_id format: "problem_123"
     try:
@@ -90,9 +93,9 @@ async def get_problem(problem_id: str):
     except (IndexError, ValueError):
         raise HTTPException(status_code=400, detail="Invalid problem ID format")
     
-    problem = next((p for p in LEETCODE_PROBLEMS if p["leetcode_number"] == number), None)
+    problem = get_catalog().by_number(number)
     
     if not problem:
         raise HTTPException(status_code=404, detail="Problem not found")
     
-    return problem_to_response(problem, problem_id)
+    return cached_json_response(request, get_response_cache().problem(problem["id"]))
@@ -0,0 +1,70 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import Optional
+import asyncio
+import json
+
+from backend.models import DashboardResponse, DashboardUser
+from backend.data.catalog import get_catalog
+from backend.daily_triples import user_today
+from backend.progress_cache import get_or_create_user, get_submission_stats
+from backend.response_cache import JSON_MEDIA_TYPE, join_json_array
+from backend.routes.daily_triple import encode_daily_triple, load_daily_triple
+from backend.routes.submission import MAX_PAGE_SIZE, fetch_submission_page
+from backend.streaks import streak_summary
+
+router = APIRouter()
+
+DEFAULT_RECENT_SUBMISSIONS = 10
+
+@router.get("/dashboard/{user_id}", response_model=DashboardResponse)
+async def get_dashboard(
+    user_id: str,
+    tz: Optional[str] = None,
+    limit: int = Query(DEFAULT_RECENT_SUBMISSIONS, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Everything the home screen needs in one response: the user's progress and
+    profile, today's triple (in `tz`, as for /daily-triple) and their `limit`
+    most recent submissions. Pass `next_cursor` to /submissions/{user_id} for more.
+    """
+    if not get_catalog().problems:
+        raise HTTPException(status_code=500, detail="No problems available")
+
+    try:
+        today = user_today(tz)
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone '{tz}'")
+
+    # Independent reads run concurrently; the user row and stats are loaded
+    # once and serve both the progress and profile sections
+    try:
+        user, stats, triple, (submissions, next_cursor) = await asyncio.gather(
+            get_or_create_user(user_id),
+            get_submission_stats(user_id),
+            load_daily_triple(user_id, today),
+            fetch_submission_page(user_id, limit),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load dashboard: {str(e)}")
+
+    current_streak, longest_streak = streak_summary(user)
+    summary = DashboardUser(
+        user_id=user["user_id"],
+        username=user.get("username", ""),
+        total_submissions=stats["total_submissions"],
+        problems_solved=stats["problems_solved"],
+        current_streak=current_streak,
+        longest_streak=longest_streak,
+        patterns_mastered=user.get("patterns_mastered") or [],
+        confidence_scores=user.get("confidence_scores") or {},
+    )
+
+    # The triple reuses the pre-encoded problem payloads
+    body = (
+        b'{"user":' + summary.model_dump_json().encode("utf-8")
+        + b',"daily_triple":' + encode_daily_triple(triple)
+        + b',"recent_submissions":' + join_json_array(s.model_dump_json().encode("utf-8") for s in submissions)
+        + b',"next_cursor":' + json.dumps(next_cursor).encode("utf-8")
+        + b"}"
+    )
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
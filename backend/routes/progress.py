@@ -1,62 +1,31 @@
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
+import asyncio
 import uuid
 
-from backend.models import ProgressResponse, UserProfileResponse
-from backend.supabase_config import get_supabase
+from backend.models import ProgressBatchRequest, ProgressOperationType, ProgressResponse, UserProfileResponse
+from backend.progress_cache import get_or_create_user, get_submission_stats, mutate_user_record
+from backend.streaks import streak_summary
 
 router = APIRouter()
 
-def get_or_create_user(user_id: str):
-    """Get or create user profile in Supabase"""
-    try:
-        supabase = get_supabase()
-        # Try to get existing user
-        result = supabase.table("user_progress").select("*").eq("user_id", user_id).execute()
-        
-        if result.data and len(result.data) > 0:
-            return result.data[0]
-        
-        # Create new user if doesn't exist
-        new_user = {
-            "user_id": user_id,
-            "username": f"User_{user_id[:8]}",
-            "total_submissions": 0,
-            "current_streak": 0,
-            "patterns_mastered": [],
-            "confidence_scores": {}
-        }
-        
-        supabase.table("user_progress").insert(new_user).execute()
-        return new_user
-        
-    except Exception as e:
-        print(f"Error in get_or_create_user: {e}")
-        # Return default if error
-        return {
-            "user_id": user_id,
-            "username": f"User_{user_id[:8]}",
-            "total_submissions": 0,
-            "current_streak": 0,
-            "patterns_mastered": [],
-            "confidence_scores": {}
-        }
+MAX_BATCH_OPERATIONS = 200
 
 @router.get("/progress/{user_id}", response_model=ProgressResponse)
 async def get_user_progress(user_id: str):
     """Get user's progress summary"""
     try:
-        supabase = get_supabase()
-        user = get_or_create_user(user_id)
+        user = await get_or_create_user(user_id)
         
         # Count solved problems (unique problems by user)
-        submissions = supabase.table("submissions").select("problem_id").eq("user_id", user_id).eq("passed", True).execute()
+        stats = await get_submission_stats(user_id)
         
-        solved_problems = set(s["problem_id"] for s in submissions.data) if submissions.data else set()
+        current_streak, longest_streak = streak_summary(user)
         
         return ProgressResponse(
-            total_problems_solved=len(solved_problems),
-            streak_days=user.get("current_streak", 0),
+            total_problems_solved=stats["problems_solved"],
+            streak_days=current_streak,
+            longest_streak=longest_streak,
             patterns_mastered=user.get("patterns_mastered", []),
             confidence_scores=user.get("confidence_scores", {})
         )
@@ -67,39 +36,43 @@ async def get_user_progress(user_id: str):
 async def get_user_profile(user_id: str):
     """Get detailed user profile"""
     try:
-        supabase = get_supabase()
-        user = get_or_create_user(user_id)
+        user = await get_or_create_user(user_id)
         
-        submissions = supabase.table("submissions").select("*").eq("user_id", user_id).execute()
+        stats = await get_submission_stats(user_id)
+        
+        current_streak, longest_streak = streak_summary(user)
         
         return UserProfileResponse(
             user_id=user["user_id"],
             username=user.get("username", ""),
             created_at=datetime.now().isoformat(),
-            total_submissions=len(submissions.data) if submissions.data else 0,
-            current_streak=user.get("current_streak", 0)
+            total_submissions=stats["total_submissions"],
+            current_streak=current_streak,
+            longest_streak=longest_streak
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch profile: {str(e)}")
 
 @router.patch("/progress/{user_id}/streak", response_model=ProgressResponse)
 async def update_streak(user_id: str, days: int = 1):
-    """Update user's streak"""
+    """
+    Manually adjust the user's streak. Streaks normally follow submission
+    activity (see backend/streaks.py); this shifts the current run, and
+    raises the longest run if it overtakes it.
+    """
     try:
-        supabase = get_supabase()
-        user = get_or_create_user(user_id)
-        new_streak = max(user.get("current_streak", 0) + days, 0)
-        
-        supabase.table("user_progress").update({
-            "current_streak": new_streak
-        }).eq("user_id", user_id).execute()
+        # Incremented in the database (never below zero), alongside the stats query
+        user, stats = await asyncio.gather(
+            mutate_user_record("increment_streak", {"p_user_id": user_id, "p_days": days}),
+            get_submission_stats(user_id),
+        )
         
-        submissions = supabase.table("submissions").select("problem_id").eq("user_id", user_id).eq("passed", True).execute()
-        solved_problems = set(s["problem_id"] for s in submissions.data) if submissions.data else set()
+        current_streak, longest_streak = streak_summary(user)
         
         return ProgressResponse(
-            total_problems_solved=len(solved_problems),
-            streak_days=new_streak,
+            total_problems_solved=stats["problems_solved"],
+            streak_days=current_streak,
+            longest_streak=longest_streak,
             patterns_mastered=user.get("patterns_mastered", []),
             confidence_scores=user.get("confidence_scores", {})
         )
@@ -110,20 +83,12 @@ async def update_streak(user_id: str, days: int = 1):
 async def mark_pattern_mastered(user_id: str, pattern: str):
     """Mark a pattern as mastered"""
     try:
-        supabase = get_supabase()
-        user = get_or_create_user(user_id)
-        patterns_mastered = user.get("patterns_mastered", [])
-        
-        if pattern not in patterns_mastered:
-            patterns_mastered.append(pattern)
-        
-        supabase.table("user_progress").update({
-            "patterns_mastered": patterns_mastered
-        }).eq("user_id", user_id).execute()
+        # Appended in the database only if absent
+        user = await mutate_user_record("add_mastered_pattern", {"p_user_id": user_id, "p_pattern": pattern})
         
         return {
             "message": f"Pattern '{pattern}' marked as mastered",
-            "patterns_mastered": patterns_mastered
+            "patterns_mastered": user.get("patterns_mastered") or []
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to mark pattern mastered: {str(e)}")
@@ -132,24 +97,63 @@ async def mark_pattern_mastered(user_id: str, pattern: str):
 async def update_confidence(user_id: str, pattern: str, score: float):
     """Update confidence score for a pattern (0-100)"""
     try:
-        supabase = get_supabase()
-        user = get_or_create_user(user_id)
-        
         if score < 0:
             score = 0
         if score > 100:
             score = 100
         
-        confidence_scores = user.get("confidence_scores", {})
-        confidence_scores[pattern] = score
-        
-        supabase.table("user_progress").update({
-            "confidence_scores": confidence_scores
-        }).eq("user_id", user_id).execute()
+        # One jsonb_set in the database; concurrent updates to other patterns are kept
+        user = await mutate_user_record("set_confidence_score", {
+            "p_user_id": user_id,
+            "p_pattern": pattern,
+            "p_score": score
+        })
         
         return {
             "message": f"Confidence score for '{pattern}' updated to {score}",
-            "confidence_scores": confidence_scores
+            "confidence_scores": user.get("confidence_scores") or {}
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update confidence: {str(e)}")
+
+@router.post("/progress/{user_id}/batch", response_model=ProgressResponse)
+async def apply_progress_batch(user_id: str, batch: ProgressBatchRequest):
+    """
+    Apply a session's streak, confidence and mastery updates in order, in one
+    transaction (sql/008_progress_batch.sql), and return the resulting progress
+    """
+    if len(batch.operations) > MAX_BATCH_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_OPERATIONS} operations per batch")
+
+    operations = []
+    for operation in batch.operations:
+        if operation.op == ProgressOperationType.STREAK:
+            operations.append({"op": operation.op.value, "days": operation.days})
+            continue
+        if not operation.pattern:
+            raise HTTPException(status_code=400, detail=f"'{operation.op.value}' requires a pattern")
+        if operation.op == ProgressOperationType.CONFIDENCE:
+            if operation.score is None:
+                raise HTTPException(status_code=400, detail="'confidence' requires a score")
+            score = min(max(operation.score, 0), 100)
+            operations.append({"op": operation.op.value, "pattern": operation.pattern, "score": score})
+        else:
+            operations.append({"op": operation.op.value, "pattern": operation.pattern})
+
+    try:
+        user, stats = await asyncio.gather(
+            mutate_user_record("apply_progress_operations", {"p_user_id": user_id, "p_operations": operations}),
+            get_submission_stats(user_id),
+        )
+        
+        current_streak, longest_streak = streak_summary(user)
+        
+        return ProgressResponse(
+            total_problems_solved=stats["problems_solved"],
+            streak_days=current_streak,
+            longest_streak=longest_streak,
+            patterns_mastered=user.get("patterns_mastered", []),
+            confidence_scores=user.get("confidence_scores", {})
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to apply progress updates: {str(e)}")
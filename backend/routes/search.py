@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Query
+from typing import List, Optional
+
+from backend.models import DifficultyEnum, SearchHit, SearchResponse
+from backend.search import get_search_index
+
+router = APIRouter()
+
+MAX_SEARCH_RESULTS = 100
+
+@router.get("/search", response_model=SearchResponse)
+async def search_problems(
+    q: str = "",
+    difficulty: Optional[List[DifficultyEnum]] = Query(None),
+    pattern: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    offset: int = Query(0, ge=0),
+    prefix: bool = True,
+):
+    """
+    Search problems by title, description and concept focus (BM25 ranked)
+    - difficulty / pattern: facet filters; repeat a parameter to allow several values
+    - prefix: also match the last word as a prefix, for typeahead
+    Facet counts cover the matches, each ignoring its own filter.
+    """
+    result = get_search_index().search(
+        q,
+        difficulties=[d.value for d in difficulty or ()],
+        patterns=pattern or (),
+        limit=limit,
+        offset=offset,
+        prefix=prefix,
+    )
+    
+    return SearchResponse(
+        query=q,
+        total=result["total"],
+        results=[
+            SearchHit(
+                id=problem["id"],
+                title=problem["title"],
+                leetcode_number=problem["leetcode_number"],
+                difficulty=problem["difficulty"],
+                pattern=problem["pattern"],
+                concept_focus=problem["concept_focus"],
+                score=round(score, 4),
+            )
+            for problem, score in result["hits"]
+        ],
+        facets=result["facets"],
+    )
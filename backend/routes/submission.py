@@ -1,89 +1,277 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from datetime import datetime
+from typing import Optional
+import asyncio
+import base64
+import binascii
 import uuid
 
-from backend.models import SubmissionRequest, SubmissionResponse
+from backend.models import SubmissionRequest, SubmissionResponse, JudgeStatusResponse
 from backend.supabase_config import get_supabase
+from backend.db import execute
+from backend.judge import enqueue_submission, ensure_queue_worker, get_judge_queue
+from backend.blobs import store_blobs
+from backend.judge.harness import ACCEPTED
+from backend.encoding import msgpack_response, wants_msgpack
+from backend.progress_cache import invalidate_submission_stats
+from backend.streaks import record_activity
+from backend.daily_triples import user_today
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Only the columns the response model needs; code and strategy stay in blob storage
+SUBMISSION_COLUMNS = ",".join(SubmissionResponse.model_fields)
+
+def encode_cursor(submitted_at: str, submission_id: str) -> str:
+    """Encode the (submitted_at, id) keyset position as an opaque cursor"""
+    return base64.urlsafe_b64encode(f"{submitted_at}|{submission_id}".encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor back into (submitted_at, id); raises ValueError if malformed"""
+    try:
+        submitted_at, submission_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not submitted_at or not submission_id or '"' in submitted_at + submission_id:
+        raise ValueError("Invalid cursor")
+    return submitted_at, submission_id
+
+def submission_page_response(request: Request, response: Response, submissions: list, next_cursor: Optional[str]):
+    """Return the page as JSON (via the response model) or MessagePack, per the Accept header"""
+    headers = {"Vary": "Accept"}
+    if next_cursor:
+        headers[NEXT_CURSOR_HEADER] = next_cursor
+    if wants_msgpack(request):
+        return msgpack_response([s.model_dump(mode="json") for s in submissions], headers=headers)
+    response.headers.update(headers)
+    return submissions
+
+def validate_cursor(cursor: Optional[str]):
+    if cursor is None:
+        return
+    try:
+        decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.post("/submit", response_model=SubmissionResponse)
 async def submit_solution(submission: SubmissionRequest):
     """
     Submit a solution for a problem
-    Stores strategy + code together for review in Supabase
+    Records the submission in Supabase, then queues the code for judging;
+    poll /submit/{submission_id}/status for the verdict
+    
+    Code and strategy go to content-addressed blob storage (read them back
+    with blobs.load_blobs); the submission row only references them by
+    digest, so resubmitting identical code writes nothing but the row itself.
     """
     
+    try:
+        user_today(submission.tz)
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone '{submission.tz}'")
+    
     try:
         supabase = get_supabase()
         submission_id = str(uuid.uuid4())
+        submitted_at = datetime.now()
+        code_digest, strategy_digest = await store_blobs([submission.code, submission.strategy])
         
         # Insert into Supabase submissions table
-        result = supabase.table("submissions").insert({
+        result = await execute(supabase.table("submissions").insert({
             "id": submission_id,
             "problem_id": submission.problem_id,
             "user_id": submission.user_id,
-            "code": submission.code,
-            "strategy": submission.strategy,
+            "code_digest": code_digest,
+            "strategy_digest": strategy_digest,
             "language": submission.language,
-            "submitted_at": datetime.now().isoformat(),
+            "submitted_at": submitted_at.isoformat(),
             "status": "pending",
             "passed": False
-        }).execute()
+        }))
+        
+        try:
+            await enqueue_submission(
+                submission_id, submission.problem_id, submission.code, submission.language,
+                user_id=submission.user_id, tz=submission.tz,
+            )
+        except Exception:
+            # Nothing would ever judge the pending row; drop it so the failed
+            # submit leaves no trace
+            try:
+                await execute(supabase.table("submissions").delete().eq("id", submission_id))
+            except Exception as e:
+                print(f"Error removing unqueued submission {submission_id}: {e}")
+            raise
+        invalidate_submission_stats(submission.user_id)
+        try:
+            await record_activity(submission.user_id, submitted_at)
+        except Exception as e:
+            print(f"Error recording streak activity for {submission.user_id}: {e}")
         
         return SubmissionResponse(
             id=submission_id,
             problem_id=submission.problem_id,
             user_id=submission.user_id,
-            submitted_at=datetime.now(),
+            submitted_at=submitted_at,
             status="pending",
             passed=False
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to submit solution: {str(e)}")
 
-@router.get("/submissions/{user_id}", response_model=list[SubmissionResponse])
-async def get_user_submissions(user_id: str):
-    """Get all submissions for a user"""
+@router.get("/submit/{submission_id}/status", response_model=JudgeStatusResponse)
+async def get_submission_status(submission_id: str):
+    """Poll the judging state of a submission"""
     try:
-        supabase = get_supabase()
-        result = supabase.table("submissions").select("*").eq("user_id", user_id).execute()
-        
-        submissions = result.data if result.data else []
-        
-        return [
-            SubmissionResponse(
-                id=s["id"],
-                problem_id=s["problem_id"],
-                user_id=s["user_id"],
-                submitted_at=datetime.fromisoformat(s["submitted_at"]),
-                status=s["status"],
-                passed=s["passed"]
+        job = await asyncio.to_thread(get_judge_queue().get, submission_id)
+        if job is not None:
+            if job["result"] is None:
+                ensure_queue_worker()
+            result = job["result"] or {}
+            return JudgeStatusResponse(
+                submission_id=submission_id,
+                state=job["state"],
+                status=result.get("status", "pending"),
+                passed=result.get("status") == ACCEPTED,
+                attempts=job["attempts"],
+                result=job["result"],
             )
-            for s in submissions
-        ]
+        
+        # Not in this node's queue (e.g. pruned): fall back to the stored row
+        supabase = get_supabase()
+        row = await execute(supabase.table("submissions").select("id,status,passed,judge_result").eq("id", submission_id))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch submission status: {str(e)}")
+    
+    if not row.data:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    
+    s = row.data[0]
+    return JudgeStatusResponse(
+        submission_id=submission_id,
+        state="done" if s.get("judge_result") else "unknown",
+        status=s["status"],
+        passed=s["passed"],
+        result=s.get("judge_result"),
+    )
+
+async def fetch_submission_page(
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    problem_id: Optional[str] = None,
+    passed: Optional[bool] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Fetch one page of a user's submissions, newest first.
+    Uses keyset pagination on (submitted_at, id) and only selects the
+    columns in SubmissionResponse, so cost scales with the page size.
+    Returns (submissions, next_cursor).
+    """
+    supabase = get_supabase()
+    query = supabase.table("submissions").select(SUBMISSION_COLUMNS).eq("user_id", user_id)
+    
+    if problem_id is not None:
+        query = query.eq("problem_id", problem_id)
+    if passed is not None:
+        query = query.eq("passed", passed)
+    if status is not None:
+        query = query.eq("status", status)
+    if since is not None:
+        query = query.gte("submitted_at", since.isoformat())
+    if until is not None:
+        query = query.lt("submitted_at", until.isoformat())
+    if cursor is not None:
+        submitted_at, last_id = decode_cursor(cursor)
+        query = query.or_(
+            f'submitted_at.lt."{submitted_at}",'
+            f'and(submitted_at.eq."{submitted_at}",id.lt."{last_id}")'
+        )
+    
+    # Fetch one extra row to learn whether another page exists
+    query = query.order("submitted_at", desc=True).order("id", desc=True).limit(limit + 1)
+    result = await execute(query)
+    rows = result.data or []
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["submitted_at"], rows[-1]["id"])
+    
+    submissions = [
+        SubmissionResponse(
+            id=s["id"],
+            problem_id=s["problem_id"],
+            user_id=s["user_id"],
+            submitted_at=datetime.fromisoformat(s["submitted_at"]),
+            status=s["status"],
+            passed=s["passed"]
+        )
+        for s in rows
+    ]
+    return submissions, next_cursor
+
+@router.get("/submissions/{user_id}", response_model=list[SubmissionResponse])
+async def get_user_submissions(
+    user_id: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    passed: Optional[bool] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Get a page of submissions for a user (newest first).
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
+    Send `Accept: application/msgpack` for a MessagePack body.
+    """
+    validate_cursor(cursor)
+    try:
+        submissions, next_cursor = await fetch_submission_page(
+            user_id, limit, cursor,
+            passed=passed, status=status, since=since, until=until,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch submissions: {str(e)}")
+    
+    return submission_page_response(request, response, submissions, next_cursor)
 
 @router.get("/submissions/{user_id}/{problem_id}", response_model=list[SubmissionResponse])
-async def get_problem_submissions(user_id: str, problem_id: str):
-    """Get all submissions for a specific problem by a user"""
+async def get_problem_submissions(
+    user_id: str,
+    problem_id: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    passed: Optional[bool] = None,
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Get a page of submissions for a specific problem by a user (newest first).
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
+    Send `Accept: application/msgpack` for a MessagePack body.
+    """
+    validate_cursor(cursor)
     try:
-        supabase = get_supabase()
-        result = supabase.table("submissions").select("*").eq("user_id", user_id).eq("problem_id", problem_id).execute()
-        
-        submissions = result.data if result.data else []
-        
-        return [
-            SubmissionResponse(
-                id=s["id"],
-                problem_id=s["problem_id"],
-                user_id=s["user_id"],
-                submitted_at=datetime.fromisoformat(s["submitted_at"]),
-                status=s["status"],
-                passed=s["passed"]
-            )
-            for s in submissions
-        ]
+        submissions, next_cursor = await fetch_submission_page(
+            user_id, limit, cursor, problem_id=problem_id,
+            passed=passed, status=status, since=since, until=until,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch submissions: {str(e)}")
+    
+    return submission_page_response(request, response, submissions, next_cursor)
@@ -0,0 +1,177 @@
+"""
+Problem Search
+In-memory inverted index over the catalog's title, description and
+concept_focus, ranked with BM25. Title and concept matches count more
+than description matches (field weights fold into the term frequency).
+Every (term, problem) BM25 contribution depends only on the catalog, so
+postings store final impacts and a query just sums them.
+
+The last query token also matches as a prefix, for typeahead. Results can
+be filtered by difficulty and pattern facets. Facet counts are precomputed
+for the unfiltered catalog; for a query, each facet is counted over the
+matches with only the other facet's filter applied, so the counts show
+what selecting a value would return.
+"""
+
+import heapq
+import itertools
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.data.catalog import ProblemCatalog, get_catalog
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+FIELD_WEIGHTS = {"title": 3.0, "concept_focus": 2.0, "description": 1.0}
+# Vocabulary terms a typeahead prefix may expand to
+MAX_PREFIX_EXPANSIONS = 64
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset((
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in", "is", "it",
+    "of", "on", "or", "that", "the", "to", "with", "you", "your",
+))
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+class SearchIndex:
+    """BM25 index and facet tables for one catalog version"""
+
+    __slots__ = (
+        "version",
+        "_problems",
+        "_postings",
+        "_terms",
+        "_difficulty_of",
+        "_pattern_of",
+        "_facet_counts",
+    )
+
+    def __init__(self, catalog: ProblemCatalog):
+        self.version = catalog.version
+        # Docs are catalog indexes; a mapped catalog decodes hits on access
+        self._problems = catalog.problems
+
+        frequencies: List[Counter] = []
+        lengths: List[float] = []
+        for problem in self._problems:
+            counts = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(problem.get(field) or ""):
+                    counts[token] += weight
+            frequencies.append(counts)
+            lengths.append(sum(counts.values()))
+
+        n = len(self._problems)
+        average_length = (sum(lengths) / n) if n else 0.0
+        document_frequency = Counter(term for counts in frequencies for term in counts)
+
+        idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in document_frequency.items()}
+
+        postings: Dict[str, List[Tuple[int, float]]] = {term: [] for term in idf}
+        for doc, counts in enumerate(frequencies):
+            norm = K1 * (1 - B + B * lengths[doc] / average_length) if average_length else K1
+            for term, tf in counts.items():
+                postings[term].append((doc, idf[term] * tf * (K1 + 1) / (tf + norm)))
+
+        self._postings = {term: tuple(entries) for term, entries in postings.items()}
+        self._terms = sorted(self._postings)
+        self._difficulty_of = [problem["difficulty"] for problem in self._problems]
+        self._pattern_of = [problem["pattern"] for problem in self._problems]
+        self._facet_counts = {
+            "difficulty": dict(Counter(self._difficulty_of)),
+            "pattern": dict(Counter(self._pattern_of)),
+        }
+
+    def prefix_terms(self, prefix: str) -> List[str]:
+        """The first MAX_PREFIX_EXPANSIONS vocabulary terms starting with `prefix`, shortest first"""
+        terms = self._terms
+        following = map(terms.__getitem__, range(bisect_left(terms, prefix), len(terms)))
+        matches = itertools.takewhile(lambda term: term.startswith(prefix), following)
+        return sorted(itertools.islice(matches, MAX_PREFIX_EXPANSIONS), key=len)
+
+    def _scores(self, query: str, prefix: bool) -> Optional[Dict[int, float]]:
+        """Doc -> score for a query, or None for an empty query (everything matches)"""
+        tokens = tokenize(query)
+        if not tokens:
+            return None
+
+        scores: Dict[int, float] = {}
+        exact = tokens[:-1] if prefix else tokens
+        for token in exact:
+            for doc, impact in self._postings.get(token, ()):
+                scores[doc] = scores.get(doc, 0.0) + impact
+
+        if prefix:
+            # A partially typed word scores as its best-matching completion
+            best: Dict[int, float] = {}
+            for term in self.prefix_terms(tokens[-1]):
+                for doc, impact in self._postings[term]:
+                    if impact > best.get(doc, 0.0):
+                        best[doc] = impact
+            for doc, impact in best.items():
+                scores[doc] = scores.get(doc, 0.0) + impact
+        return scores
+
+    def search(
+        self,
+        query: str = "",
+        difficulties: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        limit: int = 20,
+        offset: int = 0,
+        prefix: bool = True,
+    ) -> dict:
+        """
+        Ranked, filtered matches for a query. Returns {"total", "hits",
+        "facets"}; hits are (problem, score) pairs.
+        """
+        difficulties = frozenset(difficulties)
+        patterns = frozenset(patterns)
+        scores = self._scores(query, prefix)
+
+        if scores is None and not difficulties and not patterns:
+            total = len(self._problems)
+            hits = [(problem, 0.0) for problem in self._problems[offset:offset + limit]]
+            return {"total": total, "hits": hits, "facets": self._facet_counts}
+
+        difficulty_of = self._difficulty_of
+        pattern_of = self._pattern_of
+        candidates = range(len(self._problems)) if scores is None else list(scores)
+
+        # Each facet is counted with only the other facet's filter applied
+        by_pattern = [doc for doc in candidates if pattern_of[doc] in patterns] if patterns else candidates
+        by_difficulty = [doc for doc in candidates if difficulty_of[doc] in difficulties] if difficulties else candidates
+        difficulty_counts = Counter(map(difficulty_of.__getitem__, by_pattern))
+        pattern_counts = Counter(map(pattern_of.__getitem__, by_difficulty))
+        matches = [doc for doc in by_pattern if difficulty_of[doc] in difficulties] if difficulties else by_pattern
+
+        if scores is None:
+            ranked = matches[offset:offset + limit]
+        else:
+            ranked = heapq.nlargest(offset + limit, matches, key=scores.__getitem__)[offset:]
+
+        return {
+            "total": len(matches),
+            "hits": [(self._problems[doc], 0.0 if scores is None else scores[doc]) for doc in ranked],
+            "facets": {"difficulty": dict(difficulty_counts), "pattern": dict(pattern_counts)},
+        }
+
+
+_index: SearchIndex = None
+
+
+def get_search_index() -> SearchIndex:
+    """Get the search index, rebuilding it if the catalog was reloaded"""
+    global _index
+    catalog = get_catalog()
+    if _index is None or _index.version != catalog.version:
+        _index = SearchIndex(catalog)
+    return _index
@@ -2,57 +2,157 @@
 """
 Seed LeetCode problems to Supabase database
 Run this script to populate the problems table with seed data
+
+Seeding is idempotent: every problem carries a content hash, the local
+catalog is diffed against the hashes already stored, and only new or
+changed rows are upserted, in batches.
+
+Usage:
+    python seed.py [--batch-size 500] [--concurrency 4] [--dry-run]
 """
 
+import argparse
+import hashlib
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from supabase_config import get_supabase
 from data.seed_data import LEETCODE_PROBLEMS
 
 load_dotenv()
 
-def seed_problems():
+PROBLEM_FIELDS = (
+    "title",
+    "leetcode_number",
+    "difficulty",
+    "pattern",
+    "description",
+    "time_complexity",
+    "space_complexity",
+    "concept_focus",
+    "link",
+)
+
+# PostgREST caps rows per response, so existing hashes are read in pages
+FETCH_PAGE_SIZE = 1000
+
+
+def content_hash(doc: dict) -> str:
+    """Stable hash of a problem's seeded fields"""
+    canonical = json.dumps({k: doc[k] for k in ("id",) + PROBLEM_FIELDS}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def build_problem_docs() -> list:
+    """Rows for the problems table, each with its content hash"""
+    docs = []
+    for problem in LEETCODE_PROBLEMS:
+        doc = {"id": f"problem_{problem['leetcode_number']}"}
+        doc.update({field: problem[field] for field in PROBLEM_FIELDS})
+        doc["content_hash"] = content_hash(doc)
+        docs.append(doc)
+    return docs
+
+
+def fetch_existing_hashes(supabase) -> dict:
+    """Map of problem id -> content hash for every row already in the table"""
+    existing = {}
+    start = 0
+    while True:
+        result = (
+            supabase.table("problems").select("id,content_hash")
+            .order("id").range(start, start + FETCH_PAGE_SIZE - 1).execute()
+        )
+        rows = result.data or []
+        existing.update((row["id"], row.get("content_hash")) for row in rows)
+        if len(rows) < FETCH_PAGE_SIZE:
+            return existing
+        start += FETCH_PAGE_SIZE
+
+
+def diff_problems(docs: list, existing: dict) -> dict:
+    """Split local docs into new, changed and unchanged against the stored hashes"""
+    plan = {"new": [], "changed": [], "unchanged": []}
+    for doc in docs:
+        if doc["id"] not in existing:
+            plan["new"].append(doc)
+        elif existing[doc["id"]] != doc["content_hash"]:
+            plan["changed"].append(doc)
+        else:
+            plan["unchanged"].append(doc)
+    return plan
+
+
+def upsert_batches(supabase, docs: list, batch_size: int, concurrency: int) -> int:
+    """Upsert docs in batches, optionally in parallel; returns rows written"""
+    batches = [docs[i:i + batch_size] for i in range(0, len(docs), batch_size)]
+
+    def write(batch):
+        supabase.table("problems").upsert(batch, on_conflict="id", returning="minimal").execute()
+        return len(batch)
+
+    if concurrency <= 1 or len(batches) <= 1:
+        return sum(write(batch) for batch in batches)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return sum(pool.map(write, batches))
+
+
+def print_report(plan: dict, dry_run: bool):
+    prefix = "🔎 Dry run - would seed" if dry_run else "🌱 Seeding"
+    print(
+        f"{prefix}: {len(plan['new'])} new, {len(plan['changed'])} changed, "
+        f"{len(plan['unchanged'])} unchanged"
+    )
+    for label, icon in (("new", "➕"), ("changed", "✏️ ")):
+        for doc in plan[label][:20]:
+            print(f"  {icon} {doc['id']}: {doc['title']}")
+        if len(plan[label]) > 20:
+            print(f"  ... and {len(plan[label]) - 20} more {label}")
+
+
+def seed_problems(batch_size: int = 500, concurrency: int = 1, dry_run: bool = False):
     """Seed problems to Supabase"""
     supabase = get_supabase()
-    
-    print(f"🌱 Seeding {len(LEETCODE_PROBLEMS)} LeetCode problems to Supabase...")
-    
+    docs = build_problem_docs()
+
+    print(f"🌱 Diffing {len(docs)} LeetCode problems against Supabase...")
+
     try:
-        # First, clear existing problems (optional - comment out to keep existing)
-        # supabase.table("problems").delete().neq("id", "").execute()
-        
-        # Insert all problems
-        for problem in LEETCODE_PROBLEMS:
-            problem_doc = {
-                "id": f"problem_{problem['leetcode_number']}",
-                "title": problem["title"],
-                "leetcode_number": problem["leetcode_number"],
-                "difficulty": problem["difficulty"],
-                "pattern": problem["pattern"],
-                "description": problem["description"],
-                "time_complexity": problem["time_complexity"],
-                "space_complexity": problem["space_complexity"],
-                "concept_focus": problem["concept_focus"],
-                "link": problem["link"]
-            }
-            
-            try:
-                # Try to insert (ignore if already exists)
-                supabase.table("problems").insert(problem_doc).execute()
-                print(f"✅ Seeded: {problem['title']}")
-            except Exception as e:
-                if "duplicate" in str(e).lower():
-                    print(f"⏭️  Already exists: {problem['title']}")
-                else:
-                    print(f"⚠️  Error seeding {problem['title']}: {str(e)}")
-        
-        print("\n✅ Seeding complete!")
-        print(f"📊 Total problems in database: {len(LEETCODE_PROBLEMS)}")
-        
+        existing = fetch_existing_hashes(supabase)
     except Exception as e:
         print(f"❌ Error connecting to Supabase: {str(e)}")
         print("Make sure your .env file has valid SUPABASE_URL and SUPABASE_KEY")
+        print("and that sql/006_problem_content_hash.sql has been applied")
         sys.exit(1)
 
+    plan = diff_problems(docs, existing)
+    print_report(plan, dry_run)
+
+    pending = plan["new"] + plan["changed"]
+    if dry_run or not pending:
+        print("\n✅ Nothing written" if dry_run else "\n✅ Already up to date")
+        return plan
+
+    try:
+        written = upsert_batches(supabase, pending, batch_size, concurrency)
+    except Exception as e:
+        print(f"⚠️  Error seeding problems: {str(e)}")
+        sys.exit(1)
+
+    print("\n✅ Seeding complete!")
+    print(f"📊 Rows written: {written}, total problems in catalog: {len(docs)}")
+    return plan
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed LeetCode problems to Supabase")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per upsert request")
+    parser.add_argument("--concurrency", type=int, default=1, help="Upsert requests in flight at once")
+    parser.add_argument("--dry-run", action="store_true", help="Report the diff without writing")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    seed_problems()
+    args = parse_args()
+    seed_problems(batch_size=max(args.batch_size, 1), concurrency=max(args.concurrency, 1), dry_run=args.dry_run)
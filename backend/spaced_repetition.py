@@ -0,0 +1,111 @@
+"""
+Spaced Repetition Scheduler
+SM-2 review intervals per (user, problem), driven by judge outcomes and the
+user's confidence in the problem's pattern. Schedules live in the
+review_schedule table (sql/004_review_schedule.sql), indexed on
+(user_id, due_on) so the next due review is a single indexed query.
+
+Each review is applied by one RPC (sql/012_review_updates.sql) that locks
+the row, so concurrent attempts on the same problem don't overwrite each
+other. Review days are calendar days in the user's timezone, the same
+day boundary the Daily Triple uses to pick the review slot.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from backend.data.catalog import get_catalog
+from backend.db import execute
+from backend.progress_cache import get_or_create_user
+from backend.supabase_config import get_supabase
+
+MIN_EASE_FACTOR = 1.3
+DEFAULT_EASE_FACTOR = 2.5
+# The Daily Triple design reviews a newly solved problem 3 days later
+FIRST_INTERVAL_DAYS = 3
+SECOND_INTERVAL_DAYS = 7
+
+
+@dataclass(frozen=True)
+class ReviewState:
+    repetitions: int = 0
+    interval_days: int = 0
+    ease_factor: float = DEFAULT_EASE_FACTOR
+    due_on: Optional[date] = None
+    last_reviewed_on: Optional[date] = None
+
+    @classmethod
+    def from_row(cls, row: dict) -> "ReviewState":
+        return cls(
+            repetitions=row["repetitions"],
+            interval_days=row["interval_days"],
+            ease_factor=row["ease_factor"],
+            due_on=date.fromisoformat(row["due_on"]) if row.get("due_on") else None,
+            last_reviewed_on=date.fromisoformat(row["last_reviewed_on"]) if row.get("last_reviewed_on") else None,
+        )
+
+
+def review_quality(passed: bool, confidence: Optional[float] = None, pass_ratio: float = 0.0) -> int:
+    """
+    Map a judged attempt to an SM-2 quality grade (0-5).
+    Passing grades 3-5 scale with pattern confidence (0-100); failing
+    grades are 2 for a near miss and 1 otherwise.
+    """
+    if not passed:
+        return 2 if pass_ratio >= 0.5 else 1
+    if confidence is None:
+        return 4
+    confidence = min(max(confidence, 0), 100)
+    return 3 + round(2 * confidence / 100)
+
+
+async def record_review(user_id: str, problem_id: str, quality: int, today: date) -> ReviewState:
+    """Apply a review outcome to the stored schedule for (user, problem)"""
+    supabase = get_supabase()
+    result = await execute(supabase.rpc("record_review", {
+        "p_user_id": user_id,
+        "p_problem_id": problem_id,
+        "p_quality": quality,
+        "p_today": today.isoformat(),
+        "p_first_interval_days": FIRST_INTERVAL_DAYS,
+        "p_second_interval_days": SECOND_INTERVAL_DAYS,
+        "p_default_ease_factor": DEFAULT_EASE_FACTOR,
+        "p_min_ease_factor": MIN_EASE_FACTOR,
+    }))
+    return ReviewState.from_row(result.data[0])
+
+
+async def next_due_review(user_id: str, today: date) -> Optional[str]:
+    """Problem id of the most overdue review for a user, if any is due"""
+    supabase = get_supabase()
+    result = await execute(
+        supabase.table("review_schedule").select("problem_id")
+        .eq("user_id", user_id).lte("due_on", today.isoformat())
+        .order("due_on").order("problem_id").limit(1)
+    )
+    return result.data[0]["problem_id"] if result.data else None
+
+
+async def record_judged_attempt(user_id: str, problem_id: str, result: dict, today: date = None) -> ReviewState:
+    """
+    Update the review schedule from a judge result and the user's pattern
+    confidence. `today` defaults to the current day in DAILY_TRIPLE_TIMEZONE.
+    """
+    # Imported here: the judge package imports this module, and daily_triples imports it
+    from backend.daily_triples import user_today
+    from backend.judge.harness import ACCEPTED
+
+    problem = get_catalog().get(problem_id)
+    confidence = None
+    if problem is not None:
+        progress = await get_or_create_user(user_id)
+        confidence = (progress.get("confidence_scores") or {}).get(problem["pattern"])
+
+    total = result.get("total_cases") or 0
+    quality = review_quality(
+        result.get("status") == ACCEPTED,
+        confidence,
+        pass_ratio=(result.get("passed_cases") or 0) / total if total else 0.0,
+    )
+    return await record_review(user_id, problem_id, quality, today or user_today())
@@ -0,0 +1,18 @@
+-- Per-user submission aggregates computed inside Postgres.
+-- /progress and /profile call this RPC instead of downloading every
+-- submission row, so the response is one row regardless of history size.
+
+create index if not exists submissions_user_passed_problem_idx
+    on submissions (user_id, passed, problem_id);
+
+create or replace function user_submission_stats(p_user_id text)
+returns table (total_submissions bigint, problems_solved bigint)
+language sql
+stable
+as $$
+    select
+        count(*) as total_submissions,
+        count(distinct problem_id) filter (where passed) as problems_solved
+    from submissions
+    where user_id = p_user_id;
+$$;
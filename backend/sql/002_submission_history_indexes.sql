@@ -0,0 +1,9 @@
+-- Keyset pagination indexes for the submission history endpoints.
+-- Both match the (submitted_at desc, id desc) order used by
+-- GET /api/submissions/{user_id} and /api/submissions/{user_id}/{problem_id}.
+
+create index if not exists submissions_user_history_idx
+    on submissions (user_id, submitted_at desc, id desc);
+
+create index if not exists submissions_user_problem_history_idx
+    on submissions (user_id, problem_id, submitted_at desc, id desc);
@@ -0,0 +1,5 @@
+-- Columns written by the judge once a submission has been evaluated.
+-- status/passed already exist; judge_result keeps the per-case detail.
+
+alter table submissions add column if not exists judge_result jsonb;
+alter table submissions add column if not exists judged_at timestamptz;
@@ -0,0 +1,16 @@
+-- SM-2 spaced-repetition state per (user, problem).
+-- The (user_id, due_on) index makes "next due review" a single index probe.
+
+create table if not exists review_schedule (
+    user_id text not null,
+    problem_id text not null,
+    repetitions integer not null default 0,
+    interval_days integer not null default 0,
+    ease_factor real not null default 2.5,
+    due_on date,
+    last_reviewed_on date,
+    primary key (user_id, problem_id)
+);
+
+create index if not exists review_schedule_due_idx
+    on review_schedule (user_id, due_on, problem_id);
@@ -0,0 +1,41 @@
+-- One materialized Daily Triple per user per calendar day.
+
+create table if not exists daily_triples (
+    user_id text not null,
+    triple_date date not null,
+    review_id text not null,
+    topic_id text not null,
+    challenge_id text not null,
+    generated_at timestamptz not null default now(),
+    primary key (user_id, triple_date)
+);
+
+-- One row per day whose pre-generation job has been claimed; the worker
+-- whose insert creates it runs the job, every other worker skips the day.
+create table if not exists daily_triple_runs (
+    run_date date primary key,
+    claimed_by text not null,
+    claimed_at timestamptz not null default now()
+);
+
+-- Users with at least one submission since p_since; drives the
+-- just-after-midnight pre-generation job. Paged by user_id (keyset):
+-- pass the last user_id of the previous page as p_after, since PostgREST
+-- caps each response at its max-rows setting.
+create index if not exists submissions_submitted_at_user_idx
+    on submissions (submitted_at, user_id);
+
+drop function if exists active_users(timestamptz);
+
+create or replace function active_users(p_since timestamptz, p_after text default null, p_limit integer default 1000)
+returns table (user_id text)
+language sql
+stable
+as $$
+    select distinct s.user_id
+    from submissions s
+    where s.submitted_at >= p_since
+      and (p_after is null or s.user_id > p_after)
+    order by s.user_id
+    limit p_limit;
+$$;
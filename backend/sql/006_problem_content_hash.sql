@@ -0,0 +1,4 @@
+-- Content hash per problem row; seed.py diffs against it and only
+-- upserts problems whose seeded fields changed.
+
+alter table problems add column if not exists content_hash text;
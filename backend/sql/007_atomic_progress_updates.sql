@@ -0,0 +1,52 @@
+-- Single-statement updates for the streak, confidence and mastery endpoints.
+-- Each function creates the user_progress row if it is missing, applies the
+-- change inside Postgres and returns the updated row, so an update is one
+-- round trip and concurrent updates can't overwrite each other.
+
+create or replace function increment_streak(p_user_id text, p_days integer default 1)
+returns setof user_progress
+language sql
+volatile
+as $$
+    insert into user_progress (user_id, username, total_submissions, current_streak, patterns_mastered, confidence_scores)
+    values (p_user_id, 'User_' || left(p_user_id, 8), 0, greatest(p_days, 0), '[]'::jsonb, '{}'::jsonb)
+    on conflict (user_id) do update
+        set current_streak = greatest(coalesce(user_progress.current_streak, 0) + p_days, 0)
+    returning *;
+$$;
+
+create or replace function set_confidence_score(p_user_id text, p_pattern text, p_score double precision)
+returns setof user_progress
+language sql
+volatile
+as $$
+    insert into user_progress (user_id, username, total_submissions, current_streak, patterns_mastered, confidence_scores)
+    values (
+        p_user_id, 'User_' || left(p_user_id, 8), 0, 0, '[]'::jsonb,
+        jsonb_build_object(p_pattern, least(greatest(p_score, 0), 100))
+    )
+    on conflict (user_id) do update
+        set confidence_scores = jsonb_set(
+            coalesce(user_progress.confidence_scores, '{}'::jsonb),
+            array[p_pattern],
+            to_jsonb(least(greatest(p_score, 0), 100)),
+            true
+        )
+    returning *;
+$$;
+
+create or replace function add_mastered_pattern(p_user_id text, p_pattern text)
+returns setof user_progress
+language sql
+volatile
+as $$
+    insert into user_progress (user_id, username, total_submissions, current_streak, patterns_mastered, confidence_scores)
+    values (p_user_id, 'User_' || left(p_user_id, 8), 0, 0, jsonb_build_array(p_pattern), '{}'::jsonb)
+    on conflict (user_id) do update
+        set patterns_mastered = case
+            when coalesce(user_progress.patterns_mastered, '[]'::jsonb) ? p_pattern
+                then user_progress.patterns_mastered
+            else coalesce(user_progress.patterns_mastered, '[]'::jsonb) || jsonb_build_array(p_pattern)
+        end
+    returning *;
+$$;
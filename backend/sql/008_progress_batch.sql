@@ -0,0 +1,54 @@
+-- Apply a practice session's progress updates in one transaction.
+-- p_operations is a JSON array of {"op": "streak", "days": n},
+-- {"op": "confidence", "pattern": p, "score": s} and
+-- {"op": "pattern_mastered", "pattern": p}, applied in order to one locked
+-- read of the user's row and written back with a single update.
+
+create or replace function apply_progress_operations(p_user_id text, p_operations jsonb)
+returns setof user_progress
+language plpgsql
+volatile
+as $$
+declare
+    v_row user_progress;
+    v_op jsonb;
+    v_streak integer;
+    v_mastered jsonb;
+    v_scores jsonb;
+begin
+    insert into user_progress (user_id, username, total_submissions, current_streak, patterns_mastered, confidence_scores)
+    values (p_user_id, 'User_' || left(p_user_id, 8), 0, 0, '[]'::jsonb, '{}'::jsonb)
+    on conflict (user_id) do nothing;
+
+    select * into v_row from user_progress where user_id = p_user_id for update;
+    v_streak := coalesce(v_row.current_streak, 0);
+    v_mastered := coalesce(v_row.patterns_mastered, '[]'::jsonb);
+    v_scores := coalesce(v_row.confidence_scores, '{}'::jsonb);
+
+    for v_op in select value from jsonb_array_elements(p_operations) loop
+        case v_op->>'op'
+            when 'streak' then
+                v_streak := greatest(v_streak + coalesce((v_op->>'days')::integer, 1), 0);
+            when 'confidence' then
+                v_scores := jsonb_set(
+                    v_scores,
+                    array[v_op->>'pattern'],
+                    to_jsonb(least(greatest((v_op->>'score')::double precision, 0), 100)),
+                    true
+                );
+            when 'pattern_mastered' then
+                if not v_mastered ? (v_op->>'pattern') then
+                    v_mastered := v_mastered || jsonb_build_array(v_op->>'pattern');
+                end if;
+            else
+                raise exception 'unknown progress operation: %', v_op->>'op';
+        end case;
+    end loop;
+
+    return query
+        update user_progress
+        set current_streak = v_streak, patterns_mastered = v_mastered, confidence_scores = v_scores
+        where user_id = p_user_id
+        returning *;
+end;
+$$;
@@ -0,0 +1,88 @@
+-- Streaks derived from submission activity.
+-- user_progress keeps a run-length summary of each user's active days: the
+-- last active day, the length of the run of consecutive days ending there
+-- (current_streak) and the longest run seen. A submission updates it in
+-- O(1) and reads never scan submissions.
+
+alter table user_progress add column if not exists longest_streak integer not null default 0;
+alter table user_progress add column if not exists last_active_on date;
+
+-- Manual adjustments (increment_streak, apply_progress_operations) only
+-- move current_streak; every write keeps longest_streak at least as long.
+create or replace function keep_longest_streak()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.longest_streak := greatest(coalesce(new.longest_streak, 0), coalesce(new.current_streak, 0));
+    return new;
+end;
+$$;
+
+drop trigger if exists user_progress_longest_streak on user_progress;
+create trigger user_progress_longest_streak
+    before insert or update of current_streak, longest_streak on user_progress
+    for each row execute function keep_longest_streak();
+
+update user_progress set longest_streak = current_streak where longest_streak < current_streak;
+
+-- Record activity on p_day (the submission's calendar day). Days at or
+-- before last_active_on are already counted; the backfill
+-- (python -m backend.backfill_streaks) handles out-of-order history.
+create or replace function record_activity_day(p_user_id text, p_day date)
+returns setof user_progress
+language sql
+volatile
+as $$
+    insert into user_progress (
+        user_id, username, total_submissions, current_streak, longest_streak, last_active_on,
+        patterns_mastered, confidence_scores
+    )
+    values (p_user_id, 'User_' || left(p_user_id, 8), 0, 1, 1, p_day, '[]'::jsonb, '{}'::jsonb)
+    on conflict (user_id) do update
+        set current_streak = case
+                when user_progress.last_active_on is null or p_day > user_progress.last_active_on + 1 then 1
+                when p_day = user_progress.last_active_on + 1 then user_progress.current_streak + 1
+                else user_progress.current_streak
+            end,
+            longest_streak = greatest(
+                user_progress.longest_streak,
+                case
+                    when user_progress.last_active_on is null or p_day > user_progress.last_active_on + 1 then 1
+                    when p_day = user_progress.last_active_on + 1 then user_progress.current_streak + 1
+                    else user_progress.current_streak
+                end
+            ),
+            last_active_on = greatest(user_progress.last_active_on, p_day)
+    returning *;
+$$;
+
+-- Overwrite streak summaries rebuilt by the backfill. p_rows is a JSON
+-- array of {user_id, current_streak, longest_streak, last_active_on};
+-- other user_progress columns are left alone.
+create or replace function apply_streak_backfill(p_rows jsonb)
+returns integer
+language sql
+volatile
+as $$
+    with rows as (
+        select *
+        from jsonb_to_recordset(p_rows)
+            as r(user_id text, current_streak integer, longest_streak integer, last_active_on date)
+    ),
+    upserted as (
+        insert into user_progress (
+            user_id, username, total_submissions, current_streak, longest_streak, last_active_on,
+            patterns_mastered, confidence_scores
+        )
+        select user_id, 'User_' || left(user_id, 8), 0, current_streak, longest_streak, last_active_on,
+               '[]'::jsonb, '{}'::jsonb
+        from rows
+        on conflict (user_id) do update
+            set current_streak = excluded.current_streak,
+                longest_streak = excluded.longest_streak,
+                last_active_on = excluded.last_active_on
+        returning 1
+    )
+    select count(*)::integer from upserted;
+$$;
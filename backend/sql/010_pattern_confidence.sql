@@ -0,0 +1,107 @@
+-- Per-pattern confidence computed from judged submissions (backend/analytics.py).
+-- pattern_confidence keeps, per (user, pattern), the decayed sums the model
+-- needs: evidence = sum(weight * outcome) and weight = sum(weight), both as of
+-- as_of. Exponential decay lets a new attempt be folded in without
+-- rereading history. The resulting score is written into
+-- user_progress.confidence_scores, which is all the dashboard reads.
+
+create table if not exists pattern_confidence (
+    user_id text not null,
+    pattern text not null,
+    evidence double precision not null default 0,
+    weight double precision not null default 0,
+    as_of timestamptz not null default now(),
+    primary key (user_id, pattern)
+);
+
+-- Fold one judged attempt into (user, pattern) and refresh the user's
+-- confidence score and mastered patterns. Returns the user_progress row.
+create or replace function record_pattern_outcome(
+    p_user_id text,
+    p_pattern text,
+    p_outcome double precision,
+    p_weight double precision,
+    p_at timestamptz,
+    p_half_life_days double precision,
+    p_prior_weight double precision,
+    p_mastery_threshold double precision
+)
+returns setof user_progress
+language plpgsql
+volatile
+as $$
+declare
+    v_evidence double precision;
+    v_weight double precision;
+    v_confidence double precision;
+begin
+    insert into pattern_confidence as pc (user_id, pattern, evidence, weight, as_of)
+    values (p_user_id, p_pattern, p_weight * p_outcome, p_weight, p_at)
+    on conflict (user_id, pattern) do update
+        set evidence = pc.evidence * power(0.5, greatest(extract(epoch from p_at - pc.as_of) / 86400, 0) / p_half_life_days)
+                + p_weight * p_outcome,
+            weight = pc.weight * power(0.5, greatest(extract(epoch from p_at - pc.as_of) / 86400, 0) / p_half_life_days)
+                + p_weight,
+            as_of = greatest(pc.as_of, p_at)
+    returning evidence, weight into v_evidence, v_weight;
+
+    v_confidence := round((100 * v_evidence / (v_weight + p_prior_weight))::numeric, 1);
+
+    insert into user_progress (user_id, username, total_submissions, current_streak, patterns_mastered, confidence_scores)
+    values (p_user_id, 'User_' || left(p_user_id, 8), 0, 0, '[]'::jsonb, '{}'::jsonb)
+    on conflict (user_id) do nothing;
+
+    return query
+        update user_progress
+        set confidence_scores = jsonb_set(
+                coalesce(confidence_scores, '{}'::jsonb), array[p_pattern], to_jsonb(v_confidence), true
+            ),
+            patterns_mastered = case
+                when v_confidence >= p_mastery_threshold
+                     and not coalesce(patterns_mastered, '[]'::jsonb) ? p_pattern
+                    then coalesce(patterns_mastered, '[]'::jsonb) || jsonb_build_array(p_pattern)
+                else patterns_mastered
+            end
+        where user_id = p_user_id
+        returning *;
+end;
+$$;
+
+-- Store a batch of recomputed sums and scores from the nightly job.
+-- p_stats: [{user_id, pattern, evidence, weight, as_of}]
+-- p_users: [{user_id, confidence_scores, mastered}]; computed scores replace
+-- the stored ones per pattern and newly mastered patterns are appended.
+create or replace function apply_confidence_batch(p_stats jsonb, p_users jsonb)
+returns integer
+language plpgsql
+volatile
+as $$
+declare
+    v_count integer;
+begin
+    insert into pattern_confidence (user_id, pattern, evidence, weight, as_of)
+    select user_id, pattern, evidence, weight, as_of
+    from jsonb_to_recordset(p_stats)
+        as s(user_id text, pattern text, evidence double precision, weight double precision, as_of timestamptz)
+    on conflict (user_id, pattern) do update
+        set evidence = excluded.evidence, weight = excluded.weight, as_of = excluded.as_of;
+
+    insert into user_progress (user_id, username, total_submissions, current_streak, patterns_mastered, confidence_scores)
+    select user_id, 'User_' || left(user_id, 8), 0, 0, '[]'::jsonb, '{}'::jsonb
+    from jsonb_to_recordset(p_users) as u(user_id text)
+    on conflict (user_id) do nothing;
+
+    update user_progress up
+    set confidence_scores = coalesce(up.confidence_scores, '{}'::jsonb) || u.confidence_scores,
+        patterns_mastered = coalesce(up.patterns_mastered, '[]'::jsonb) || coalesce((
+            select jsonb_agg(m)
+            from jsonb_array_elements_text(u.mastered) m
+            where not coalesce(up.patterns_mastered, '[]'::jsonb) ? m
+        ), '[]'::jsonb)
+    from jsonb_to_recordset(p_users) as u(user_id text, confidence_scores jsonb, mastered jsonb)
+    where up.user_id = u.user_id;
+
+    get diagnostics v_count = row_count;
+    return v_count;
+end;
+$$;
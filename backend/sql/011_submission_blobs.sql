@@ -0,0 +1,33 @@
+-- Content-addressed storage for submission code and strategy (backend/blobs.py).
+-- Each distinct body is stored once in submission_blobs, keyed by the
+-- sha256 of its text and zlib-compressed (base64 in `body`), and
+-- submissions reference it by digest. Resubmitting identical code only
+-- inserts the submissions row.
+
+create table if not exists submission_blobs (
+    digest text primary key,
+    encoding text not null default 'zlib',
+    body text not null,
+    size integer not null,
+    created_at timestamptz not null default now()
+);
+
+alter table submissions add column if not exists code_digest text references submission_blobs (digest);
+alter table submissions add column if not exists strategy_digest text references submission_blobs (digest);
+-- New rows carry digests only; rows written before this migration keep
+-- their inline code/strategy
+alter table submissions alter column code drop not null;
+alter table submissions alter column strategy drop not null;
+
+-- Judge verdicts reused for identical code (backend/judge/results.py).
+-- A row is only reused while suite_version matches the problem's current
+-- test suite; re-judging after a suite change replaces it.
+create table if not exists judge_results (
+    problem_id text not null,
+    language text not null,
+    code_digest text not null,
+    suite_version text not null,
+    result jsonb not null,
+    judged_at timestamptz not null default now(),
+    primary key (problem_id, language, code_digest)
+);
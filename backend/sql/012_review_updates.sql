@@ -0,0 +1,67 @@
+-- Apply one SM-2 review (backend/spaced_repetition.py) to a user's schedule
+-- for a problem. The row is locked while the transition is computed, so
+-- judged attempts for the same (user, problem) on different workers or
+-- nodes are applied one after the other instead of overwriting each other.
+-- Returns the review_schedule row.
+
+create or replace function record_review(
+    p_user_id text,
+    p_problem_id text,
+    p_quality integer,
+    p_today date,
+    p_first_interval_days integer,
+    p_second_interval_days integer,
+    p_default_ease_factor double precision,
+    p_min_ease_factor double precision
+)
+returns setof review_schedule
+language plpgsql
+volatile
+as $$
+declare
+    v_row review_schedule;
+    v_ease double precision;
+    v_repetitions integer;
+    v_interval integer;
+begin
+    insert into review_schedule (user_id, problem_id, repetitions, interval_days, ease_factor)
+    values (p_user_id, p_problem_id, 0, 0, p_default_ease_factor)
+    on conflict (user_id, problem_id) do nothing;
+
+    select * into v_row from review_schedule
+    where user_id = p_user_id and problem_id = p_problem_id
+    for update;
+
+    -- Another pass on a problem already reviewed today doesn't stretch the interval
+    if p_quality >= 3 and v_row.last_reviewed_on = p_today and v_row.repetitions > 0 then
+        return next v_row;
+        return;
+    end if;
+
+    v_ease := greatest(
+        p_min_ease_factor,
+        v_row.ease_factor + (0.1 - (5 - p_quality) * (0.08 + (5 - p_quality) * 0.02))
+    );
+    if p_quality < 3 then
+        v_repetitions := 0;
+        v_interval := 1;
+    else
+        v_repetitions := v_row.repetitions + 1;
+        v_interval := case v_repetitions
+            when 1 then p_first_interval_days
+            when 2 then p_second_interval_days
+            else round(v_row.interval_days * v_ease)::integer
+        end;
+    end if;
+
+    return query
+        update review_schedule
+        set repetitions = v_repetitions,
+            interval_days = v_interval,
+            ease_factor = round(v_ease::numeric, 4),
+            due_on = p_today + v_interval,
+            last_reviewed_on = p_today
+        where user_id = p_user_id and problem_id = p_problem_id
+        returning *;
+end;
+$$;
@@ -0,0 +1,11 @@
+# Storage package
+from .builder import QueryBuilder, QueryResponse, RpcCall, StorageError
+from .rpc import RPC_FUNCTIONS
+
+__all__ = [
+    "QueryBuilder",
+    "QueryResponse",
+    "RpcCall",
+    "StorageError",
+    "RPC_FUNCTIONS",
+]
@@ -0,0 +1,214 @@
+"""
+PostgREST-Compatible Query Builder
+Records the postgrest-py builder calls the backend makes (select, insert,
+upsert, update, delete, filters including or_() logic trees, order,
+limit/range) so a local storage backend can execute them. Builders carry
+the same path/http_method/headers attributes as postgrest's, so
+backend.metrics labels them identically.
+"""
+
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+
+class StorageError(Exception):
+    """Raised for queries a local backend can't serve (unknown RPC, column or filter)"""
+
+
+class QueryResponse:
+    """The parts of postgrest's APIResponse the backend reads"""
+
+    __slots__ = ("data", "count")
+
+    def __init__(self, data, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+FILTER_OPERATORS = ("eq", "neq", "gt", "gte", "lt", "lte", "in", "is")
+
+
+def filter_value(value):
+    """Dates travel as ISO strings, as they do over PostgREST"""
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split a PostgREST logic expression on commas outside parentheses and quotes"""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_logic(expression: str, combine: str = "or") -> Tuple:
+    """
+    Parse an or_() filter string such as
+    'submitted_at.lt."x",and(submitted_at.eq."x",id.lt."y")' into a tree of
+    ("or" | "and", [children]) and ("cond", op, column, value) nodes
+    """
+    children = []
+    for part in _split_top_level(expression):
+        for name in ("and", "or"):
+            if part.startswith(f"{name}(") and part.endswith(")"):
+                children.append(parse_logic(part[len(name) + 1:-1], name))
+                break
+        else:
+            try:
+                column, op, value = part.split(".", 2)
+            except ValueError:
+                raise StorageError(f"Malformed filter '{part}'")
+            if op not in FILTER_OPERATORS:
+                raise StorageError(f"Unsupported filter operator '{op}'")
+            if len(value) >= 2 and value[0] == value[-1] == '"':
+                value = value[1:-1]
+            children.append(("cond", op, column, value))
+    return (combine, children)
+
+
+class QueryBuilder:
+    """
+    Chainable table query mirroring the postgrest-py request builders.
+    execute() hands the recorded query to the client's execute_query().
+    """
+
+    def __init__(self, client, table: str):
+        self.client = client
+        self.table = table
+        self.path = f"/{table}"
+        self.http_method = "GET"
+        self.headers = {}
+        self.operation = "select"
+        self.columns = "*"
+        self.payload = None
+        self.on_conflict: Optional[str] = None
+        self.ignore_duplicates = False
+        self.returning = "representation"
+        # Every node is ANDed: ("cond", op, column, value) or ("or"/"and", [children])
+        self.filters: list = []
+        self.ordering: List[Tuple[str, bool]] = []
+        self.limit_count: Optional[int] = None
+        self.offset = 0
+
+    # Operations
+
+    def select(self, columns: str = "*", count: Optional[str] = None) -> "QueryBuilder":
+        self.columns = columns
+        return self
+
+    def insert(self, rows, returning: str = "representation", **_) -> "QueryBuilder":
+        self.operation = "insert"
+        self.http_method = "POST"
+        self.headers["prefer"] = f"return={returning}"
+        self.payload = rows
+        self.returning = returning
+        return self
+
+    def upsert(self, rows, on_conflict: str = "", ignore_duplicates: bool = False,
+               returning: str = "representation", **_) -> "QueryBuilder":
+        self.operation = "upsert"
+        self.http_method = "POST"
+        resolution = "ignore" if ignore_duplicates else "merge"
+        self.headers["prefer"] = f"return={returning},resolution={resolution}-duplicates"
+        self.payload = rows
+        self.on_conflict = on_conflict or "id"
+        self.ignore_duplicates = ignore_duplicates
+        self.returning = returning
+        return self
+
+    def update(self, values: dict, **_) -> "QueryBuilder":
+        self.operation = "update"
+        self.http_method = "PATCH"
+        self.payload = values
+        return self
+
+    def delete(self, **_) -> "QueryBuilder":
+        self.operation = "delete"
+        self.http_method = "DELETE"
+        return self
+
+    # Filters and modifiers
+
+    def _filter(self, op: str, column: str, value) -> "QueryBuilder":
+        self.filters.append(("cond", op, column, filter_value(value)))
+        return self
+
+    def eq(self, column: str, value) -> "QueryBuilder":
+        return self._filter("eq", column, value)
+
+    def neq(self, column: str, value) -> "QueryBuilder":
+        return self._filter("neq", column, value)
+
+    def gt(self, column: str, value) -> "QueryBuilder":
+        return self._filter("gt", column, value)
+
+    def gte(self, column: str, value) -> "QueryBuilder":
+        return self._filter("gte", column, value)
+
+    def lt(self, column: str, value) -> "QueryBuilder":
+        return self._filter("lt", column, value)
+
+    def lte(self, column: str, value) -> "QueryBuilder":
+        return self._filter("lte", column, value)
+
+    def in_(self, column: str, values) -> "QueryBuilder":
+        return self._filter("in", column, [filter_value(value) for value in values])
+
+    def is_(self, column: str, value) -> "QueryBuilder":
+        return self._filter("is", column, value)
+
+    def or_(self, filters: str) -> "QueryBuilder":
+        self.filters.append(parse_logic(filters))
+        return self
+
+    def order(self, column: str, desc: bool = False, **_) -> "QueryBuilder":
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> "QueryBuilder":
+        self.limit_count = size
+        return self
+
+    def range(self, start: int, end: int) -> "QueryBuilder":
+        self.offset, self.limit_count = start, end - start + 1
+        return self
+
+    def selected_columns(self) -> Optional[List[str]]:
+        """Requested column names, or None for *"""
+        if self.columns.strip() == "*":
+            return None
+        return [column.strip() for column in self.columns.split(",") if column.strip()]
+
+    def conflict_columns(self) -> List[str]:
+        return [column.strip() for column in (self.on_conflict or "id").split(",")]
+
+    def rows(self) -> List[dict]:
+        """The insert/upsert payload as a list of rows"""
+        return self.payload if isinstance(self.payload, list) else [self.payload]
+
+    def execute(self) -> QueryResponse:
+        return self.client.execute_query(self)
+
+
+class RpcCall:
+    """A pending RPC call; execute() runs it through the client's execute_rpc()"""
+
+    def __init__(self, client, function: str, params: dict):
+        self.client = client
+        self.function = function
+        self.params = params or {}
+        self.path = f"/rpc/{function}"
+        self.http_method = "POST"
+        self.headers = {}
+
+    def execute(self) -> QueryResponse:
+        return self.client.execute_rpc(self)
@@ -0,0 +1,242 @@
+"""
+Database Functions for Local Backends
+Python ports of the RPCs in sql/*.sql, written once against the small
+RpcStore interface so the in-memory and SQLite backends share them. Each
+backend runs a function inside one transaction (or under one lock), so
+the updates stay atomic like their Postgres originals.
+"""
+
+import math
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from .builder import StorageError
+
+
+def default_progress_row(user_id: str) -> dict:
+    """A new user_progress row with the column defaults the SQL functions insert"""
+    return {
+        "user_id": user_id,
+        "username": f"User_{user_id[:8]}",
+        "total_submissions": 0,
+        "current_streak": 0,
+        "longest_streak": 0,
+        "last_active_on": None,
+        "patterns_mastered": [],
+        "confidence_scores": {},
+    }
+
+
+class RpcStore:
+    """Row access the functions below need; implemented by each backend"""
+
+    def progress(self, user_id: str) -> dict:
+        """The user's user_progress row, inserted with defaults if missing"""
+        raise NotImplementedError
+
+    def save_progress(self, row: dict):
+        """Write back a row returned by progress()"""
+        raise NotImplementedError
+
+    def submission_stats(self, user_id: str) -> dict:
+        """{"total_submissions", "problems_solved"} for a user"""
+        raise NotImplementedError
+
+    def active_users(self, since: str, after: Optional[str], limit: int) -> List[str]:
+        """Up to `limit` users with a submission at or after `since`, in id order after `after`"""
+        raise NotImplementedError
+
+    def pattern_stats(self, user_id: str, pattern: str) -> Optional[dict]:
+        """The user's pattern_confidence row for a pattern, if any"""
+        raise NotImplementedError
+
+    def save_pattern_stats(self, row: dict):
+        """Insert or replace a pattern_confidence row"""
+        raise NotImplementedError
+
+    def review(self, user_id: str, problem_id: str) -> Optional[dict]:
+        """The review_schedule row for (user, problem), if any"""
+        raise NotImplementedError
+
+    def save_review(self, row: dict):
+        """Insert or replace a review_schedule row"""
+        raise NotImplementedError
+
+
+def _clamp_score(score) -> float:
+    return min(max(score, 0), 100)
+
+
+def _with_pattern(patterns: list, pattern: str) -> list:
+    patterns = list(patterns or [])
+    if pattern not in patterns:
+        patterns.append(pattern)
+    return patterns
+
+
+def user_submission_stats(store: RpcStore, params: dict):
+    return [store.submission_stats(params["p_user_id"])]
+
+
+def increment_streak(store: RpcStore, params: dict):
+    row = store.progress(params["p_user_id"])
+    row["current_streak"] = max((row.get("current_streak") or 0) + params.get("p_days", 1), 0)
+    row["longest_streak"] = max(row.get("longest_streak") or 0, row["current_streak"])
+    store.save_progress(row)
+    return [row]
+
+
+def set_confidence_score(store: RpcStore, params: dict):
+    row = store.progress(params["p_user_id"])
+    row["confidence_scores"] = {**(row.get("confidence_scores") or {}), params["p_pattern"]: _clamp_score(params["p_score"])}
+    store.save_progress(row)
+    return [row]
+
+
+def add_mastered_pattern(store: RpcStore, params: dict):
+    row = store.progress(params["p_user_id"])
+    row["patterns_mastered"] = _with_pattern(row.get("patterns_mastered"), params["p_pattern"])
+    store.save_progress(row)
+    return [row]
+
+
+def apply_progress_operations(store: RpcStore, params: dict):
+    row = store.progress(params["p_user_id"])
+    streak = row.get("current_streak") or 0
+    mastered = list(row.get("patterns_mastered") or [])
+    scores = dict(row.get("confidence_scores") or {})
+    for operation in params["p_operations"]:
+        if operation["op"] == "streak":
+            streak = max(streak + operation.get("days", 1), 0)
+        elif operation["op"] == "confidence":
+            scores[operation["pattern"]] = _clamp_score(operation["score"])
+        elif operation["op"] == "pattern_mastered":
+            mastered = _with_pattern(mastered, operation["pattern"])
+        else:
+            raise StorageError(f"unknown progress operation: {operation['op']}")
+    row.update(
+        current_streak=streak,
+        longest_streak=max(row.get("longest_streak") or 0, streak),
+        patterns_mastered=mastered,
+        confidence_scores=scores,
+    )
+    store.save_progress(row)
+    return [row]
+
+
+def record_activity_day(store: RpcStore, params: dict):
+    row = store.progress(params["p_user_id"])
+    day = date.fromisoformat(params["p_day"])
+    last = date.fromisoformat(row["last_active_on"]) if row.get("last_active_on") else None
+    if last is None or day > last + timedelta(days=1):
+        current = 1
+    elif day == last + timedelta(days=1):
+        current = (row.get("current_streak") or 0) + 1
+    else:
+        current = row.get("current_streak") or 0
+    row["current_streak"] = current
+    row["longest_streak"] = max(row.get("longest_streak") or 0, current)
+    row["last_active_on"] = max(last, day).isoformat() if last else day.isoformat()
+    store.save_progress(row)
+    return [row]
+
+
+def apply_streak_backfill(store: RpcStore, params: dict):
+    for values in params["p_rows"]:
+        row = store.progress(values["user_id"])
+        row.update(
+            current_streak=values["current_streak"],
+            longest_streak=values["longest_streak"],
+            last_active_on=values["last_active_on"],
+        )
+        store.save_progress(row)
+    return len(params["p_rows"])
+
+
+def record_pattern_outcome(store: RpcStore, params: dict):
+    user_id, pattern = params["p_user_id"], params["p_pattern"]
+    at = datetime.fromisoformat(params["p_at"])
+    stats = store.pattern_stats(user_id, pattern) or {
+        "user_id": user_id, "pattern": pattern, "evidence": 0.0, "weight": 0.0, "as_of": params["p_at"],
+    }
+    elapsed_days = max((at - datetime.fromisoformat(stats["as_of"])).total_seconds() / 86400, 0)
+    decay = math.pow(0.5, elapsed_days / params["p_half_life_days"])
+    stats["evidence"] = stats["evidence"] * decay + params["p_weight"] * params["p_outcome"]
+    stats["weight"] = stats["weight"] * decay + params["p_weight"]
+    stats["as_of"] = max(stats["as_of"], params["p_at"])
+    store.save_pattern_stats(stats)
+
+    confidence = round(100 * stats["evidence"] / (stats["weight"] + params["p_prior_weight"]), 1)
+    row = store.progress(user_id)
+    row["confidence_scores"] = {**(row.get("confidence_scores") or {}), pattern: confidence}
+    if confidence >= params["p_mastery_threshold"]:
+        row["patterns_mastered"] = _with_pattern(row.get("patterns_mastered"), pattern)
+    store.save_progress(row)
+    return [row]
+
+
+def apply_confidence_batch(store: RpcStore, params: dict):
+    for stats in params["p_stats"]:
+        store.save_pattern_stats(dict(stats))
+    for values in params["p_users"]:
+        row = store.progress(values["user_id"])
+        row["confidence_scores"] = {**(row.get("confidence_scores") or {}), **(values.get("confidence_scores") or {})}
+        mastered = row.get("patterns_mastered") or []
+        for pattern in values.get("mastered") or ():
+            mastered = _with_pattern(mastered, pattern)
+        row["patterns_mastered"] = mastered
+        store.save_progress(row)
+    return len(params["p_users"])
+
+
+def record_review(store: RpcStore, params: dict):
+    user_id, problem_id, quality = params["p_user_id"], params["p_problem_id"], params["p_quality"]
+    today = date.fromisoformat(params["p_today"])
+    row = store.review(user_id, problem_id) or {
+        "user_id": user_id, "problem_id": problem_id, "repetitions": 0, "interval_days": 0,
+        "ease_factor": params["p_default_ease_factor"], "due_on": None, "last_reviewed_on": None,
+    }
+    # Another pass on a problem already reviewed today doesn't stretch the interval
+    if quality >= 3 and row["last_reviewed_on"] == today.isoformat() and row["repetitions"] > 0:
+        return [row]
+
+    ease = max(params["p_min_ease_factor"], row["ease_factor"] + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)))
+    if quality < 3:
+        repetitions, interval = 0, 1
+    else:
+        repetitions = row["repetitions"] + 1
+        if repetitions == 1:
+            interval = params["p_first_interval_days"]
+        elif repetitions == 2:
+            interval = params["p_second_interval_days"]
+        else:
+            interval = round(row["interval_days"] * ease)
+    row.update(
+        repetitions=repetitions,
+        interval_days=interval,
+        ease_factor=round(ease, 4),
+        due_on=(today + timedelta(days=interval)).isoformat(),
+        last_reviewed_on=today.isoformat(),
+    )
+    store.save_review(row)
+    return [row]
+
+
+def active_users(store: RpcStore, params: dict):
+    user_ids = store.active_users(params["p_since"], params.get("p_after"), params.get("p_limit", 1000))
+    return [{"user_id": user_id} for user_id in user_ids]
+
+
+RPC_FUNCTIONS: Dict[str, Callable] = {
+    "user_submission_stats": user_submission_stats,
+    "increment_streak": increment_streak,
+    "set_confidence_score": set_confidence_score,
+    "add_mastered_pattern": add_mastered_pattern,
+    "apply_progress_operations": apply_progress_operations,
+    "record_activity_day": record_activity_day,
+    "apply_streak_backfill": apply_streak_backfill,
+    "record_pattern_outcome": record_pattern_outcome,
+    "apply_confidence_batch": apply_confidence_batch,
+    "record_review": record_review,
+    "active_users": active_users,
+}
@@ -0,0 +1,538 @@
+"""
+SQLite Storage Backend
+A drop-in replacement for the Supabase client on single-node, on-prem or
+offline deployments (STORAGE_BACKEND=sqlite). Routes keep building
+PostgREST-style queries; they are compiled to parameterized SQL and run
+against a local SQLite database in WAL mode, so reads never leave the
+process.
+
+Connections come from a small pool, one per query thread, and each keeps
+its compiled statements cached: queries of the same shape produce the same
+SQL text and reuse the prepared statement. Writes and RPCs (storage/rpc.py)
+run in BEGIN IMMEDIATE transactions.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from ..paths import data_path, ensure_parent
+from .builder import QueryBuilder, QueryResponse, RpcCall, StorageError
+from .rpc import RPC_FUNCTIONS, RpcStore, default_progress_row
+
+SQLITE_DATABASE_PATH = os.getenv("SQLITE_DATABASE_PATH", data_path("logicgate.sqlite3"))
+# One connection per query thread is enough (see DB_MAX_WORKERS in db.py)
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", 16))
+# Prepared statements kept per connection
+SQLITE_STATEMENT_CACHE = int(os.getenv("SQLITE_STATEMENT_CACHE", 256))
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 30))
+SQLITE_MMAP_BYTES = int(os.getenv("SQLITE_MMAP_BYTES", 256 * 1024 * 1024))
+
+SCHEMA = """
+create table if not exists problems (
+    id text primary key,
+    title text not null,
+    leetcode_number integer,
+    difficulty text,
+    pattern text,
+    description text,
+    time_complexity text,
+    space_complexity text,
+    concept_focus text,
+    link text,
+    content_hash text
+);
+
+create table if not exists submissions (
+    id text primary key,
+    problem_id text not null,
+    user_id text not null,
+    code text,
+    strategy text,
+    code_digest text,
+    strategy_digest text,
+    language text,
+    submitted_at text not null,
+    status text not null default 'pending',
+    passed integer not null default 0,
+    judge_result text,
+    judged_at text
+);
+-- Per-problem history, newest first (keyset pagination)
+create index if not exists submissions_user_problem_idx
+    on submissions (user_id, problem_id, submitted_at desc, id desc);
+-- Solved-problem counts
+create index if not exists submissions_user_passed_idx
+    on submissions (user_id, passed, problem_id);
+-- Full history, newest first (keyset pagination)
+create index if not exists submissions_user_submitted_idx
+    on submissions (user_id, submitted_at desc, id desc);
+-- Recently active users
+create index if not exists submissions_submitted_at_idx
+    on submissions (submitted_at, user_id);
+
+create table if not exists user_progress (
+    user_id text primary key,
+    username text,
+    total_submissions integer not null default 0,
+    current_streak integer not null default 0,
+    longest_streak integer not null default 0,
+    last_active_on text,
+    patterns_mastered text not null default '[]',
+    confidence_scores text not null default '{}'
+);
+
+create table if not exists daily_triples (
+    user_id text not null,
+    triple_date text not null,
+    review_id text not null,
+    topic_id text not null,
+    challenge_id text not null,
+    generated_at text,
+    primary key (user_id, triple_date)
+);
+
+create table if not exists daily_triple_runs (
+    run_date text primary key,
+    claimed_by text not null,
+    claimed_at text
+);
+
+create table if not exists review_schedule (
+    user_id text not null,
+    problem_id text not null,
+    repetitions integer not null default 0,
+    interval_days integer not null default 0,
+    ease_factor real not null default 2.5,
+    due_on text,
+    last_reviewed_on text,
+    primary key (user_id, problem_id)
+);
+create index if not exists review_schedule_due_idx
+    on review_schedule (user_id, due_on, problem_id);
+
+create table if not exists submission_blobs (
+    digest text primary key,
+    encoding text not null default 'zlib',
+    body text not null,
+    size integer not null,
+    created_at text not null default (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+create table if not exists judge_results (
+    problem_id text not null,
+    language text not null,
+    code_digest text not null,
+    suite_version text not null,
+    result text not null,
+    judged_at text,
+    primary key (problem_id, language, code_digest)
+);
+
+create table if not exists pattern_confidence (
+    user_id text not null,
+    pattern text not null,
+    evidence real not null default 0,
+    weight real not null default 0,
+    as_of text not null,
+    primary key (user_id, pattern)
+);
+"""
+
+# Columns added after a database file may have been created: (table, column, type)
+MIGRATIONS = (
+    ("submissions", "code_digest", "text"),
+    ("submissions", "strategy_digest", "text"),
+)
+
+# Columns stored as TEXT/INTEGER that the API sees as JSON values or booleans
+JSON_COLUMNS = {
+    "submissions": ("judge_result",),
+    "judge_results": ("result",),
+    "user_progress": ("patterns_mastered", "confidence_scores"),
+}
+BOOLEAN_COLUMNS = {
+    "submissions": ("passed",),
+}
+
+COMPARISONS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _quote(identifier: str) -> str:
+    return f'"{identifier}"'
+
+
+class _TableCodec:
+    """Column list of a table and conversions between API values and SQLite values"""
+
+    def __init__(self, name: str, columns: List[str], not_null: List[str] = ()):
+        self.name = name
+        self.columns = columns
+        self.column_set = frozenset(columns)
+        self.not_null = frozenset(not_null)
+        self.json_columns = frozenset(JSON_COLUMNS.get(name, ()))
+        self.boolean_columns = frozenset(BOOLEAN_COLUMNS.get(name, ()))
+
+    def check(self, column: str) -> str:
+        if column not in self.column_set:
+            raise StorageError(f"Column '{column}' does not exist on '{self.name}'")
+        return _quote(column)
+
+    def encode(self, column: str, value):
+        if value is None:
+            return None
+        if column in self.json_columns:
+            return json.dumps(value, separators=(",", ":"))
+        if column in self.boolean_columns:
+            return int(value.lower() == "true" if isinstance(value, str) else bool(value))
+        return value
+
+    def decode(self, names: List[str], values: tuple) -> dict:
+        row = dict(zip(names, values))
+        for column in self.json_columns.intersection(names):
+            if row[column] is not None:
+                row[column] = json.loads(row[column])
+        for column in self.boolean_columns.intersection(names):
+            if row[column] is not None:
+                row[column] = bool(row[column])
+        return row
+
+
+def _compile_filter(codec: _TableCodec, node, params: list) -> str:
+    if node[0] != "cond":
+        joiner = " and " if node[0] == "and" else " or "
+        return "(" + joiner.join(_compile_filter(codec, child, params) for child in node[1]) + ")"
+
+    _, op, column, value = node
+    target = codec.check(column)
+    if op == "is":
+        if value in (None, "null"):
+            return f"{target} is null"
+        params.append(codec.encode(column, value))
+        return f"{target} is ?"
+    if op == "in":
+        values = list(value)
+        if not values:
+            return "0"
+        params.extend(codec.encode(column, item) for item in values)
+        return f"{target} in ({','.join('?' * len(values))})"
+    params.append(codec.encode(column, value))
+    return f"{target} {COMPARISONS[op]} ?"
+
+
+def _where(codec: _TableCodec, filters: list, params: list) -> str:
+    if not filters:
+        return ""
+    return " where " + " and ".join(_compile_filter(codec, node, params) for node in filters)
+
+
+class _SQLiteRpcStore(RpcStore):
+    """RpcStore over one connection, inside the RPC's transaction"""
+
+    def __init__(self, storage: "SQLiteStorage", conn: sqlite3.Connection):
+        self.storage = storage
+        self.conn = conn
+
+    def _rows(self, table: str, sql: str, params: tuple) -> List[dict]:
+        codec = self.storage.codec(table)
+        cursor = self.conn.execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        return [codec.decode(names, values) for values in cursor.fetchall()]
+
+    def progress(self, user_id: str) -> dict:
+        rows = self._rows("user_progress", "select * from user_progress where user_id = ?", (user_id,))
+        if rows:
+            return rows[0]
+        row = default_progress_row(user_id)
+        self.storage.insert_row(self.conn, "user_progress", row)
+        return row
+
+    def save_progress(self, row: dict):
+        codec = self.storage.codec("user_progress")
+        columns = [column for column in row if column != "user_id"]
+        self.conn.execute(
+            f"update user_progress set {', '.join(f'{codec.check(c)} = ?' for c in columns)} where user_id = ?",
+            [codec.encode(column, row[column]) for column in columns] + [row["user_id"]],
+        )
+
+    def submission_stats(self, user_id: str) -> dict:
+        total, solved = self.conn.execute(
+            "select count(*), count(distinct case when passed then problem_id end) from submissions where user_id = ?",
+            (user_id,),
+        ).fetchone()
+        return {"total_submissions": total, "problems_solved": solved}
+
+    def active_users(self, since: str, after: Optional[str], limit: int) -> List[str]:
+        return [row[0] for row in self.conn.execute(
+            "select distinct user_id from submissions where submitted_at >= ? and (? is null or user_id > ?) "
+            "order by user_id limit ?",
+            (since, after, after, limit),
+        )]
+
+    def pattern_stats(self, user_id: str, pattern: str) -> Optional[dict]:
+        rows = self._rows(
+            "pattern_confidence",
+            "select * from pattern_confidence where user_id = ? and pattern = ?",
+            (user_id, pattern),
+        )
+        return rows[0] if rows else None
+
+    def save_pattern_stats(self, row: dict):
+        self.conn.execute(
+            "insert into pattern_confidence (user_id, pattern, evidence, weight, as_of) values (?, ?, ?, ?, ?) "
+            "on conflict (user_id, pattern) do update "
+            "set evidence = excluded.evidence, weight = excluded.weight, as_of = excluded.as_of",
+            (row["user_id"], row["pattern"], row["evidence"], row["weight"], row["as_of"]),
+        )
+
+    def review(self, user_id: str, problem_id: str) -> Optional[dict]:
+        rows = self._rows(
+            "review_schedule",
+            "select * from review_schedule where user_id = ? and problem_id = ?",
+            (user_id, problem_id),
+        )
+        return rows[0] if rows else None
+
+    def save_review(self, row: dict):
+        self.conn.execute(
+            "insert or replace into review_schedule "
+            "(user_id, problem_id, repetitions, interval_days, ease_factor, due_on, last_reviewed_on) "
+            "values (?, ?, ?, ?, ?, ?, ?)",
+            (
+                row["user_id"], row["problem_id"], row["repetitions"], row["interval_days"],
+                row["ease_factor"], row["due_on"], row["last_reviewed_on"],
+            ),
+        )
+
+
+class SQLiteStorage:
+    """Supabase-compatible client backed by a local SQLite database"""
+
+    def __init__(self, path: str = SQLITE_DATABASE_PATH, pool_size: int = SQLITE_POOL_SIZE):
+        self.path = path
+        if not path.startswith(("file:", ":memory:")):
+            ensure_parent(path)
+        self.pool_size = max(pool_size, 1)
+        self.queries = 0
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        # WAL allows one writer at a time; queueing writers here avoids
+        # SQLite's sleep-and-retry busy handler between our own threads
+        self._write_lock = threading.Lock()
+        self._closed = False
+
+        with self.connection() as conn:
+            conn.execute("pragma journal_mode=wal")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            self._codecs: Dict[str, _TableCodec] = {}
+            for (name,) in conn.execute("select name from sqlite_master where type = 'table'").fetchall():
+                # (cid, name, type, notnull, default, pk)
+                info = conn.execute(f"pragma table_info({_quote(name)})").fetchall()
+                self._codecs[name] = _TableCodec(
+                    name, [column[1] for column in info], [column[1] for column in info if column[3] or column[5]]
+                )
+
+    def _migrate(self, conn: sqlite3.Connection):
+        for table, column, kind in MIGRATIONS:
+            columns = {row[1] for row in conn.execute(f"pragma table_info({_quote(table)})")}
+            if column not in columns:
+                conn.execute(f"alter table {_quote(table)} add column {_quote(column)} {kind}")
+
+    # Connection pool
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit; writes open their own BEGIN IMMEDIATE transactions
+        conn = sqlite3.connect(
+            self.path,
+            timeout=SQLITE_BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=SQLITE_STATEMENT_CACHE,
+            uri=True,
+        )
+        conn.execute("pragma synchronous=normal")
+        conn.execute("pragma temp_store=memory")
+        conn.execute(f"pragma mmap_size={SQLITE_MMAP_BYTES}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection, opening one if the pool isn't full yet"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            conn = self._connect() if create else self._idle.get()
+        try:
+            yield conn
+        finally:
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        with self._write_lock, self.connection() as conn:
+            conn.execute("begin immediate")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("rollback")
+                raise
+            conn.execute("commit")
+
+    def close(self):
+        """Close idle connections; borrowed ones close when returned"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # Client interface
+
+    def table(self, name: str) -> QueryBuilder:
+        return QueryBuilder(self, name)
+
+    def rpc(self, function: str, params: dict = None) -> RpcCall:
+        return RpcCall(self, function, params)
+
+    def codec(self, table: str) -> _TableCodec:
+        codec = self._codecs.get(table)
+        if codec is None:
+            raise StorageError(f"Table '{table}' does not exist")
+        return codec
+
+    def execute_query(self, query: QueryBuilder) -> QueryResponse:
+        self.queries += 1
+        if query.operation == "select":
+            with self.connection() as conn:
+                return QueryResponse(self._select(conn, query))
+        with self.transaction() as conn:
+            rows = self._write(conn, query)
+        return QueryResponse([] if query.returning == "minimal" else rows)
+
+    def execute_rpc(self, call: RpcCall) -> QueryResponse:
+        implementation = RPC_FUNCTIONS.get(call.function)
+        if implementation is None:
+            raise StorageError(f"Function '{call.function}' is not implemented by the SQLite backend")
+        self.queries += 1
+        with self.transaction() as conn:
+            return QueryResponse(implementation(_SQLiteRpcStore(self, conn), call.params))
+
+    def load(self, table: str, rows: List[dict]):
+        """Bulk-insert rows in one transaction (for seeding and benchmarks)"""
+        codec = self.codec(table)
+        by_columns: Dict[tuple, list] = {}
+        for row in rows:
+            by_columns.setdefault(tuple(row), []).append(row)
+        with self.transaction() as conn:
+            for columns, group in by_columns.items():
+                conn.executemany(
+                    f"insert or replace into {_quote(table)} ({', '.join(codec.check(c) for c in columns)}) "
+                    f"values ({', '.join('?' * len(columns))})",
+                    [[codec.encode(column, row[column]) for column in columns] for row in group],
+                )
+
+    def count(self, table: str) -> int:
+        with self.connection() as conn:
+            return conn.execute(f"select count(*) from {_quote(self.codec(table).name)}").fetchone()[0]
+
+    # Query compilation
+
+    def _fetch(self, conn: sqlite3.Connection, codec: _TableCodec, sql: str, params: list) -> List[dict]:
+        cursor = conn.execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        return [codec.decode(names, values) for values in cursor.fetchall()]
+
+    def _select(self, conn: sqlite3.Connection, query: QueryBuilder) -> List[dict]:
+        codec = self.codec(query.table)
+        columns = query.selected_columns()
+        projection = "*" if columns is None else ", ".join(codec.check(column) for column in columns)
+        params: list = []
+        sql = f"select {projection} from {_quote(query.table)}" + _where(codec, query.filters, params)
+        if query.ordering:
+            sql += " order by " + ", ".join(self._order_term(codec, column, desc) for column, desc in query.ordering)
+        if query.limit_count is not None or query.offset:
+            sql += " limit ? offset ?"
+            params += [-1 if query.limit_count is None else query.limit_count, query.offset]
+        return self._fetch(conn, codec, sql, params)
+
+    @staticmethod
+    def _order_term(codec: _TableCodec, column: str, desc: bool) -> str:
+        term = f"{codec.check(column)} {'desc' if desc else 'asc'}"
+        if column in codec.not_null:
+            # An explicit NULLS clause would stop SQLite reading the order off an index
+            return term
+        # Postgres puts nulls last ascending and first descending; SQLite the reverse
+        return term + (" nulls first" if desc else " nulls last")
+
+    def insert_row(self, conn: sqlite3.Connection, table: str, row: dict, on_conflict: List[str] = None,
+                   ignore_duplicates: bool = False) -> List[dict]:
+        codec = self.codec(table)
+        columns = list(row)
+        sql = (
+            f"insert into {_quote(table)} ({', '.join(codec.check(c) for c in columns)}) "
+            f"values ({', '.join('?' * len(columns))})"
+        )
+        if on_conflict is not None:
+            updates = [column for column in columns if column not in on_conflict]
+            sql += f" on conflict ({', '.join(codec.check(c) for c in on_conflict)}) "
+            if ignore_duplicates or not updates:
+                sql += "do nothing"
+            else:
+                sql += "do update set " + ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in updates)
+        return self._fetch(conn, codec, sql + " returning *", [codec.encode(c, row[c]) for c in columns])
+
+    def _write(self, conn: sqlite3.Connection, query: QueryBuilder) -> List[dict]:
+        codec = self.codec(query.table)
+        if query.operation in ("insert", "upsert"):
+            on_conflict = query.conflict_columns() if query.operation == "upsert" else None
+            written = []
+            for row in query.rows():
+                written += self.insert_row(conn, query.table, row, on_conflict, query.ignore_duplicates)
+            return written
+
+        params: list = []
+        if query.operation == "update":
+            columns = list(query.payload)
+            sql = f"update {_quote(query.table)} set " + ", ".join(f"{codec.check(c)} = ?" for c in columns)
+            params += [codec.encode(column, query.payload[column]) for column in columns]
+        elif query.operation == "delete":
+            sql = f"delete from {_quote(query.table)}"
+        else:
+            raise StorageError(f"Unsupported operation '{query.operation}'")
+        sql += _where(codec, query.filters, params) + " returning *"
+        return self._fetch(conn, codec, sql, params)
+
+
+_storage: SQLiteStorage = None
+_storage_lock = threading.Lock()
+
+
+def get_sqlite_storage() -> SQLiteStorage:
+    """The process-wide SQLite storage, opened on first use"""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = SQLiteStorage()
+        return _storage
+
+
+def close_sqlite_storage():
+    global _storage
+    with _storage_lock:
+        if _storage is not None:
+            _storage.close()
+            _storage = None
@@ -0,0 +1,87 @@
+"""
+Activity Streaks
+Streaks are derived from submission activity rather than bumped by hand.
+Each user_progress row carries a run-length summary of the user's active
+days (sql/009_activity_streaks.sql): the last active day, the length of
+the run of consecutive days ending there and the longest run seen.
+A submission updates the summary in O(1), reads only look at the cached
+row, and backfill_streaks.py rebuilds every summary from submissions.
+"""
+
+import os
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from backend.progress_cache import cached_user, mutate_user_record
+
+# Calendar days for streaks; defaults to the Daily Triple timezone
+STREAK_TIMEZONE = os.getenv("STREAK_TIMEZONE", os.getenv("DAILY_TRIPLE_TIMEZONE", "UTC"))
+
+
+@dataclass(frozen=True)
+class StreakState:
+    current: int = 0
+    longest: int = 0
+    last_active_on: Optional[date] = None
+
+    @classmethod
+    def from_row(cls, row: dict) -> "StreakState":
+        last = row.get("last_active_on")
+        return cls(
+            current=row.get("current_streak") or 0,
+            longest=row.get("longest_streak") or 0,
+            last_active_on=date.fromisoformat(last) if last else None,
+        )
+
+    def to_row(self) -> dict:
+        return {
+            "current_streak": self.current,
+            "longest_streak": self.longest,
+            "last_active_on": self.last_active_on.isoformat() if self.last_active_on else None,
+        }
+
+
+def activity_day(when: datetime) -> date:
+    """
+    Calendar day of a submission in the streak timezone. Naive times are
+    taken as server-local, which is how submit_solution stores submitted_at.
+    """
+    return when.astimezone(ZoneInfo(STREAK_TIMEZONE)).date()
+
+
+def apply_activity(state: StreakState, day: date) -> StreakState:
+    """
+    Add one active day to the run-length summary. Days at or before the
+    last active day are already counted, so the update is O(1).
+    Must match record_activity_day in sql/009_activity_streaks.sql.
+    """
+    last = state.last_active_on
+    if last is not None and day <= last:
+        return state
+    current = state.current + 1 if last is not None and day == last + timedelta(days=1) else 1
+    return replace(state, current=current, longest=max(state.longest, current), last_active_on=day)
+
+
+def streak_summary(record: dict, today: date = None) -> Tuple[int, int]:
+    """(current, longest) streak for a user_progress row, as of today"""
+    state = StreakState.from_row(record)
+    if state.last_active_on is None:
+        # Never recorded any activity: only manual adjustments apply
+        return state.current, max(state.longest, state.current)
+
+    today = today or activity_day(datetime.now(timezone.utc))
+    # The streak survives until a whole day passes without activity
+    current = state.current if state.last_active_on >= today - timedelta(days=1) else 0
+    return current, state.longest
+
+
+async def record_activity(user_id: str, when: datetime = None) -> dict:
+    """Count a submission made at `when` toward the user's streak"""
+    day = activity_day(when or datetime.now(timezone.utc))
+    record = cached_user(user_id)
+    if record is not None and record.get("last_active_on") == day.isoformat():
+        # Already active today; nothing to write
+        return record
+    return await mutate_user_record("record_activity_day", {"p_user_id": user_id, "p_day": day.isoformat()})
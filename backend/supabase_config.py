@@ -1,29 +1,67 @@
 import os
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from supabase import create_client, Client
+
+if TYPE_CHECKING:
+    from supabase import Client, ClientOptions
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+# HTTP timeout (seconds) for PostgREST calls made through the shared clients
+SUPABASE_HTTP_TIMEOUT = float(os.getenv("SUPABASE_HTTP_TIMEOUT", 10))
+# "supabase" (default) or "sqlite" for a local database file (backend/storage/sqlite.py)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase").lower()
+
+# Lazy-initialize clients to avoid crashes if env vars are missing.
+# Each client is created once per process and shared, so its HTTP
+# connection pool is reused across requests and query threads.
+# The supabase package itself is imported on first use, keeping it
+# (and httpx/gotrue/postgrest) off the cold-start import path.
+_supabase: "Client" = None
+_supabase_admin: "Client" = None
+
+def _client_options() -> "ClientOptions":
+    from supabase import ClientOptions
+    return ClientOptions(postgrest_client_timeout=SUPABASE_HTTP_TIMEOUT)
 
-# Lazy-initialize clients to avoid crashes if env vars are missing
-_supabase: Client = None
-_supabase_admin: Client = None
+def _storage_module():
+    # seed.py imports this module top-level, the app as backend.supabase_config
+    from importlib import import_module
+    return import_module(f"{__package__}.storage.sqlite" if __package__ else "storage.sqlite")
+
+def _local_storage():
+    return _storage_module().get_sqlite_storage()
 
 def get_supabase():
     global _supabase
     if _supabase is None:
+        if STORAGE_BACKEND == "sqlite":
+            _supabase = _local_storage()
+            return _supabase
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise RuntimeError("SUPABASE_URL and SUPABASE_KEY environment variables must be set")
-        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        from supabase import create_client
+        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY, options=_client_options())
     return _supabase
 
 def get_supabase_admin():
     global _supabase_admin
     if _supabase_admin is None:
+        if STORAGE_BACKEND == "sqlite":
+            _supabase_admin = _local_storage()
+            return _supabase_admin
         if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
             raise RuntimeError("SUPABASE_URL and SUPABASE_SERVICE_KEY environment variables must be set")
-        _supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        from supabase import create_client
+        _supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY, options=_client_options())
     return _supabase_admin
+
+def close_storage():
+    """Close the local SQLite database, if that backend is in use"""
+    global _supabase, _supabase_admin
+    if STORAGE_BACKEND == "sqlite":
+        _storage_module().close_sqlite_storage()
+        _supabase = _supabase_admin = None
@@ -4,7 +4,7 @@ import { PatternProgress } from './pattern-progress';
 import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
 import { Target, Calendar, Loader2, AlertCircle } from 'lucide-react';
 import { Alert, AlertDescription } from './ui/alert';
-import apiClient, { DailyTriple, Problem } from '../../services/api-client';
+import apiClient, { Problem } from '../../services/api-client';
 
 interface DailyProblemProps {
   type: 'Review' | 'Topic-Specific' | 'Challenge';
@@ -53,12 +53,13 @@ export function DailyDashboard() {
         setLoading(true);
         setError(null);
         
-        const data: DailyTriple = await apiClient.getDailyTriple(TEST_USER_ID);
+        // One request for the whole home screen instead of one per section
+        const { daily_triple: triple } = await apiClient.getDashboard(TEST_USER_ID);
         
         const problems: DailyProblemProps[] = [
-          convertProblemToDailyFormat(data.review, 'Review'),
-          convertProblemToDailyFormat(data.topic, 'Topic-Specific'),
-          convertProblemToDailyFormat(data.challenge, 'Challenge')
+          convertProblemToDailyFormat(triple.review, 'Review'),
+          convertProblemToDailyFormat(triple.topic, 'Topic-Specific'),
+          convertProblemToDailyFormat(triple.challenge, 'Challenge')
         ];
         
         setDailyProblems(problems);
@@ -39,6 +39,7 @@ export interface Submission {
 export interface UserProgress {
   total_problems_solved: number;
   streak_days: number;
+  longest_streak: number;
   patterns_mastered: string[];
   confidence_scores: Record<string, number>;
 }
@@ -49,8 +50,32 @@ export interface UserProfile {
   created_at: string;
   total_submissions: number;
   current_streak: number;
+  longest_streak: number;
 }
 
+export interface DashboardUser {
+  user_id: string;
+  username: string;
+  total_submissions: number;
+  problems_solved: number;
+  current_streak: number;
+  longest_streak: number;
+  patterns_mastered: string[];
+  confidence_scores: Record<string, number>;
+}
+
+export interface Dashboard {
+  user: DashboardUser;
+  daily_triple: DailyTriple;
+  recent_submissions: Submission[];
+  next_cursor: string | null;
+}
+
+export type ProgressOperation =
+  | { op: 'streak'; days?: number }
+  | { op: 'confidence'; pattern: string; score: number }
+  | { op: 'pattern_mastered'; pattern: string };
+
 class APIClient {
   private baseUrl: string;
 
@@ -170,6 +195,30 @@ class APIClient {
     );
   }
 
+  /**
+   * Apply a practice session's progress updates in one request.
+   * Operations are applied in order in a single transaction.
+   */
+  async updateProgressBatch(
+    userId: string,
+    operations: ProgressOperation[]
+  ): Promise<UserProgress> {
+    return this.request<UserProgress>(
+      'POST',
+      `/progress/${userId}/batch`,
+      { operations }
+    );
+  }
+
+  // Dashboard
+  /**
+   * Progress, profile, today's triple and recent submissions in one request.
+   * Pass next_cursor to the submissions endpoint to page further back.
+   */
+  async getDashboard(userId: string, limit: number = 10): Promise<Dashboard> {
+    return this.request<Dashboard>('GET', `/dashboard/${userId}?limit=${limit}`);
+  }
+
   // Health Check
   async healthCheck(): Promise<{ status: string }> {
     return this.request('GET', '/health');